@@ -5,9 +5,11 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 from app.config import DevelopmentConfig
 from flask_cors import CORS
+from app.persistence.replication import RoutingSession
 
 # Initialiser les extensions sans les configurer
-db = SQLAlchemy()
+# (la session envoie les lectures vers le réplica s'il est configuré)
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 bcrypt = Bcrypt()
 jwt = JWTManager()
 
@@ -19,13 +21,22 @@ def create_app(config_class=None):
         config_class = DevelopmentConfig
     
     app.config.from_object(config_class)
-    app.config['DEBUG'] = True
 
     # Initialiser les extensions avec l'application
     db.init_app(app)
     bcrypt.init_app(app)
     jwt.init_app(app)
-    CORS(app)
+    # En-têtes lisibles par un client d'une autre origine : pagination et validateurs
+    CORS(app, expose_headers=['X-Next-Cursor', 'X-Total-Count', 'ETag', 'Last-Modified'])
+
+    # Réglages SQLite (WAL, cache...) sur chaque connexion, avant la première
+    from app.persistence import sqlite_tuning
+    sqlite_tuning.init_app(app)
+
+    # Une seule transaction (un seul commit) par requête HTTP
+    from app.persistence import unit_of_work
+    unit_of_work.init_app(app)
+
     # Créer les tables dans le contexte de l'application
     with app.app_context():
         # Importer TOUS les modèles pour que SQLAlchemy les connaisse
@@ -33,8 +44,17 @@ def create_app(config_class=None):
         from app.models.place import Place
         from app.models.review import Review
         from app.models.amenity import Amenity
-        # Créer toutes les tables
-        db.create_all()
+        # Créer toutes les tables (sur le primaire seulement : le réplica
+        # éventuel reçoit le schéma par la réplication)
+        db.create_all(bind_key=None)
+
+    # Index R*Tree des coordonnées (si SQLite le supporte), avant la copie vers le réplica
+    from app.persistence import spatial_index
+    spatial_index.init_app(app)
+
+    # Vérifier le réplica de lecture et le mettre à jour depuis le primaire
+    from app.persistence import replication
+    replication.init_app(app, db)
 
     # Importer les routes après l'initialisation de db
     from .api.v1.users import api as users_ns
@@ -67,5 +87,13 @@ def create_app(config_class=None):
     api.add_namespace(auth_ns, path='/api/v1/auth')
     
     api.init_app(app)
+
+    # Pages et ressources du frontend, empreintes et compressées au démarrage
+    from app import frontend
+    frontend.init_app(app)
+
+    # Commandes de maintenance (flask --app run repair-review-aggregates)
+    from app import commands
+    commands.init_app(app)
     
     return app
\ No newline at end of file
@@ -3,6 +3,10 @@
 from flask_restx import Namespace, Resource, fields
 from app.services.facade import hbnb_facade as facade
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api.v1.pagination import pagination_parser, paginate
+from app.api.v1.bulk import create_bulk
+from app.api.v1.response_cache import cached_response
+from app.api.v1.conditional import conditional, collection_validators, entity_validators
 api = Namespace('amenities', description='Amenity operations')
 
 # Define the amenity model for input validation and documentation
@@ -57,15 +61,45 @@ class AdminAmenityCreate(Resource):
         except ValueError as e:
             api.abort(400, {'message': str(e)})
 
+    @api.expect(pagination_parser)
     @api.response(200, 'List of amenities retrieved successfully', model=amenities_list)
+    @api.response(400, 'Invalid cursor or limit')
+    @conditional(lambda: collection_validators(*facade.get_amenities_freshness()))
+    @cached_response('amenities')
     def get(self):
         """
-        Retrieve all amenities
+        Retrieve amenities
         
-        Returns a list of all amenities in the system.
+        Returns one page of amenities, oldest first. When more amenities are
+        available the X-Next-Cursor response header holds the cursor of the next page.
         """
-        amenities = facade.get_all_amenities()
-        return {'amenities': [a.to_dict() for a in amenities]}, 200
+        amenities, headers = paginate(facade.get_amenities_page, count=facade.count_amenities)
+        return {'amenities': [a.to_dict() for a in amenities]}, 200, headers
+
+@api.route('/bulk')
+class AdminAmenityBulkCreate(Resource):
+    @api.expect([amenity_model])
+    @api.response(201, 'Amenities successfully created')
+    @api.response(400, 'Invalid input data, errors are reported per item')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def post(self):
+        """
+        Register several amenities at once
+        
+        Takes a JSON array of amenities. Every item is validated before anything
+        is written: if any name is invalid or already taken, no amenity is created
+        and the response lists the error of each invalid item with its index.
+        Only administrators can create amenities.
+        """
+        current_user_id = get_jwt_identity()
+        current_user = facade.get_user(current_user_id)
+        
+        if not current_user or not getattr(current_user, 'is_admin', False):
+            return {'error': 'Admin privileges required'}, 403
+
+        amenities = create_bulk(amenity_model, facade.create_amenities)
+        return [a.to_dict() for a in amenities], 201
 
 @api.route('/<amenity_id>')
 @api.param('amenity_id', 'The amenity identifier')
@@ -74,6 +108,7 @@ class AdminAmenityModify(Resource):
     @api.response(404, 'Amenity not found', model=api.model('Error', {
         'message': fields.String(description='Error message', example='Amenity not found')
     }))
+    @conditional(lambda amenity_id: entity_validators(facade.get_amenity(amenity_id)))
     def get(self, amenity_id):
         """
         Get amenity details
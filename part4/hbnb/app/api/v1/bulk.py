@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+
+"""Shared payload handling for the POST .../bulk endpoints."""
+
+from http import HTTPStatus
+from flask import current_app, request
+from flask_restx import abort
+from werkzeug.exceptions import HTTPException
+
+
+def abort_bulk(errors):
+    """Reject a bulk request, listing the error of every invalid item."""
+    abort(HTTPStatus.BAD_REQUEST.value, 'Bulk validation failed', errors=errors)  # type: ignore
+
+
+def read_bulk_payload(model):
+    """Read a JSON array payload and validate each item against a model.
+    
+    Items are validated one by one so that a single response reports every
+    invalid item instead of stopping at the first one.
+    
+    Args:
+        model: The flask-restx model each item must satisfy
+        
+    Returns:
+        A ``(items, errors)`` tuple: every item of the array, and
+        ``{'index', 'message'}`` for each item that does not satisfy the model
+        
+    Raises:
+        HTTPException: 400 if the payload is not a non-empty array or is larger
+            than MAX_BULK_ITEMS
+    """
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        abort(HTTPStatus.BAD_REQUEST.value, 'Payload must be a non-empty JSON array')  # type: ignore
+    max_items = current_app.config.get('MAX_BULK_ITEMS', 5000)
+    if len(items) > max_items:
+        abort(HTTPStatus.BAD_REQUEST.value, f'A bulk request accepts at most {max_items} items')  # type: ignore
+
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            model.validate(item)
+        except HTTPException as e:
+            details = getattr(e, 'data', {}).get('errors', {})
+            # Une erreur sur l'élément lui-même (pas un objet...) n'a pas de nom de champ
+            message = '; '.join(f'{field}: {error}' if field else str(error)
+                                for field, error in details.items())
+            errors.append({'index': index, 'message': message or 'Invalid item'})
+    return items, errors
+
+
+def create_bulk(model, create):
+    """Validate a bulk payload and create its items, or reject it with every error.
+    
+    Items that do not satisfy the model never reach ``create``; the others are
+    still checked by it (duplicates, unknown references...) without writing
+    anything, so a single response lists both kinds of error.
+    
+    Args:
+        model: The flask-restx model each item must satisfy
+        create: Facade method taking the valid items and a ``dry_run`` flag,
+            returning ``(created, errors)`` with indexes into those items
+        
+    Returns:
+        The created objects
+        
+    Raises:
+        HTTPException: 400 listing the error of every invalid item
+    """
+    items, errors = read_bulk_payload(model)
+    invalid = {error['index'] for error in errors}
+    # Position de chaque item valide dans le tableau reçu
+    positions = [index for index in range(len(items)) if index not in invalid]
+    created = []
+    if positions:
+        created, item_errors = create([items[index] for index in positions], dry_run=bool(errors))
+        errors += [{'index': positions[error['index']], 'message': error['message']}
+                   for error in item_errors]
+    if errors:
+        abort_bulk(sorted(errors, key=lambda error: error['index']))
+    return created
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+
+"""Conditional GET: weak ETags and Last-Modified derived from ``updated_at``.
+
+A detail document is versioned by the ``updated_at`` of its row and of the
+rows embedded in it; a collection by its row count and newest ``updated_at``,
+which together change on every insert, update and delete. The validators are
+computed before the handler runs, from cheap lookups, so a request whose
+``If-None-Match`` or ``If-Modified-Since`` still matches gets a ``304``
+without loading nor serializing the document.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Callable, Iterable, NamedTuple, Optional
+from flask import current_app, request
+from werkzeug.http import http_date, is_resource_modified, quote_etag
+from app.api.v1.response_cache import to_response
+from app.api.v1.streaming import wants_ndjson
+
+
+class Validators(NamedTuple):
+    """ETag (unquoted) and Last-Modified of a representation."""
+    etag: str
+    last_modified: Optional[datetime]
+
+
+def _as_utc(moment: Optional[datetime]) -> Optional[datetime]:
+    # Les dates des colonnes sont naïves, en UTC (utcnow de app/models/base_model.py)
+    if moment is None or moment.tzinfo is not None:
+        return moment
+    return moment.replace(tzinfo=timezone.utc)
+
+
+def make_validators(parts: Iterable, moments: Iterable[Optional[datetime]]) -> Validators:
+    """Hash ``parts`` into an ETag and take the newest of ``moments`` as Last-Modified.
+    
+    Args:
+        parts: Values that identify the version of the representation
+        moments: Dates of the rows the representation is built from
+    """
+    etag = hashlib.sha1(repr(tuple(parts)).encode()).hexdigest()[:32]
+    moments = [_as_utc(moment) for moment in moments if moment is not None]
+    return Validators(etag, max(moments) if moments else None)
+
+
+def entity_validators(obj) -> Optional[Validators]:
+    """Validators of a single row, None if it does not exist."""
+    if obj is None:
+        return None
+    return make_validators((type(obj).__name__, obj.id, obj.updated_at), (obj.updated_at,))
+
+
+def collection_validators(count: int, newest: Optional[datetime]) -> Validators:
+    """Validators of a list response from its ``(count, newest updated_at)``.
+    
+    The path, the query string (page, filters) and the negotiated format are
+    part of the ETag, so each page and each format has its own.
+    """
+    args = tuple(sorted((name, tuple(values)) for name, values in request.args.lists()))
+    return make_validators((request.path, args, wants_ndjson(), count, newest), (newest,))
+
+
+def conditional(validators: Callable[..., Optional[Validators]]):
+    """Answer conditional GETs of a Resource method with ``304 Not Modified``.
+    
+    Place it above ``marshal_with`` so a ``304`` is returned untouched, and
+    below the authentication decorators.
+    
+    Args:
+        validators: Called with the URL arguments of the method; returns the
+            validators of the current representation, or None to let the
+            method answer (usually a ``404``)
+    """
+    def decorator(get):
+        @wraps(get)
+        def wrapper(resource, *args, **kwargs):
+            found = validators(*args, **kwargs)
+            if found is None:
+                return get(resource, *args, **kwargs)
+            headers = {'ETag': quote_etag(found.etag, weak=True)}
+            if found.last_modified is not None:
+                headers['Last-Modified'] = http_date(found.last_modified)
+            # If-None-Match a priorité sur If-Modified-Since (RFC 9110)
+            if not is_resource_modified(request.environ, etag=found.etag,
+                                        last_modified=found.last_modified):
+                return current_app.response_class(status=304, headers=headers)
+            response = to_response(get(resource, *args, **kwargs))
+            if response.status_code == 200:
+                response.headers.update(headers)
+            return response
+        return wrapper
+    return decorator
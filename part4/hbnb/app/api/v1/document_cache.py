@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+
+"""Cache of the encoded JSON bytes of detail documents.
+
+``GET /places/<id>`` embeds the owner and the amenities of the place, so
+building its document loads three tables, then formats, marshals and encodes
+the result. The encoded bytes are kept here per place together with the
+versions they were built from: ``(place updated_at, owner updated_at,
+amenity count, newest amenity updated_at)``, read by one small query. When
+the versions still match, the bytes are returned as they are; otherwise the
+document is rebuilt and replaces the old entry.
+
+Memory is bounded by ``PLACE_DOCUMENT_CACHE_BYTES`` (0 disables the cache):
+the least recently used documents are dropped until the bodies fit.
+"""
+
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Dict, Hashable, Optional, Tuple
+from flask import current_app
+from app.api.v1.response_cache import to_response
+
+
+class ByteBudgetCache:
+    """LRU of encoded documents bounded by the total size of their bodies."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, Tuple[Hashable, bytes]]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[bytes]:
+        """Return the body stored for ``key`` if it was built from ``version``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, version: Hashable, body: bytes) -> None:
+        """Store the body of ``key`` built from ``version``, replacing older versions."""
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._entries[key] = (version, body)
+            self._bytes += len(body)
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self._evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'size': len(self._entries), 'bytes': self._bytes, 'max_bytes': self.max_bytes,
+                    'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions}
+
+
+def get_document_cache() -> Optional[ByteBudgetCache]:
+    """Return the document cache of the current app, None when it is disabled."""
+    max_bytes = current_app.config.get('PLACE_DOCUMENT_CACHE_BYTES', 0)
+    if not max_bytes:
+        return None
+    cache = current_app.extensions.get('document_cache')
+    if cache is None:
+        cache = current_app.extensions.setdefault('document_cache', ByteBudgetCache(max_bytes))
+    return cache
+
+
+def cached_document(version: Callable[..., Optional[Hashable]]):
+    """Serve a detail GET from the cached bytes of its document when ``version`` matches.
+
+    Place it above ``marshal_with``: a hit skips loading, formatting,
+    marshalling and encoding altogether.
+
+    Args:
+        version: Called with the URL arguments of the method; returns what the
+            document is built from, or None to let the method answer (``404``)
+    """
+    def decorator(get):
+        @wraps(get)
+        def wrapper(resource, *args, **kwargs):
+            cache = get_document_cache()
+            # Versions lues avant le document : un document rangé n'est jamais
+            # plus ancien que la version sous laquelle il est rangé
+            current = version(*args, **kwargs) if cache is not None else None
+            if current is None:
+                return get(resource, *args, **kwargs)
+            key = (get.__qualname__,) + tuple(sorted(kwargs.items()))
+            body = cache.get(key, current)
+            if body is not None:
+                return current_app.response_class(body, mimetype='application/json')
+            response = to_response(get(resource, *args, **kwargs))
+            if response.status_code == 200:
+                cache.set(key, current, response.get_data())
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+
+"""Shared cursor pagination helpers for the list endpoints."""
+
+from http import HTTPStatus
+from flask import current_app
+from flask_restx import reqparse, abort
+
+# Query string accepted by every paginated list endpoint
+pagination_parser = reqparse.RequestParser()
+pagination_parser.add_argument('cursor', type=str, location='args',
+                               help='Opaque cursor taken from the X-Next-Cursor header of the previous page')
+pagination_parser.add_argument('limit', type=int, location='args',
+                               help='Maximum number of items to return')
+
+
+def paginate(fetch_page, parser=pagination_parser, count=None):
+    """Read ?cursor=&limit= from the request and fetch the matching page.
+    
+    Args:
+        fetch_page: Callable taking ``(cursor, limit)`` and returning ``(items, next_cursor)``
+        parser: Request parser to use, a copy of pagination_parser with extra arguments
+        count: Optional callable returning the total number of items, computed
+            with a COUNT query and sent in the ``X-Total-Count`` header
+            
+    Returns:
+        A ``(items, headers)`` tuple, headers carry ``X-Next-Cursor`` when
+        another page is available
+    """
+    args = parser.parse_args()
+    limit = args.get('limit')
+    if limit is None:
+        limit = current_app.config.get('DEFAULT_PAGE_SIZE', 50)
+    if limit < 1:
+        abort(HTTPStatus.BAD_REQUEST.value, 'limit must be a positive integer')  # type: ignore
+    limit = min(limit, current_app.config.get('MAX_PAGE_SIZE', 200))
+
+    headers = {}
+    try:
+        items, next_cursor = fetch_page(args.get('cursor'), limit)
+        if count is not None:
+            headers['X-Total-Count'] = str(count())
+    except ValueError as e:
+        abort(HTTPStatus.BAD_REQUEST.value, str(e))  # type: ignore
+
+    if next_cursor:
+        headers['X-Next-Cursor'] = next_cursor
+    return items, headers
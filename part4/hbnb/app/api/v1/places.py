@@ -2,17 +2,28 @@
 
 """Place resource module for handling place-related operations."""
 
-from flask_restx import Namespace, Resource, fields, abort
-from flask import request
+from flask_restx import Namespace, Resource, fields, abort, reqparse
+from flask import current_app, request
 from http import HTTPStatus
+from functools import partial
 from app.services.facade import hbnb_facade as facade
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.api.v1.pagination import pagination_parser, paginate
+from app.persistence.place_repository import SEARCH_FILTERS
+from app.api.v1.streaming import wants_ndjson, ndjson_response
+from app.api.v1.bulk import create_bulk
+from app.api.v1.response_cache import cached_response
+from app.api.v1.conditional import conditional, collection_validators, make_validators
+from app.api.v1.document_cache import cached_document
+
+
+# Relationships format_place_response reads when include_owner is True:
+# load them eagerly with the place (see PlaceRepository.get_with)
+PLACE_DETAIL_INCLUDE = ('owner', 'amenities')
 
 
 def format_place_response(place, include_owner: bool = False):
     """Standardize place JSON response format"""
-    from app.services.facade import hbnb_facade as facade
-    
     # Build amenity details when needed
     amenities = []
     if include_owner:
@@ -31,17 +42,34 @@ def format_place_response(place, include_owner: bool = False):
         'longitude': place.longitude,
     }
     if include_owner:
-        base['owner'] = _get_owner_details(place.owner_id)
+        base['owner'] = _get_owner_details(place.user)
         base['amenities'] = amenities
+        base['review_count'] = place.review_count
+        base['average_rating'] = place.average_rating
+        base['rating_histogram'] = place.rating_histogram
     else:
         base['owner_id'] = place.owner_id
     return base
 
 
 
-def _get_owner_details(owner_id: str):
+def place_list_validators():
+    """Validators shared by the place lists: any place write changes them."""
+    return collection_validators(*facade.get_places_freshness())
+
+
+def place_detail_validators(place_id):
+    """Validators of the detail document: the place, its owner and its amenities."""
+    versions = facade.get_place_versions(place_id)
+    if versions is None:
+        return None
+    place_updated_at, owner_updated_at, _, newest_amenity = versions
+    return make_validators(('Place', place_id) + versions,
+                           (place_updated_at, owner_updated_at, newest_amenity))
+
+
+def _get_owner_details(owner):
     """Return detailed information about the owner (user) for embedding."""
-    owner = facade.get_user(owner_id)
     if not owner:
         return None
     return {
@@ -137,8 +165,11 @@ def format_place_summary(place):
     return {
         'id': place.id,
         'title': place.title,
+        'price': place.price,
         'latitude': place.latitude,
-        'longitude': place.longitude
+        'longitude': place.longitude,
+        'review_count': place.review_count,
+        'average_rating': place.average_rating
     }
 
 # Model for amenity representation
@@ -178,23 +209,67 @@ place_detail_model = api.model('PlaceDetailResponse', {
     'amenities': fields.List(
         fields.Nested(amenity_model),
         description='List of amenities with their details'
-    )
+    ),
+    'review_count': fields.Integer(description='Number of reviews'),
+    'average_rating': fields.Float(description='Average rating, null without reviews'),
+    'rating_histogram': fields.Raw(description='Number of reviews per rating, keyed "1" to "5"')
 })
 
 
+# Search filters accepted by GET /places/ on top of the pagination arguments
+place_search_parser = pagination_parser.copy()
+place_search_parser.add_argument('min_price', type=float, location='args',
+                                 help='Minimum price per night')
+place_search_parser.add_argument('max_price', type=float, location='args',
+                                 help='Maximum price per night')
+place_search_parser.add_argument('min_rating', type=float, location='args',
+                                 help='Minimum average rating (0-5)')
+place_search_parser.add_argument('amenities', type=str, action='split', location='args',
+                                 help='Comma-separated amenity IDs that must all be present')
+place_search_parser.add_argument('owner_id', type=str, location='args',
+                                 help='Only places owned by this user')
+
+
+def get_search_filters():
+    """Return the search filters present in the query string."""
+    args = place_search_parser.parse_args()
+    return {name: args[name] for name in SEARCH_FILTERS if args.get(name) is not None}
+
+
 @api.route('/')
 class PlaceList(Resource):
     
+    @api.expect(place_search_parser)
     @api.response(200, 'Success')
+    @api.response(400, 'Invalid cursor, limit or filter')
+    @conditional(place_list_validators)
+    @cached_response('places')
     def get(self):
         """
-        Retrieve all places
+        Retrieve places
         
-        Returns a list of all available places in the system.
+        Returns one page of places, oldest first, optionally filtered by price range,
+        minimum average rating, required amenities and owner. When more places are
+        available the X-Next-Cursor response header holds the cursor of the next page.
+        Send `Accept: application/x-ndjson` or `?stream=1` to stream every matching place
+        instead, one JSON object per line.
         For detailed information about a specific place, use GET /places/{id}
         """
-        places = facade.place_service.get_all_places()
-        return [format_place_summary(p) for p in places], 200
+        filters = get_search_filters()
+        if wants_ndjson():
+            try:
+                return ndjson_response(
+                    lambda batch_size: facade.iter_search_places(batch_size, **filters),
+                    format_place_summary
+                )
+            except ValueError as e:
+                abort(HTTPStatus.BAD_REQUEST.value, str(e))  # type: ignore
+        places, headers = paginate(
+            lambda cursor, limit: facade.search_places_page(cursor, limit, **filters),
+            place_search_parser,
+            count=lambda: facade.count_places(**filters)
+        )
+        return [format_place_summary(p) for p in places], 200, headers
 
     @api.expect(place_create_model, validate=True)
     @api.marshal_with(place_response_model, code=HTTPStatus.CREATED.value)  # type: ignore
@@ -226,9 +301,186 @@ class PlaceList(Resource):
             abort(HTTPStatus.INTERNAL_SERVER_ERROR.value, 'An unexpected error occurred')  # type: ignore
 
 
+@api.route('/bulk')
+class PlaceBulkCreate(Resource):
+    @api.expect([place_create_model])
+    @api.response(201, 'Places registered successfully')
+    @api.response(400, 'Invalid input, errors are reported per item')
+    @jwt_required()
+    def post(self):
+        """
+        Register several places at once
+        
+        Takes a JSON array of places. Every item is validated before anything
+        is written: if any item is invalid, no place is created and the response
+        lists the error of each invalid item with its index.
+        The owner of every place is the authenticated user.
+        """
+        try:
+            places = create_bulk(place_create_model, partial(facade.create_places, get_jwt_identity()))
+        except ValueError as e:
+            abort(HTTPStatus.BAD_REQUEST.value, str(e))  # type: ignore
+        return [format_place_response(p, include_owner=False) for p in places], HTTPStatus.CREATED
+
+
+# ?limit= of the leaderboard endpoints
+leaderboard_parser = reqparse.RequestParser()
+leaderboard_parser.add_argument('limit', type=int, location='args', default=10,
+                                help='Number of places to return (max RANKING_SIZE)')
+
+
+def leaderboard_response(fetch_ranked):
+    """Format a leaderboard as place summaries with their ranking score."""
+    limit = leaderboard_parser.parse_args()['limit']
+    if limit < 1:
+        abort(HTTPStatus.BAD_REQUEST.value, 'limit must be a positive integer')  # type: ignore
+    limit = min(limit, current_app.config['RANKING_SIZE'])
+    return [dict(format_place_summary(place), score=score)
+            for place, score in fetch_ranked(limit)], 200
+
+
+@api.route('/top')
+class PlaceTop(Resource):
+    @api.expect(leaderboard_parser)
+    @api.response(200, 'Best rated places, best first')
+    def get(self):
+        """
+        Best rated places
+        
+        Places ranked by Bayesian average rating: the average is pulled
+        towards the mean of all reviews until a place has enough reviews.
+        """
+        return leaderboard_response(facade.get_top_places)
+
+
+@api.route('/trending')
+class PlaceTrending(Resource):
+    @api.expect(leaderboard_parser)
+    @api.response(200, 'Trending places, most active first')
+    def get(self):
+        """
+        Trending places
+        
+        Places ranked by recent review activity: every review counts for 1
+        when written and half as much every TRENDING_HALF_LIFE_HOURS.
+        """
+        return leaderboard_response(facade.get_trending_places)
+
+
+# Query string of GET /places/nearby
+nearby_parser = reqparse.RequestParser()
+nearby_parser.add_argument('lat', type=float, location='args', required=True,
+                           help='Latitude of the center in degrees')
+nearby_parser.add_argument('lon', type=float, location='args', required=True,
+                           help='Longitude of the center in degrees')
+nearby_parser.add_argument('radius_km', type=float, location='args', default=5.0,
+                           help='Search radius in kilometers (max NEARBY_MAX_RADIUS_KM)')
+nearby_parser.add_argument('limit', type=int, location='args',
+                           help='Number of places to return (max MAX_PAGE_SIZE)')
+
+
+@api.route('/nearby')
+class PlaceNearby(Resource):
+    @api.expect(nearby_parser)
+    @api.response(200, 'Places within the radius, nearest first')
+    @api.response(400, 'Invalid center, radius or limit')
+    @conditional(place_list_validators)
+    def get(self):
+        """
+        Places around a point
+
+        Candidates come from the indexed geohash cells covering the circle,
+        then the exact great-circle distance filters and orders them.
+        """
+        args = nearby_parser.parse_args()
+        config = current_app.config
+        limit = args['limit'] if args['limit'] is not None else config['NEARBY_DEFAULT_LIMIT']
+        try:
+            matches = facade.get_nearby_places(args['lat'], args['lon'], args['radius_km'],
+                                               min(limit, config['MAX_PAGE_SIZE']),
+                                               config['NEARBY_MAX_RADIUS_KM'])
+        except ValueError as e:
+            abort(HTTPStatus.BAD_REQUEST.value, str(e))  # type: ignore
+        return [dict(format_place_summary(place), distance_km=round(distance, 3))
+                for place, distance in matches], 200
+
+
+# Query string of GET /places/nearest
+nearest_parser = reqparse.RequestParser()
+nearest_parser.add_argument('lat', type=float, location='args', required=True,
+                            help='Latitude of the point in degrees')
+nearest_parser.add_argument('lon', type=float, location='args', required=True,
+                            help='Longitude of the point in degrees')
+nearest_parser.add_argument('k', type=int, location='args', default=10,
+                            help='Number of places to return (max NEAREST_MAX_K)')
+nearest_parser.add_argument('min_price', type=float, location='args',
+                            help='Minimum price per night')
+nearest_parser.add_argument('max_price', type=float, location='args',
+                            help='Maximum price per night')
+
+
+@api.route('/nearest')
+class PlaceNearest(Resource):
+    @api.expect(nearest_parser)
+    @api.response(200, 'The k nearest places, nearest first')
+    @api.response(400, 'Invalid point, k or price range')
+    @conditional(place_list_validators)
+    def get(self):
+        """
+        Nearest places within a budget
+
+        Returns the k places nearest to the point whose price per night is
+        within [min_price, max_price], whatever their distance.
+        """
+        args = nearest_parser.parse_args()
+        k = min(args['k'], current_app.config['NEAREST_MAX_K'])
+        try:
+            matches = facade.get_nearest_places(args['lat'], args['lon'], k,
+                                                args['min_price'], args['max_price'])
+        except ValueError as e:
+            abort(HTTPStatus.BAD_REQUEST.value, str(e))  # type: ignore
+        return [dict(format_place_summary(place), distance_km=round(distance, 3))
+                for place, distance in matches], 200
+
+
+# Rectangle of GET /places/in_bbox on top of the pagination arguments
+bbox_parser = pagination_parser.copy()
+for name, help_text in (('min_lat', 'Southern edge in degrees'),
+                        ('min_lon', 'Western edge in degrees'),
+                        ('max_lat', 'Northern edge in degrees'),
+                        ('max_lon', 'Eastern edge in degrees (less than min_lon across the antimeridian)')):
+    bbox_parser.add_argument(name, type=float, location='args', required=True, help=help_text)
+
+
+@api.route('/in_bbox')
+class PlaceInBbox(Resource):
+    @api.expect(bbox_parser)
+    @api.response(200, 'Places inside the rectangle, oldest first')
+    @api.response(400, 'Invalid rectangle, cursor or limit')
+    @conditional(place_list_validators)
+    def get(self):
+        """
+        Places inside a rectangle
+
+        Serves the map viewport: returns one page of the places whose coordinates
+        fall inside the rectangle, read through the R*Tree index of the coordinates.
+        Pagination works as on GET /places/ (X-Next-Cursor, X-Total-Count).
+        """
+        args = bbox_parser.parse_args()
+        bbox = (args['min_lat'], args['min_lon'], args['max_lat'], args['max_lon'])
+        places, headers = paginate(
+            lambda cursor, limit: facade.get_places_in_bbox_page(*bbox, cursor, limit),
+            bbox_parser,
+            count=lambda: facade.count_places_in_bbox(*bbox)
+        )
+        return [format_place_summary(p) for p in places], 200, headers
+
+
 @api.route('/<place_id>')
 @api.param('place_id', 'The place identifier')
 class AdminPlaceModify(Resource):
+    @conditional(place_detail_validators)
+    @cached_document(facade.get_place_versions)
     @api.marshal_with(place_detail_model)
     @api.response(200, 'Place details retrieved successfully')
     @api.response(404, 'Place not found')
@@ -239,7 +491,7 @@ class AdminPlaceModify(Resource):
         Retrieve detailed information about a specific place,
         including owner details and associated amenities.
         """
-        place = facade.get_place(place_id)
+        place = facade.get_place(place_id, include=PLACE_DETAIL_INCLUDE)
         if not place:
             abort(404, 'Place not found')  # type: ignore
         return format_place_response(place, include_owner=True), 200
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+
+"""Cache of the encoded responses of the list and search endpoints.
+
+A response is stored under ``(endpoint, URL arguments, normalized query
+string, generations)``, where the generations are those of the entity types
+the endpoint lists (see :mod:`app.services.generations`). Any committed write
+of these types changes the key, so there is nothing to purge: the old entries
+are never requested again and leave the LRU on their own.
+
+The cached value is the final JSON body with its status and headers: a hit
+does not touch the database nor the serializer. Only ``200`` JSON responses
+are cached, never the NDJSON streams. ``RESPONSE_CACHE_ENABLED`` switches it
+off and on.
+"""
+
+from functools import wraps
+from flask import current_app, request
+from flask_restx.representations import output_json
+from werkzeug.wrappers import Response
+from app.api.v1.streaming import wants_ndjson
+from app.services import generations
+from app.services.entity_cache import LRUCache, MISSING
+
+
+def _get_cache() -> LRUCache:
+    cache = current_app.extensions.get('response_cache')
+    if cache is None:
+        config = current_app.config
+        cache = current_app.extensions.setdefault('response_cache', LRUCache(
+            config.get('RESPONSE_CACHE_MAX_ENTRIES', 1000),
+            config.get('RESPONSE_CACHE_TTL_SECONDS', 30)))
+    return cache
+
+
+def _normalized_args():
+    # ?limit=10&cursor=x et ?cursor=x&limit=10 sont la même requête
+    return tuple(sorted((name, tuple(values)) for name, values in request.args.lists()))
+
+
+def to_response(result) -> Response:
+    """Turn the return value of a Resource method into a JSON response."""
+    if isinstance(result, Response):
+        return result
+    if isinstance(result, tuple):
+        data, code, headers = (result + (None, None))[:3]
+    else:
+        data, code, headers = result, None, None
+    response = output_json(data, code or 200, headers)
+    # Ce que flask_restx ajoute dans Api.make_response
+    response.headers['Content-Type'] = 'application/json'
+    return response
+
+
+def cached_response(*entities: str):
+    """Cache the responses of a GET method, versioned by the generations of ``entities``.
+
+    Args:
+        *entities: Entity types whose writes change the response ('places',
+            'amenities', 'reviews')
+    """
+    def decorator(get):
+        @wraps(get)
+        def wrapper(resource, *args, **kwargs):
+            if not current_app.config.get('RESPONSE_CACHE_ENABLED') or wants_ndjson():
+                return get(resource, *args, **kwargs)
+            # Générations lues avant les données : une réponse calculée avant
+            # un commit reste rangée sous l'ancienne génération
+            key = (request.endpoint, tuple(sorted(kwargs.items())), _normalized_args(),
+                   generations.current(*entities))
+            cache = _get_cache()
+            entry = cache.get(key)
+            if entry is not MISSING:
+                body, status, headers = entry
+                return current_app.response_class(body, status, headers)
+            response = to_response(get(resource, *args, **kwargs))
+            if response.status_code == 200:
+                cache.set(key, (response.get_data(), response.status_code, list(response.headers)))
+            return response
+        return wrapper
+    return decorator
@@ -1,11 +1,28 @@
 from flask_restx import Namespace, Resource, fields, abort
 from http import HTTPStatus
+from functools import partial
 from app.services.facade import hbnb_facade as facade
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.place import Place
+from app.api.v1.pagination import pagination_parser, paginate
+from app.api.v1.streaming import wants_ndjson, ndjson_response
+from app.api.v1.bulk import create_bulk
+from app.api.v1.response_cache import cached_response
+from app.api.v1.conditional import conditional, collection_validators, entity_validators
 
 api = Namespace('reviews', description='Review operations')
 
+
+def format_review_response(review):
+    """Standard JSON representation of a review"""
+    return {
+        'id': review.id,
+        'text': review.text,
+        'rating': review.rating,
+        'user_id': review.user_id,
+        'place_id': review.place_id
+    }
+
 # Define the review model for input validation and documentation
 review_create_model = api.model('ReviewCreate', {
     'text': fields.String(
@@ -64,10 +81,8 @@ class ReviewList(Resource):
             place_id = review_data['place_id']
             
             # Vérifier si l'utilisateur a déjà posté un avis pour ce lieu
-            existing_reviews = facade.get_reviews_by_place(place_id)
-            for review in existing_reviews:
-                if review.user_id == user_id:
-                    abort(HTTPStatus.BAD_REQUEST.value, 'You have already reviewed this place')  # type: ignore
+            if facade.has_user_reviewed_place(user_id, place_id):
+                abort(HTTPStatus.BAD_REQUEST.value, 'You have already reviewed this place')  # type: ignore
             
             new_review = facade.create_review(
                 text=review_data['text'],
@@ -92,21 +107,50 @@ class ReviewList(Resource):
             # Let the exception propagate so it can be handled by the Flask-RestX error handler
             raise
 
+    @api.expect(pagination_parser)
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(400, 'Invalid cursor or limit')
+    @conditional(lambda: collection_validators(*facade.get_reviews_freshness()))
+    @cached_response('reviews')
     def get(self):
         """
-        Retrieve all reviews
+        Retrieve reviews
         
-        Returns a list of all reviews in the system.
+        Returns one page of reviews, oldest first. When more reviews are
+        available the X-Next-Cursor response header holds the cursor of the next page.
+        Send `Accept: application/x-ndjson` or `?stream=1` to stream every review
+        instead, one JSON object per line.
         For reviews of a specific place, use GET /places/{place_id}/reviews
         """
-        reviews = facade.get_all_reviews()
-        return [{'id': review.id, 'text': review.text, 'rating': review.rating, 'user_id': review.user_id, 'place_id': review.place_id} for review in reviews], 200
+        if wants_ndjson():
+            return ndjson_response(facade.iter_reviews, format_review_response)
+        reviews, headers = paginate(facade.get_reviews_page, count=facade.count_reviews)
+        return [format_review_response(review) for review in reviews], 200, headers
+
+@api.route('/bulk')
+class ReviewBulkCreate(Resource):
+    @api.expect([review_create_model])
+    @api.response(201, 'Reviews successfully created')
+    @api.response(400, 'Invalid input data, errors are reported per item')
+    @api.response(404, 'User not found')
+    @jwt_required()
+    def post(self):
+        """
+        Register several reviews at once
+        
+        Takes a JSON array of reviews written by the authenticated user.
+        Every item is validated before anything is written: if any item is invalid
+        (unknown place, own place, place already reviewed...), no review is created
+        and the response lists the error of each invalid item with its index.
+        """
+        reviews = create_bulk(review_create_model, partial(facade.create_reviews, get_jwt_identity()))
+        return [format_review_response(review) for review in reviews], 201
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
     @api.response(200, 'Review details retrieved successfully')
     @api.response(404, 'Review not found')
+    @conditional(lambda review_id: entity_validators(facade.get_review(review_id)))
     def get(self, review_id):
         """
         Get review details by ID
@@ -207,14 +251,19 @@ class ReviewResource(Resource):
 
 @api.route('/places/<place_id>/reviews')
 class PlaceReviewList(Resource):
+    @api.expect(pagination_parser)
     @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.response(400, 'Invalid cursor or limit')
     @api.response(404, 'Place not found')
+    @conditional(lambda place_id: collection_validators(*facade.get_reviews_freshness(place_id)))
+    @cached_response('reviews')
     def get(self, place_id):
         """
         Get reviews for a place
         
-        Retrieve all reviews associated with a specific place,
-        including user information and ratings.
+        Retrieve one page of the reviews associated with a specific place,
+        oldest first, including user information and ratings. When more reviews
+        are available the X-Next-Cursor response header holds the cursor of the next page.
         """
         # First check if the place exists
         place = facade.get_place(place_id)
@@ -222,5 +271,8 @@ class PlaceReviewList(Resource):
             return {'error': 'Place not found'}, 404
         
         # Get reviews for the place (can be empty list)
-        reviews = facade.get_reviews_by_place(place_id)
-        return [{'id': review.id, 'text': review.text, 'rating': review.rating, 'user_id': review.user_id, 'place_id': review.place_id} for review in reviews], 200
+        reviews, headers = paginate(
+            lambda cursor, limit: facade.get_reviews_by_place_page(place_id, cursor, limit),
+            count=lambda: facade.count_reviews_by_place(place_id)
+        )
+        return [format_review_response(review) for review in reviews], 200, headers
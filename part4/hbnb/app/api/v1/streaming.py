@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+
+"""NDJSON streaming helpers for list endpoints that can return a whole table."""
+
+import json
+from flask import Response, current_app, request, stream_with_context
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_ndjson() -> bool:
+    """Return True when the client asked for a newline-delimited JSON stream.
+    
+    Streaming is selected with ``?stream=1`` or by preferring
+    ``application/x-ndjson`` over ``application/json`` in the Accept header.
+    """
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    best = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+    return best == NDJSON_MIMETYPE
+
+
+def ndjson_response(iter_items, formatter) -> Response:
+    """Stream every item as one JSON document per line.
+    
+    Args:
+        iter_items: Callable taking a batch size and returning an iterator of model objects
+        formatter: Callable turning one model object into a JSON-serializable dict
+        
+    Returns:
+        A streaming Flask response; rows are read from the database in batches
+        while the body is being sent, so memory use stays constant
+    """
+    batch_size = current_app.config.get('STREAM_BATCH_SIZE', 1000)
+    # Called before the response starts so argument errors can still become a 4xx
+    items = iter_items(batch_size)
+
+    def generate():
+        for item in items:
+            yield json.dumps(formatter(item), separators=(',', ':')) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
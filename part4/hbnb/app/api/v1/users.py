@@ -5,6 +5,8 @@ from app.models.user import User
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from flask import request
 from flask_restx import fields
+from app.api.v1.pagination import pagination_parser, paginate
+from app.api.v1.conditional import conditional, collection_validators, entity_validators
 
 
 def format_user_response(user):
@@ -113,17 +115,22 @@ user_registration_response_model = api.model('UserRegistrationResponse', {
 
 @api.route('/')
 class UserList(Resource):
+    @api.expect(pagination_parser)
+    @conditional(lambda: collection_validators(*facade.get_users_freshness()))
     @api.marshal_list_with(user_response_model)
     @api.response(200, 'Success')
+    @api.response(400, 'Invalid cursor or limit')
     def get(self):
         """
-        Retrieve all users
+        Retrieve users
         
-        Returns a list of all users with their basic information.
+        Returns one page of users with their basic information, oldest first.
+        When more users are available the X-Next-Cursor response header holds
+        the cursor of the next page.
         For detailed user information, use GET /users/{user_id}
         """
-        users = facade.get_all_users()
-        return [format_user_response(user) for user in users], 200
+        users, headers = paginate(facade.get_users_page, count=facade.count_users)
+        return [format_user_response(user) for user in users], 200, headers
 
     @jwt_required()
     @api.expect(user_model, validate=True)
@@ -179,6 +186,7 @@ class UserList(Resource):
 
 @api.route('/<user_id>')
 class UserResource(Resource):
+    @conditional(lambda user_id: entity_validators(facade.get_user(user_id)))
     @api.marshal_with(user_response_model)
     @api.response(200, 'User details retrieved successfully')
     @api.response(404, 'User not found')
@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+
+"""Maintenance commands available through ``flask --app run <command>``."""
+
+import click
+from app.persistence.migrations import add_missing_columns, add_missing_indexes
+from app.persistence.unit_of_work import unit_of_work
+
+
+def _add_missing_columns() -> None:
+    """Add the columns and indexes an older database lacks before filling them."""
+    added = add_missing_columns()
+    if added:
+        click.echo(f"Columns added: {', '.join(added)}")
+    created = add_missing_indexes()
+    if created:
+        click.echo(f"Indexes created: {', '.join(created)}")
+
+
+@click.command('repair-review-aggregates')
+def repair_review_aggregates_command():
+    """Recompute review_count, rating_sum and the rating histogram of every place."""
+    from app.services.facade import hbnb_facade as facade
+    _add_missing_columns()
+    with unit_of_work():
+        places = facade.repair_review_aggregates()
+    click.echo(f"Review aggregates recomputed ({places} reviewed places)")
+
+
+@click.command('backfill-geohash')
+def backfill_geohash_command():
+    """Compute the geohash of the places created before the column existed."""
+    from app.services.facade import hbnb_facade as facade
+    _add_missing_columns()
+    with unit_of_work():
+        places = facade.fill_missing_geohashes()
+    click.echo(f"Geohash computed for {places} places")
+
+
+def init_app(app) -> None:
+    """Register the maintenance commands on the application CLI."""
+    app.cli.add_command(repair_review_aggregates_command)
+    app.cli.add_command(backfill_geohash_command)
@@ -3,6 +3,68 @@ import os
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Page size of list endpoints when no ?limit= is given, and its upper bound
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 200
+    # Rows fetched per round trip by the NDJSON streaming mode of list endpoints
+    STREAM_BATCH_SIZE = 1000
+    # Largest array accepted by the POST .../bulk endpoints
+    MAX_BULK_ITEMS = 5000
+    # Make lazy loads of relationships raise instead of querying (used by tests
+    # to make sure every endpoint eager-loads what it serializes)
+    RAISE_ON_LAZY_LOAD = False
+    # Leaderboards of GET /places/top and /places/trending: number of places kept,
+    # weight of the global mean in the Bayesian average, decay of the trending
+    # score and age after which a process rebuilds them from the database
+    RANKING_SIZE = 100
+    RANKING_PRIOR_WEIGHT = 5
+    TRENDING_HALF_LIFE_HOURS = 72
+    RANKING_REFRESH_SECONDS = 300
+    # GET /places/nearby: largest search radius and default number of results
+    NEARBY_MAX_RADIUS_KM = 500
+    NEARBY_DEFAULT_LIMIT = 20
+    # Read-through cache of the users, places and amenities looked up by id
+    # (app/services/entity_cache.py): 'lru' or 'none', bounded size and TTL
+    ENTITY_CACHE = 'lru'
+    ENTITY_CACHE_MAX_ENTRIES = 10000
+    ENTITY_CACHE_TTL_SECONDS = 60
+    # Cache of the encoded responses of the list endpoints (app/api/v1/response_cache.py),
+    # versioned by the generations of the entity types they list
+    RESPONSE_CACHE_ENABLED = True
+    RESPONSE_CACHE_MAX_ENTRIES = 1000
+    RESPONSE_CACHE_TTL_SECONDS = 30
+    # Byte budget of the encoded GET /places/<id> documents (app/api/v1/document_cache.py),
+    # 0 to disable
+    PLACE_DOCUMENT_CACHE_BYTES = 16 * 1024 * 1024
+    # Static frontend (app/frontend.py): folder of the HTML pages and their assets, and
+    # the URL prefix they are served under (the API documentation keeps /)
+    FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    FRONTEND_URL_PREFIX = '/app'
+    # GET /places/nearest: largest k, and whether the in-memory NumPy index serves it
+    # (app/services/place_index.py; without NumPy the database answers)
+    NEAREST_MAX_K = 100
+    PLACE_INDEX_ENABLED = True
+    # Serve GET /places/in_bbox from the SQLite R*Tree index (app/persistence/spatial_index.py);
+    # off, or without the rtree module, the (latitude, longitude) index is used
+    USE_RTREE_INDEX = True
+    # Primary key generator: 'uuid7' (time-ordered, see app/models/ids.py) or 'uuid4'
+    ID_GENERATOR = 'uuid7'
+    # Bind of SQLALCHEMY_BINDS serving the reads (None: everything on the primary).
+    # REPLICA_SYNC_ON_COMMIT copies the primary SQLite file into the replica after
+    # each commit, a local stand-in for real replication
+    READ_REPLICA_BIND = None
+    REPLICA_SYNC_ON_COMMIT = False
+    # Pragmas set on every SQLite connection (ignored for other databases):
+    # WAL so readers do not wait for writers, 64 MiB page cache, 256 MiB mmap
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -64000,
+        'mmap_size': 268435456,
+        'temp_store': 'MEMORY',
+        'foreign_keys': 'ON',
+    }
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -18,7 +80,41 @@ class DevelopmentConfig(Config):
     SQLALCHEMY_DATABASE_URI = f'sqlite:///{db_path}'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+def database_url(default: str) -> str:
+    """Return DATABASE_URL from the environment, or the default URI.
+    
+    The ``postgres://`` scheme still given by some hosting providers is
+    rewritten to ``postgresql://``, the only one SQLAlchemy accepts.
+    """
+    url = os.getenv('DATABASE_URL', default)
+    if url.startswith('postgres://'):
+        url = 'postgresql://' + url[len('postgres://'):]
+    return url
+
+
+class ProductionConfig(Config):
+    DEBUG = False
+    basedir = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
+    SQLALCHEMY_DATABASE_URI = database_url(
+        'sqlite:///' + os.path.join(basedir, 'instance', 'production.db').replace('\\', '/'))
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_RECORD_QUERIES = False
+    # Pool partagé par les threads des workers : pool_size connexions gardées
+    # ouvertes, max_overflow en plus sous pic de charge, puis pool_timeout
+    # secondes d'attente avant l'erreur. pre_ping écarte les connexions mortes,
+    # recycle les renouvelle avant les timeouts du serveur de base de données.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', 20)),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', 30)),
+        'pool_pre_ping': True,
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', 1800)),
+        # Nombre de requêtes SQL compilées gardées en cache par l'engine
+        'query_cache_size': int(os.getenv('DB_STATEMENT_CACHE_SIZE', 1200)),
+    }
+
 config = {
     'development': DevelopmentConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
\ No newline at end of file
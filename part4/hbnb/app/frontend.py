@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+
+"""Serving of the static frontend: HTML pages, script, stylesheet and images.
+
+At startup every file is read once and fingerprinted with a hash of its
+content (``script.js`` is also served as ``script.<hash>.js``), then
+compressed with gzip and brotli (``brotli`` is in the requirements; without
+it only gzip is offered). The HTML shells are rewritten to reference the fingerprinted
+names, so these can be cached for a year as ``immutable``: a new version of
+a file gets a new URL. Only the shells, which keep their names, are
+revalidated on every load (``no-cache`` with an ETag, answered by a ``304``).
+
+Files are served under ``FRONTEND_URL_PREFIX`` (``/app/``); ``/`` stays the
+API documentation. Only the pages and the assets of ``FRONTEND_DIR`` are
+served, never the Python sources or the database next to them.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from typing import Dict
+from flask import Blueprint, abort, current_app, request
+from werkzeug.http import is_resource_modified, quote_etag
+from werkzeug.wrappers import Response
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    brotli = None
+
+# Sous-dossiers de FRONTEND_DIR servis en plus de ses fichiers de premier niveau
+ASSET_DIRECTORIES = ('', 'images')
+PAGE_EXTENSIONS = ('.html',)
+ASSET_EXTENSIONS = ('.js', '.css', '.png', '.jpg', '.jpeg', '.gif', '.svg', '.ico', '.webp')
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'no-cache'
+
+# Types worth compressing; images are already compressed
+COMPRESSIBLE = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+MIN_COMPRESS_SIZE = 256
+
+# src="..." and href="..." attributes of the HTML shells
+ASSET_REFERENCE = re.compile(r'\b(src|href)="([^"?#]+)"')
+
+frontend = Blueprint('frontend', __name__)
+
+
+class Asset:
+    """One servable file with its precompressed variants."""
+
+    def __init__(self, body: bytes, mimetype: str, cache_control: str):
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.etag = hashlib.sha256(body).hexdigest()[:16]
+        self.variants: Dict[str, bytes] = {'identity': body}
+        if mimetype.startswith(COMPRESSIBLE) and len(body) >= MIN_COMPRESS_SIZE:
+            # mtime=0 : même contenu, mêmes octets d'un démarrage à l'autre
+            compressed = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                compressed['br'] = brotli.compress(body, quality=11)
+            for encoding, data in compressed.items():
+                if len(data) < len(body):
+                    self.variants[encoding] = data
+
+    def _encoding(self) -> str:
+        """Best variant accepted by the client, brotli first on equal quality."""
+        best, best_quality = 'identity', 0
+        for encoding in ('br', 'gzip'):
+            quality = request.accept_encodings[encoding] if encoding in self.variants else 0
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def response(self) -> Response:
+        encoding = self._encoding()
+        # Un ETag fort par variante : les octets diffèrent d'un encodage à l'autre
+        etag = self.etag if encoding == 'identity' else f'{self.etag}-{encoding}'
+        headers = {'ETag': quote_etag(etag), 'Cache-Control': self.cache_control,
+                   'Vary': 'Accept-Encoding'}
+        if not is_resource_modified(request.environ, etag=etag):
+            return current_app.response_class(status=304, headers=headers)
+        if encoding != 'identity':
+            headers['Content-Encoding'] = encoding
+        return current_app.response_class(self.variants[encoding], mimetype=self.mimetype,
+                                          headers=headers)
+
+
+def fingerprint(name: str, body: bytes) -> str:
+    """Insert a hash of ``body`` before the extension: ``images/logo.png`` -> ``images/logo.<hash>.png``."""
+    stem, extension = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(body).hexdigest()[:12]}{extension}"
+
+
+def _mimetype(name: str) -> str:
+    return mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+
+def build_assets(directory: str) -> Dict[str, Asset]:
+    """Read, fingerprint and compress the frontend files of ``directory``.
+
+    Args:
+        directory: Folder holding the HTML pages, with the assets next to them
+            or in one of ASSET_DIRECTORIES
+
+    Returns:
+        The servable files by URL path relative to the frontend prefix: every
+        asset under its own name (revalidated) and its fingerprinted name
+        (immutable), and every page rewritten to use the fingerprinted names
+    """
+    pages: Dict[str, bytes] = {}
+    assets: Dict[str, Asset] = {}
+    manifest: Dict[str, str] = {}
+    for subdirectory in ASSET_DIRECTORIES:
+        folder = os.path.join(directory, subdirectory)
+        if not os.path.isdir(folder):
+            continue
+        for entry in sorted(os.listdir(folder)):
+            path = os.path.join(folder, entry)
+            extension = os.path.splitext(entry)[1].lower()
+            if not os.path.isfile(path) or extension not in PAGE_EXTENSIONS + ASSET_EXTENSIONS:
+                continue
+            name = f"{subdirectory}/{entry}" if subdirectory else entry
+            with open(path, 'rb') as f:
+                body = f.read()
+            if extension in PAGE_EXTENSIONS:
+                pages[name] = body
+                continue
+            manifest[name] = fingerprint(name, body)
+            assets[manifest[name]] = Asset(body, _mimetype(name), IMMUTABLE)
+            assets[name] = Asset(body, _mimetype(name), REVALIDATE)
+
+    def rewrite(match):
+        attribute, target = match.groups()
+        return f'{attribute}="{manifest.get(target, target)}"'
+
+    for name, body in pages.items():
+        html = ASSET_REFERENCE.sub(rewrite, body.decode('utf-8'))
+        assets[name] = Asset(html.encode('utf-8'), 'text/html', REVALIDATE)
+    return assets
+
+
+def get_assets() -> Dict[str, Asset]:
+    """Return the frontend files of the current app, built at startup."""
+    return current_app.extensions['frontend']
+
+
+@frontend.route('/<path:filename>')
+def serve(filename):
+    asset = get_assets().get(filename)
+    if asset is None:
+        abort(404)
+    return asset.response()
+
+
+@frontend.route('/')
+def index():
+    return serve('index.html')
+
+
+def init_app(app) -> None:
+    """Build the frontend files once and register their routes."""
+    directory = app.config.get('FRONTEND_DIR')
+    if not directory or not os.path.isdir(directory):
+        app.logger.warning("Frontend directory %s not found, the frontend is not served", directory)
+        return
+    app.extensions['frontend'] = build_assets(directory)
+    app.register_blueprint(frontend, url_prefix=app.config.get('FRONTEND_URL_PREFIX', '/app'))
@@ -2,27 +2,50 @@
 
 """Defines the base model class for all models in the application."""
 from app import db
-import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+from sqlalchemy.orm import declared_attr
+from app.models.ids import id_type, new_id
+
+
+def utcnow() -> datetime:
+    """Return the current time as a naive UTC datetime.
+
+    Every ``created_at``/``updated_at`` is stamped from this clock, whatever
+    the time zone of the server, so stamps written by the model, by the
+    column defaults and by bulk UPDATEs compare with each other.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 class BaseModel(db.Model):
     """Base class for all models with common attributes and methods."""
     __abstract__ = True
 
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Ids ordonnés dans le temps (UUIDv7 par défaut, voir app/models/ids.py)
+    id = db.Column(id_type(), primary_key=True, default=new_id)
+    created_at = db.Column(db.DateTime, default=utcnow)
+    updated_at = db.Column(db.DateTime, default=utcnow, onupdate=utcnow)
+
+    # Extra composite indexes of a model, as tuples of column names
+    _composite_indexes = ()
+
+    @declared_attr
+    def __table_args__(cls):
+        """Index (created_at, id) so keyset pagination reads rows in index order,
+        plus the composite indexes declared by the model."""
+        indexes = (('created_at', 'id'),) + tuple(cls._composite_indexes)
+        return tuple(db.Index(f"ix_{cls.__tablename__}_{'_'.join(columns)}", *columns)
+                     for columns in indexes)
 
     def __init__(self):
         """Initialize a new model instance with unique ID and timestamps."""
-        self.id = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self.id = new_id()
+        self.created_at = utcnow()
+        self.updated_at = utcnow()
 
     def save(self):
         """Update the updated_at timestamp to current time."""
-        self.updated_at = datetime.now()
+        self.updated_at = utcnow()
 
     def update(self, data):
         """
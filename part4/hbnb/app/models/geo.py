@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+
+"""Geohash encoding and distance helpers used by the place location search.
+
+A geohash interleaves the bits of the longitude and the latitude and writes
+them in base 32, so places close to each other share a common prefix and a
+prefix is a rectangular cell. ``geohash >= cell AND geohash < cell + '~'``
+is therefore an index range scan returning the places of that cell.
+"""
+
+import math
+from typing import List, Tuple
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+GEOHASH_PRECISION = 12
+EARTH_RADIUS_KM = 6371.0088
+# Même sphère que haversine_km : sinon la bande de latitude est trop étroite
+KM_PER_DEGREE_LAT = math.radians(1) * EARTH_RADIUS_KM
+
+
+def encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    """Return the geohash of a point.
+
+    Args:
+        latitude: Latitude in degrees, -90 to 90
+        longitude: Longitude in degrees, -180 to 180
+        precision: Number of characters of the geohash
+    """
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, char_value, even = [], 0, 0, True
+    while len(chars) < precision:
+        # Bits pairs : longitude, bits impairs : latitude
+        interval, value = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        char_value <<= 1
+        if value >= middle:
+            char_value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[char_value])
+            bits, char_value = 0, 0
+    return ''.join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Return the ``(height, width)`` in degrees of the cells of a precision."""
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+
+def radius_in_degrees(latitude: float, radius_km: float) -> Tuple[float, float]:
+    """Return the ``(latitude, longitude)`` extent in degrees of a radius around a point."""
+    lat_degrees = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = math.cos(math.radians(min(abs(latitude) + lat_degrees, 89.9)))
+    return lat_degrees, min(radius_km / (KM_PER_DEGREE_LAT * cos_lat), 360.0)
+
+
+def covering_cells(latitude: float, longitude: float, radius_km: float) -> List[str]:
+    """Return the geohash cells that contain every point within ``radius_km``.
+
+    The precision is the finest one whose cells are at least as large as the
+    radius in both directions: the circle then fits within the cell of the
+    center and its 8 neighbours.
+
+    Returns:
+        Up to 9 distinct cells, an empty string meaning "the whole world"
+    """
+    lat_radius, lon_radius = radius_in_degrees(latitude, radius_km)
+    precision = 0
+    while precision < GEOHASH_PRECISION:
+        height, width = cell_size(precision + 1)
+        if height < lat_radius or width < lon_radius:
+            break
+        precision += 1
+    if precision == 0:
+        return ['']
+    height, width = cell_size(precision)
+    cells = set()
+    for dlat in (-height, 0.0, height):
+        for dlon in (-width, 0.0, width):
+            lat = latitude + dlat
+            if not -90.0 <= lat <= 90.0:
+                continue
+            # Longitude ramenée dans [-180, 180) de l'autre côté de l'antiméridien
+            lon = (longitude + dlon + 180.0) % 360.0 - 180.0
+            cells.add(encode(lat, lon, precision))
+    return sorted(cells)
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two points in kilometers."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
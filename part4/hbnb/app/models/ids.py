@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+
+"""Primary key generation and storage for the models.
+
+Ids are UUIDv7 by default: the first 48 bits are the creation time in
+milliseconds, so new ids sort after the existing ones and index inserts
+append to the end of the B-tree instead of landing on random pages. The
+canonical 36-character string form is kept everywhere in the API.
+
+``ID_GENERATOR`` in the app config picks the generator (``uuid7`` or the
+legacy random ``uuid4``). Setting ``HBNB_BINARY_IDS=1`` in the environment
+stores ids and foreign keys as 16-byte binary columns instead of text; like
+any column type change it only applies to a new database.
+"""
+
+import os
+import secrets
+import threading
+import time
+import uuid
+from flask import current_app, has_app_context
+from sqlalchemy import LargeBinary, String
+from sqlalchemy.types import TypeDecorator
+
+DEFAULT_ID_GENERATOR = 'uuid7'
+
+# Stockage des ids en binaire (16 octets) plutôt qu'en texte (36 caractères)
+BINARY_IDS = os.getenv('HBNB_BINARY_IDS', '0') == '1'
+
+_uuid7_lock = threading.Lock()
+_uuid7_last = (0, 0)
+
+
+def uuid7() -> uuid.UUID:
+    """Return a time-ordered UUID (RFC 9562 version 7).
+
+    Ids created within the same millisecond stay ordered thanks to the
+    12-bit counter that follows the timestamp.
+    """
+    global _uuid7_last
+    with _uuid7_lock:
+        millis = time.time_ns() // 1_000_000
+        last_millis, counter = _uuid7_last
+        if millis <= last_millis:
+            # Même milliseconde (ou horloge qui recule) : on incrémente le compteur
+            millis, counter = last_millis, counter + 1
+            if counter > 0xFFF:
+                millis, counter = millis + 1, 0
+        else:
+            counter = secrets.randbits(8)
+        _uuid7_last = (millis, counter)
+    value = (millis & 0xFFFFFFFFFFFF) << 80
+    value |= 0x7 << 76 | counter << 64
+    value |= 0b10 << 62 | secrets.randbits(62)
+    return uuid.UUID(int=value)
+
+
+ID_GENERATORS = {
+    'uuid7': uuid7,
+    'uuid4': uuid.uuid4,
+}
+
+
+def new_id() -> str:
+    """Return a new primary key in canonical string form.
+
+    Raises:
+        ValueError: If ID_GENERATOR names an unknown generator
+    """
+    name = DEFAULT_ID_GENERATOR
+    if has_app_context():
+        name = current_app.config.get('ID_GENERATOR', DEFAULT_ID_GENERATOR)
+    try:
+        return str(ID_GENERATORS[name]())
+    except KeyError:
+        raise ValueError(f"Unknown id generator: {name}")
+
+
+class UUIDString(TypeDecorator):
+    """UUID exposed as its canonical string, stored as text or as 16 bytes.
+
+    In binary mode, a value that is not a UUID (e.g. an id typed in a URL)
+    is bound as NULL so that lookups simply find nothing.
+    """
+    impl = String(36)
+    cache_ok = True
+
+    def __init__(self, binary: bool = False):
+        super().__init__()
+        self.binary = binary
+
+    def load_dialect_impl(self, dialect):
+        if self.binary:
+            return dialect.type_descriptor(LargeBinary(16))
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or not self.binary:
+            return value
+        try:
+            return uuid.UUID(str(value)).bytes
+        except ValueError:
+            return None
+
+    def process_result_value(self, value, dialect):
+        if value is None or not self.binary:
+            return value
+        return str(uuid.UUID(bytes=value))
+
+
+def id_type() -> UUIDString:
+    """Column type of primary and foreign keys."""
+    return UUIDString(binary=BINARY_IDS)
@@ -3,9 +3,10 @@
 """Defines the Place model for the application."""
 from sqlalchemy.orm import relationship, validates
 from app import db
-import uuid
+from app.models.ids import id_type
+from app.models.geo import encode as geohash_encode
 from app.models.base_model import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
 from app.models.user import User
 from app.models.review import Review
 from app.models.amenity import Amenity
@@ -20,22 +21,43 @@ class Place(BaseModel):
         price (float): Price per night
         latitude (float): Geographic latitude
         longitude (float): Geographic longitude
+        geohash (str): Geohash of (latitude, longitude), kept in sync by the validators
         owner_id (str): ID of the user who owns this place
         reviews (List[Review]): List of reviews for this place
         amenities (List[Amenity]): List of amenities available at this place
+        review_count (int): Number of reviews of this place
+        rating_sum (int): Sum of the ratings of these reviews
+        rating_count_1 .. rating_count_5 (int): Number of reviews per rating
     """
 
+    # Colonne du compteur de chaque note dans l'histogramme
+    RATING_COLUMNS = {rating: f'rating_count_{rating}' for rating in range(1, 6)}
+
     place_amenity = db.Table('place_amenity',
-        db.Column('place_id', db.String(60), db.ForeignKey('places.id'), primary_key=True),
-        db.Column('amenity_id', db.String(60), db.ForeignKey('amenities.id'), primary_key=True)
+        db.Column('place_id', id_type(), db.ForeignKey('places.id'), primary_key=True),
+        db.Column('amenity_id', id_type(), db.ForeignKey('amenities.id'), primary_key=True),
+        # The primary key only serves lookups by place, this one serves "places with amenity X"
+        db.Index('ix_place_amenity_amenity_id', 'amenity_id')
     )
     
     title = db.Column(db.String(120), nullable=False)
     description = db.Column(db.Text, nullable=False)
-    price = db.Column(db.Float, nullable=False)
+    price = db.Column(db.Float, nullable=False, index=True)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
-    owner_id = db.Column(db.String(60), db.ForeignKey('users.id'), nullable=False)
+    # Cellule géographique indexée, sert la recherche /places/nearby
+    geohash = db.Column(db.String(12), index=True)
+    owner_id = db.Column(id_type(), db.ForeignKey('users.id'), nullable=False, index=True)
+    # Agrégats des avis, tenus à jour par ReviewService dans la même transaction
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_count_1 = db.Column(db.Integer, nullable=False, default=0)
+    rating_count_2 = db.Column(db.Integer, nullable=False, default=0)
+    rating_count_3 = db.Column(db.Integer, nullable=False, default=0)
+    rating_count_4 = db.Column(db.Integer, nullable=False, default=0)
+    rating_count_5 = db.Column(db.Integer, nullable=False, default=0)
+    # Repli des requêtes par rectangle quand l'index R*Tree n'est pas disponible
+    _composite_indexes = (('latitude', 'longitude'),)
     user = db.relationship('User', backref='places', lazy=True)
     reviews = db.relationship('Review', backref='place', lazy=True)
     amenities = db.relationship('Amenity', secondary=place_amenity, backref='places', lazy=True)
@@ -66,9 +88,26 @@ class Place(BaseModel):
         self.latitude = latitude
         self.longitude = longitude
         self.owner_id = owner_id
+        self.review_count = 0
+        self.rating_sum = 0
+        for column in self.RATING_COLUMNS.values():
+            setattr(self, column, 0)
         self.reviews: List['Review'] = []
         self.amenities: List['Amenity'] = []
 
+    @property
+    def average_rating(self) -> Optional[float]:
+        """Average rating of the place, None when it has no review."""
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 2)
+
+    @property
+    def rating_histogram(self) -> Dict[str, int]:
+        """Number of reviews for each rating, keyed '1' to '5'."""
+        return {str(rating): getattr(self, column) or 0
+                for rating, column in self.RATING_COLUMNS.items()}
+
     @validates('price')
     def validate_price(self, key, value):
         try:
@@ -87,6 +126,7 @@ class Place(BaseModel):
             raise ValueError("latitude must be a number")
         if not -90 <= value <= 90:
             raise ValueError("latitude must be between -90 and 90")
+        self._update_geohash(value, self.longitude)
         return value
 
     @validates('longitude')
@@ -97,4 +137,10 @@ class Place(BaseModel):
             raise ValueError("longitude must be a number")
         if not -180 <= value <= 180:
             raise ValueError("longitude must be between -180 and 180")
-        return value
\ No newline at end of file
+        self._update_geohash(self.latitude, value)
+        return value
+
+    def _update_geohash(self, latitude: Optional[float], longitude: Optional[float]) -> None:
+        # Appelé par les validateurs avant l'affectation de la nouvelle valeur
+        if latitude is not None and longitude is not None:
+            self.geohash = geohash_encode(latitude, longitude)
\ No newline at end of file
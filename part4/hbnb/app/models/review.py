@@ -2,7 +2,7 @@
 
 """Defines the Review model for the application."""
 from app import db
-import uuid
+from app.models.ids import id_type
 from app.models.base_model import BaseModel
 from sqlalchemy.orm import validates
 
@@ -16,10 +16,13 @@ class Review(BaseModel):
         user_id (str): ID of the user who wrote the review
     """
     __tablename__ = 'reviews'
+    # Serves WHERE place_id = ? and returns a place's reviews already sorted for pagination
+    _composite_indexes = (('place_id', 'created_at', 'id'),)
+
     text = db.Column(db.Text, nullable=False)
     rating = db.Column(db.Integer, nullable=False)
-    place_id = db.Column(db.String(60), db.ForeignKey('places.id'), nullable=False)
-    user_id = db.Column(db.String(60), db.ForeignKey('users.id'), nullable=False)
+    place_id = db.Column(id_type(), db.ForeignKey('places.id'), nullable=False)
+    user_id = db.Column(id_type(), db.ForeignKey('users.id'), nullable=False, index=True)
     
     def __init__(self,
                 text: str,
@@ -1,6 +1,29 @@
+from typing import Iterable, Set
+from sqlalchemy import delete, select, update
+from app import db
 from app.models.amenity import Amenity
-from app.persistence.repository import SQLAlchemyRepository
+from app.models.base_model import utcnow
+from app.models.place import Place
+from app.persistence.repository import SQLAlchemyRepository, DEFAULT_BATCH_SIZE
 
 class AmenityRepository(SQLAlchemyRepository):
     def __init__(self):
-        super().__init__(Amenity)
\ No newline at end of file
+        super().__init__(Amenity)
+
+    def get_taken_names(self, names: Iterable[str]) -> Set[str]:
+        # Seulement les noms demandés, un IN (...) par tranche comme get_many
+        names = list(dict.fromkeys(names))
+        taken = set()
+        for start in range(0, len(names), DEFAULT_BATCH_SIZE):
+            chunk = names[start:start + DEFAULT_BATCH_SIZE]
+            taken.update(db.session.scalars(select(Amenity.name).where(Amenity.name.in_(chunk))))
+        return taken
+
+    def delete_by_id(self, obj_id):
+        # Le DELETE direct ne passe pas par l'ORM : retirer d'abord les liens
+        # place_amenity (clé étrangère), dans la même transaction
+        links = Place.place_amenity
+        linked = select(links.c.place_id).where(links.c.amenity_id == obj_id)
+        db.session.execute(update(Place).where(Place.id.in_(linked)).values(updated_at=utcnow()))
+        db.session.execute(delete(links).where(links.c.amenity_id == obj_id))
+        return super().delete_by_id(obj_id)
\ No newline at end of file
@@ -0,0 +1,232 @@
+"""In-memory implementation of the Repository pattern.
+
+This module provides a simple in-memory storage implementation of the Repository
+interface, primarily used for testing and development purposes.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+from app.persistence.repository import (Repository, DEFAULT_BATCH_SIZE,
+                                        DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor)
+
+T = TypeVar('T')
+
+class InMemoryRepository(Repository[T]):
+    """In-memory implementation of the Repository interface.
+    
+    This implementation stores objects in a dictionary in memory.
+    It's not persistent between application restarts.
+    """
+    
+    def __init__(self):
+        """Initialize a new in-memory repository with empty storage."""
+        self._storage: Dict[str, T] = {}
+
+    def add(self, obj: T) -> T:
+        """Add a new object to the repository.
+        
+        Args:
+            obj: The object to add (must have an 'id' attribute)
+            
+        Returns:
+            The added object
+            
+        Note:
+            The object's ID will be used as the dictionary key
+        """
+        self._storage[obj.id] = obj
+        return obj
+
+    def add_many(self, objs: List[T], batch_size: int = DEFAULT_BATCH_SIZE) -> List[T]:
+        """Add several objects to the repository.
+        
+        Args:
+            objs: The objects to add
+            batch_size: Ignored, kept for interface compatibility
+            
+        Returns:
+            The added objects
+        """
+        objs = list(objs)
+        for obj in objs:
+            self._storage[obj.id] = obj
+        return objs
+
+    def get(self, obj_id: str) -> Optional[T]:
+        """Retrieve an object by its ID.
+        
+        Args:
+            obj_id: The unique identifier of the object
+            
+        Returns:
+            The object if found, None otherwise
+        """
+        return self._storage.get(obj_id)
+
+    def get_many(self, obj_ids: Iterable[str]) -> Dict[str, T]:
+        """Retrieve several objects by their IDs.
+        
+        Args:
+            obj_ids: The unique identifiers of the objects
+            
+        Returns:
+            A dictionary mapping each found ID to its object
+        """
+        return {obj_id: self._storage[obj_id] for obj_id in obj_ids if obj_id in self._storage}
+
+    def get_all(self) -> List[T]:
+        """Retrieve all objects in the repository.
+        
+        Returns:
+            A list of all objects in the repository
+        """
+        return list(self._storage.values())
+
+    def _sorted(self) -> List[T]:
+        """Return all objects ordered like the SQL repositories, by (created_at, id)."""
+        return sorted(self._storage.values(), key=lambda obj: (obj.created_at, obj.id))
+
+    def get_page(self, cursor: Optional[str] = None,
+                 limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[T], Optional[str]]:
+        """Retrieve one page of objects ordered by ``(created_at, id)``.
+        
+        Args:
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of objects to return
+            
+        Returns:
+            A ``(items, next_cursor)`` tuple
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        items = self._sorted()
+        if cursor:
+            position = decode_cursor(cursor)
+            items = [obj for obj in items if (obj.created_at, obj.id) > position]
+        if len(items) <= limit:
+            return items, None
+        items = items[:limit]
+        return items, encode_cursor(items[-1].created_at, items[-1].id)
+
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[T]:
+        """Iterate over every object ordered by ``(created_at, id)``.
+        
+        Args:
+            batch_size: Ignored, everything is already in memory
+            
+        Returns:
+            An iterator over all objects in the repository
+        """
+        return iter(self._sorted())
+
+    def update(self, obj_id: str, data: Dict[str, Any]) -> Optional[T]:
+        """Update an existing object.
+        
+        Args:
+            obj_id: The ID of the object to update
+            data: Dictionary of attributes to update
+            
+        Returns:
+            The updated object if found, None otherwise
+            
+        Note:
+            The object must implement an 'update' method that accepts a dictionary
+            of attributes to update.
+        """
+        obj = self.get(obj_id)
+        if obj:
+            obj.update(data)
+            return obj
+        return None
+
+    def delete(self, obj_id: str) -> bool:
+        """Delete an object from the repository.
+        
+        Args:
+            obj_id: The ID of the object to delete
+            
+        Returns:
+            True if the object was deleted, False otherwise
+        """
+        if obj_id in self._storage:
+            del self._storage[obj_id]
+            return True
+        return False
+
+    def exists(self, obj_id: str) -> bool:
+        """Check that an object is stored.
+        
+        Args:
+            obj_id: The ID of the object to check
+            
+        Returns:
+            True if the object exists, False otherwise
+        """
+        return obj_id in self._storage
+
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count the stored objects whose attributes equal ``filters``.
+        
+        Args:
+            filters: Attribute names and the values they must be equal to
+            
+        Returns:
+            The number of matching objects
+        """
+        filters = filters or {}
+        return sum(1 for obj in self._storage.values()
+                   if all(getattr(obj, key, None) == value for key, value in filters.items()))
+
+    def freshness(self, filters: Optional[Dict[str, Any]] = None) -> Tuple[int, Optional[datetime]]:
+        """Count the stored objects whose attributes equal ``filters`` and find the newest ``updated_at``.
+        
+        Args:
+            filters: Attribute names and the values they must be equal to
+            
+        Returns:
+            A ``(count, newest updated_at)`` tuple; the date is None without objects
+        """
+        filters = filters or {}
+        dates = [getattr(obj, 'updated_at', None) for obj in self._storage.values()
+                 if all(getattr(obj, key, None) == value for key, value in filters.items())]
+        return len(dates), max((date for date in dates if date is not None), default=None)
+
+    def update_fields(self, obj_id: str, values: Dict[str, Any]) -> int:
+        """Set attributes of a stored object.
+        
+        Args:
+            obj_id: The ID of the object to update
+            values: Attribute names and their new values
+            
+        Returns:
+            1 if the object was updated, 0 if it does not exist
+        """
+        return 1 if self.update(obj_id, values) else 0
+
+    def delete_by_id(self, obj_id: str) -> int:
+        """Delete an object from the repository.
+        
+        Args:
+            obj_id: The ID of the object to delete
+            
+        Returns:
+            1 if the object was deleted, 0 if it does not exist
+        """
+        return 1 if self.delete(obj_id) else 0
+
+    def get_by_attribute(self, attr_name: str, attr_value: Any) -> Optional[T]:
+        """Find the first object with a specific attribute value.
+        
+        Args:
+            attr_name: Name of the attribute to search by
+            attr_value: Value to match against
+            
+        Returns:
+            The first matching object, None if none found (same as SQLAlchemyRepository)
+        """
+        return next(
+            (obj for obj in self._storage.values()
+             if getattr(obj, attr_name, None) == attr_value),
+            None
+        )
@@ -0,0 +1,74 @@
+"""Columns and indexes added to the models after their tables were first created.
+
+``db.create_all()`` only creates the missing tables, it never alters an
+existing one: on a database created before these columns, the first query
+on the table fails, and the indexes declared since then are never built.
+:func:`add_missing_columns` adds the columns with ``ALTER TABLE ... ADD
+COLUMN``, using the same definitions as ``instance/create_tables.sql``;
+:func:`add_missing_indexes` creates every index of the models that an
+existing table lacks. The maintenance commands run both first.
+"""
+
+from typing import List
+import sqlalchemy as sa
+from app import db
+
+# Colonnes ajoutées après coup, par table, dans leur ordre d'ajout
+ADDED_COLUMNS = {
+    'places': {
+        # Agrégats des avis (repair-review-aggregates les recalcule)
+        'review_count': 'INTEGER NOT NULL DEFAULT 0',
+        'rating_sum': 'INTEGER NOT NULL DEFAULT 0',
+        'rating_count_1': 'INTEGER NOT NULL DEFAULT 0',
+        'rating_count_2': 'INTEGER NOT NULL DEFAULT 0',
+        'rating_count_3': 'INTEGER NOT NULL DEFAULT 0',
+        'rating_count_4': 'INTEGER NOT NULL DEFAULT 0',
+        'rating_count_5': 'INTEGER NOT NULL DEFAULT 0',
+        # Cellule géographique (backfill-geohash la calcule)
+        'geohash': 'VARCHAR(12)',
+    },
+}
+
+
+def add_missing_columns() -> List[str]:
+    """Add the columns of ADDED_COLUMNS that the database does not have yet.
+
+    Running it again on an up-to-date database changes nothing.
+
+    Returns:
+        The ``table.column`` names that were added
+    """
+    added = []
+    with db.engine.begin() as connection:
+        inspector = sa.inspect(connection)
+        for table, columns in ADDED_COLUMNS.items():
+            existing = {column['name'] for column in inspector.get_columns(table)}
+            for name, definition in columns.items():
+                if name not in existing:
+                    connection.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+                    added.append(f"{table}.{name}")
+    return added
+
+
+def add_missing_indexes() -> List[str]:
+    """Create the indexes of the models that their existing tables do not have yet.
+
+    Run it after :func:`add_missing_columns`: some indexes cover added
+    columns. Tables that do not exist are left to ``db.create_all()``.
+
+    Returns:
+        The names of the indexes that were created
+    """
+    created = []
+    with db.engine.begin() as connection:
+        inspector = sa.inspect(connection)
+        tables = set(inspector.get_table_names())
+        for table in db.metadata.sorted_tables:
+            if table.name not in tables:
+                continue
+            existing = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda index: index.name):
+                if index.name not in existing:
+                    index.create(connection)
+                    created.append(index.name)
+    return created
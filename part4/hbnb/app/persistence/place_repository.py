@@ -1,6 +1,275 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.orm import joinedload, selectinload
+from app.models.geo import covering_cells, encode as geohash_encode, haversine_km, radius_in_degrees
+from app.models.amenity import Amenity
 from app.models.place import Place
-from app.persistence.repository import SQLAlchemyRepository
+from app.models.review import Review
+from app.models.user import User
+from app import db
+from app.persistence.repository import SQLAlchemyRepository, DEFAULT_BATCH_SIZE, DEFAULT_PAGE_SIZE
+from app.persistence.unit_of_work import commit, lookup_memo
+from app.persistence.spatial_index import places_rtree, place_rowid, rtree_enabled
+
+# Filters understood by PlaceRepository.search
+SEARCH_FILTERS = ('min_price', 'max_price', 'min_rating', 'amenities', 'owner_id')
+
+# Eager loading strategy of each relationship a caller can ask for: the owner
+# is joined in the same query, collections come from one extra IN (...) query
+PLACE_LOADERS = {
+    'owner': lambda: joinedload(Place.user),
+    'amenities': lambda: selectinload(Place.amenities),
+    'reviews': lambda: selectinload(Place.reviews),
+}
 
 class PlaceRepository(SQLAlchemyRepository):
     def __init__(self):
-        super().__init__(Place)
\ No newline at end of file
+        super().__init__(Place)
+
+    def _loader_options(self, include: Iterable[str]):
+        try:
+            return [PLACE_LOADERS[name]() for name in include]
+        except KeyError as e:
+            raise ValueError(f"Unknown place relationship {e.args[0]}")
+
+    def get_with(self, place_id: str, include: Iterable[str] = ()) -> Optional[Place]:
+        return self._query(*self._loader_options(include)).filter(Place.id == place_id).first()
+
+    def detail_versions(self, place_id: str) -> Optional[Tuple]:
+        """Read what the detail document of a place depends on, without loading it.
+        
+        Returns:
+            ``(place updated_at, owner updated_at, amenity count, newest amenity
+            updated_at)``, or None if the place does not exist
+        """
+        # Lu par l'ETag puis par le cache des documents : une requête par requête HTTP
+        memo = lookup_memo()
+        key = ('detail_versions', place_id)
+        if memo is not None and key in memo:
+            return memo[key]
+        links = Place.place_amenity
+        amenity_count = select(func.count()).select_from(links) \
+            .where(links.c.place_id == Place.id).scalar_subquery()
+        newest_amenity = select(func.max(Amenity.updated_at)) \
+            .join_from(links, Amenity, links.c.amenity_id == Amenity.id) \
+            .where(links.c.place_id == Place.id).scalar_subquery()
+        statement = select(Place.updated_at, User.updated_at, amenity_count, newest_amenity) \
+            .join(User, User.id == Place.owner_id).where(Place.id == place_id)
+        row = db.session.execute(statement).first()
+        versions = tuple(row) if row else None
+        if memo is not None:
+            memo[key] = versions
+        return versions
+
+    def _search_query(self, filters: Dict[str, Any], include: Iterable[str] = ()):
+        """Compile search filters into a single query.
+        
+        Price and owner filters use their column indexes; required amenities
+        and the minimum average rating are ``places.id IN (...)`` subqueries
+        grouped on the indexed foreign keys of place_amenity and reviews.
+        
+        Raises:
+            ValueError: If a filter value is invalid
+        """
+        query = self._query(*self._loader_options(include))
+        min_price = filters.get('min_price')
+        max_price = filters.get('max_price')
+        if min_price is not None and max_price is not None and float(min_price) > float(max_price):
+            raise ValueError("min_price cannot be greater than max_price")
+        if min_price is not None:
+            query = query.filter(Place.price >= float(min_price))
+        if max_price is not None:
+            query = query.filter(Place.price <= float(max_price))
+
+        if filters.get('owner_id'):
+            query = query.filter(Place.owner_id == filters['owner_id'])
+
+        amenity_ids = list(dict.fromkeys(filters.get('amenities') or []))
+        if amenity_ids:
+            place_amenity = Place.place_amenity
+            with_all_amenities = select(place_amenity.c.place_id) \
+                .where(place_amenity.c.amenity_id.in_(amenity_ids)) \
+                .group_by(place_amenity.c.place_id) \
+                .having(func.count() == len(amenity_ids))
+            query = query.filter(Place.id.in_(with_all_amenities))
+
+        min_rating = filters.get('min_rating')
+        if min_rating is not None:
+            min_rating = float(min_rating)
+            if not 0 <= min_rating <= 5:
+                raise ValueError("min_rating must be between 0 and 5")
+            # Moyenne tenue à jour sur la place : avg >= x  <=>  sum >= x * count
+            query = query.filter(Place.review_count > 0,
+                                 Place.rating_sum >= min_rating * Place.review_count)
+        return query
+
+    def apply_review_deltas(self, place_id: str, count: int, rating_sum: int,
+                            histogram: Dict[int, int]) -> int:
+        """Add deltas to the review aggregates of a place in one UPDATE.
+        
+        The new values are computed by the database (``col = col + delta``),
+        so concurrent transactions cannot lose each other's updates.
+        """
+        values = {
+            'review_count': Place.review_count + count,
+            'rating_sum': Place.rating_sum + rating_sum,
+        }
+        for rating, delta in histogram.items():
+            if delta:
+                column = Place.RATING_COLUMNS[rating]
+                values[column] = getattr(Place, column) + delta
+        return self.update_fields(place_id, values)
+
+    def get_review_aggregates(self) -> List[Tuple[str, int, int]]:
+        """Return ``(place_id, review_count, rating_sum)`` of the reviewed places."""
+        return db.session.execute(
+            select(Place.id, Place.review_count, Place.rating_sum).where(Place.review_count > 0)
+        ).all()
+
+    def recompute_review_aggregates(self) -> int:
+        """Rebuild the review aggregates of every place from the reviews table.
+        
+        The reviews are read in one GROUP BY pass, then every place is reset
+        and the places with reviews are updated in a single executemany.
+        
+        Returns:
+            The number of places that have reviews
+        """
+        stats = db.session.execute(
+            select(Review.place_id,
+                   func.count().label('review_count'),
+                   func.sum(Review.rating).label('rating_sum'),
+                   *[func.sum(case((Review.rating == rating, 1), else_=0)).label(column)
+                     for rating, column in Place.RATING_COLUMNS.items()])
+            .group_by(Review.place_id)
+        ).all()
+        zeros = {'review_count': 0, 'rating_sum': 0, **{c: 0 for c in Place.RATING_COLUMNS.values()}}
+        db.session.execute(update(Place).values(**zeros))
+        if stats:
+            rows = []
+            for row in stats:
+                aggregates = row._asdict()
+                aggregates['id'] = aggregates.pop('place_id')
+                rows.append(aggregates)
+            db.session.execute(update(Place), rows)
+        commit()
+        return len(stats)
+
+    def nearby(self, latitude: float, longitude: float, radius_km: float, limit: int,
+               min_price: Optional[float] = None,
+               max_price: Optional[float] = None) -> List[Tuple[Place, float]]:
+        """Return the places within ``radius_km`` of a point, nearest first.
+        
+        Candidates are read through the geohash index, one range per covering
+        cell (``geohash >= cell AND geohash < cell || '~'``) narrowed by the
+        latitude band of the radius and the optional price range; the exact
+        great-circle distance is then computed on these candidates only.
+        
+        Returns:
+            ``(place, distance_km)`` pairs
+        """
+        cells = [cell for cell in covering_cells(latitude, longitude, radius_km) if cell]
+        lat_radius, _ = radius_in_degrees(latitude, radius_km)
+        query = self._query().filter(Place.latitude.between(latitude - lat_radius,
+                                                            latitude + lat_radius))
+        if min_price is not None:
+            query = query.filter(Place.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Place.price <= max_price)
+        if cells:
+            # '~' est après tous les caractères base32 : [cell, cell~) = préfixe cell
+            query = query.filter(or_(*[and_(Place.geohash >= cell, Place.geohash < cell + '~')
+                                       for cell in cells]))
+        matches = []
+        for place in query:
+            distance = haversine_km(latitude, longitude, place.latitude, place.longitude)
+            if distance <= radius_km:
+                matches.append((place, distance))
+        matches.sort(key=lambda match: (match[1], match[0].id))
+        return matches[:limit]
+
+    def _bbox_query(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float):
+        """Select the places inside a rectangle.
+        
+        A rectangle with ``min_lon > max_lon`` crosses the antimeridian. With
+        the R*Tree index the candidates come from places_rtree (its boxes are
+        rounded outwards to 32-bit floats, the exact comparison on the columns
+        follows); otherwise the (latitude, longitude) index serves the range.
+        """
+        crosses_antimeridian = min_lon > max_lon
+        query = self._query()
+        if rtree_enabled():
+            rtree = places_rtree.c
+            if crosses_antimeridian:
+                in_lon_range = or_(rtree.max_lon >= min_lon, rtree.min_lon <= max_lon)
+            else:
+                in_lon_range = and_(rtree.max_lon >= min_lon, rtree.min_lon <= max_lon)
+            # rowid IN (...) : SQLite part de l'index R*Tree puis lit les lignes par rowid
+            query = query.filter(place_rowid.in_(
+                select(rtree.id).where(rtree.max_lat >= min_lat, rtree.min_lat <= max_lat, in_lon_range)
+            ))
+        if crosses_antimeridian:
+            in_lon_range = or_(Place.longitude >= min_lon, Place.longitude <= max_lon)
+        else:
+            in_lon_range = Place.longitude.between(min_lon, max_lon)
+        return query.filter(Place.latitude.between(min_lat, max_lat), in_lon_range)
+
+    def bbox_page(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                  cursor: Optional[str] = None,
+                  limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Place], Optional[str]]:
+        return self._paginate(self._bbox_query(min_lat, min_lon, max_lat, max_lon), cursor, limit)
+
+    def count_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> int:
+        return self._bbox_query(min_lat, min_lon, max_lat, max_lon) \
+            .with_entities(func.count(Place.id)).scalar()
+
+    def iter_coordinates(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Tuple[str, float, float, float]]:
+        """Iterate over ``(id, latitude, longitude, price)`` of every place.
+        
+        Only these four columns are read, without building Place objects.
+        """
+        result = db.session.execute(
+            select(Place.id, Place.latitude, Place.longitude, Place.price)
+            .execution_options(yield_per=batch_size)
+        )
+        for row in result:
+            yield tuple(row)
+
+    def fill_missing_geohashes(self, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """Compute the geohash of the places created before the column existed.
+        
+        Returns:
+            The number of places updated
+        """
+        updated = 0
+        while True:
+            rows = db.session.execute(
+                select(Place.id, Place.latitude, Place.longitude)
+                .where(Place.geohash.is_(None)).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            db.session.execute(update(Place), [
+                {'id': place_id, 'geohash': geohash_encode(latitude, longitude)}
+                for place_id, latitude, longitude in rows
+            ])
+            commit()
+            updated += len(rows)
+        return updated
+
+    def count_search(self, filters: Dict[str, Any]) -> int:
+        # SELECT count(places.id) avec les mêmes filtres, sans charger les lignes
+        return self._search_query(filters).with_entities(func.count(Place.id)).scalar()
+
+    def search(self, filters: Dict[str, Any], include: Iterable[str] = ()) -> List[Place]:
+        return self._search_query(filters, include).all()
+
+    def search_page(self, filters: Dict[str, Any], cursor: Optional[str] = None,
+                    limit: int = DEFAULT_PAGE_SIZE,
+                    include: Iterable[str] = ()) -> Tuple[List[Place], Optional[str]]:
+        return self._paginate(self._search_query(filters, include), cursor, limit)
+
+    def iter_search(self, filters: Dict[str, Any], batch_size: int = DEFAULT_BATCH_SIZE,
+                    include: Iterable[str] = ()) -> Iterator[Place]:
+        query = self._search_query(filters, include).order_by(self.model.created_at, self.model.id)
+        return self._iter_query(query, batch_size)
@@ -0,0 +1,104 @@
+"""Read/write splitting between the primary database and a read replica.
+
+``db.session`` is a :class:`RoutingSession`: when ``READ_REPLICA_BIND`` names
+one of the ``SQLALCHEMY_BINDS``, the SELECT statements the repositories run
+(``get``, ``get_all``, ``get_by_attribute``, searches, lazy loads) are sent to
+that replica, while flushes and every other statement go to the primary.
+
+Read-your-writes: as soon as a session has flushed something, or inside
+:func:`use_primary`, all of its reads go to the primary too, so a request
+always sees its own changes even if the replica lags behind.
+
+There is no real replication with SQLite: when both binds are SQLite files the
+primary is copied into the replica with the SQLite backup API at startup, and
+after each commit with ``REPLICA_SYNC_ON_COMMIT``. This is the local stand-in
+used by the tests and the development setup.
+"""
+
+from contextlib import contextmanager
+from flask import current_app, g, has_app_context
+import sqlalchemy as sa
+from flask_sqlalchemy.session import Session
+
+
+class RoutingSession(Session):
+    """Session sending reads to the replica bind and writes to the primary."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._reads_from_replica(clause):
+            return self._db.engines[current_app.config['READ_REPLICA_BIND']]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _reads_from_replica(self, clause) -> bool:
+        """Return True when the statement can be served by the replica."""
+        if not has_app_context() or not current_app.config.get('READ_REPLICA_BIND'):
+            return False
+        if not isinstance(clause, sa.Select) or self._flushing:
+            return False
+        # Read-your-writes : dès que la session a écrit, tout passe par le primaire
+        if self.info.get('wrote') or self.new or self.dirty or self.deleted:
+            return False
+        return not g.get('_use_primary', False)
+
+
+@sa.event.listens_for(RoutingSession, 'after_flush')
+def _mark_written(session, flush_context):
+    session.info['wrote'] = True
+
+
+@sa.event.listens_for(RoutingSession, 'do_orm_execute')
+def _mark_bulk_written(orm_execute_state):
+    # UPDATE / DELETE en masse : pas de flush, mais la session a bien écrit
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['wrote'] = True
+
+
+@sa.event.listens_for(RoutingSession, 'after_commit')
+def _sync_after_commit(session):
+    if (has_app_context() and current_app.config.get('READ_REPLICA_BIND')
+            and current_app.config.get('REPLICA_SYNC_ON_COMMIT')):
+        sync_replica(session._db)
+
+
+@contextmanager
+def use_primary():
+    """Send every read of the block to the primary (strongly consistent reads)."""
+    previous = g.get('_use_primary', False)
+    g._use_primary = True
+    try:
+        yield
+    finally:
+        g._use_primary = previous
+
+
+def sync_replica(db) -> None:
+    """Copy the primary SQLite database into the replica with the backup API.
+
+    Args:
+        db: The SQLAlchemy extension holding both engines
+    """
+    primary = db.engines[None].raw_connection()
+    replica = db.engines[current_app.config['READ_REPLICA_BIND']].raw_connection()
+    try:
+        primary.driver_connection.backup(replica.driver_connection)
+    finally:
+        replica.close()
+        primary.close()
+
+
+def init_app(app, db) -> None:
+    """Check the replica configuration and bring a SQLite replica up to date.
+
+    Must run once the tables exist on the primary (after ``db.create_all()``).
+
+    Raises:
+        ValueError: If READ_REPLICA_BIND is not one of the SQLALCHEMY_BINDS
+    """
+    key = app.config.get('READ_REPLICA_BIND')
+    if not key:
+        return
+    if key not in (app.config.get('SQLALCHEMY_BINDS') or {}):
+        raise ValueError(f"READ_REPLICA_BIND '{key}' is not in SQLALCHEMY_BINDS")
+    with app.app_context():
+        if db.engines[None].dialect.name == db.engines[key].dialect.name == 'sqlite':
+            sync_replica(db)
@@ -4,12 +4,59 @@ This module provides the abstract interface that all concrete repository
 implementations must follow to ensure consistent data access patterns.
 """
 
+import base64
+import json
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, TypeVar, Generic
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar, Generic
+from flask import current_app
+from sqlalchemy import and_, delete, func, literal, or_, select, update
+from sqlalchemy.orm import raiseload
 from app import db
+from app.persistence.unit_of_work import commit, lookup_memo
 
 T = TypeVar('T')
 
+# Page size used when a caller does not ask for a specific limit
+DEFAULT_PAGE_SIZE = 50
+
+# Number of rows fetched per round trip when iterating over a whole table
+DEFAULT_BATCH_SIZE = 1000
+
+
+def encode_cursor(created_at: datetime, obj_id: str) -> str:
+    """Build an opaque pagination cursor from the last row of a page.
+    
+    Args:
+        created_at: Creation timestamp of the last returned object
+        obj_id: ID of the last returned object
+        
+    Returns:
+        A URL-safe string to pass back as ``cursor`` to fetch the next page
+    """
+    raw = json.dumps([created_at.isoformat(), obj_id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Decode a cursor produced by :func:`encode_cursor`.
+    
+    Args:
+        cursor: The opaque cursor string
+        
+    Returns:
+        A ``(created_at, id)`` tuple
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, obj_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(created_at), str(obj_id)
+    except (TypeError, ValueError, UnicodeError):
+        raise ValueError("Invalid pagination cursor")
+
+
 class Repository(ABC, Generic[T]):
     """Abstract base class defining the repository pattern interface.
     
@@ -29,6 +76,19 @@ class Repository(ABC, Generic[T]):
         """
         pass
 
+    @abstractmethod
+    def add_many(self, objs: List[T], batch_size: int = DEFAULT_BATCH_SIZE) -> List[T]:
+        """Add several objects to the repository at once.
+        
+        Args:
+            objs: The objects to add
+            batch_size: Number of objects written per flush
+            
+        Returns:
+            The added objects
+        """
+        pass
+
     @abstractmethod
     def get(self, obj_id: str) -> Optional[T]:
         """Retrieve an object by its ID.
@@ -41,6 +101,58 @@ class Repository(ABC, Generic[T]):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, obj_ids: Iterable[str]) -> Dict[str, T]:
+        """Retrieve several objects by their IDs in a single lookup.
+        
+        Args:
+            obj_ids: The unique identifiers of the objects
+            
+        Returns:
+            A dictionary mapping each found ID to its object; IDs that do not
+            exist are simply missing from it
+        """
+        pass
+
+    @abstractmethod
+    def exists(self, obj_id: str) -> bool:
+        """Check that an object exists without loading it.
+        
+        Args:
+            obj_id: The ID of the object to check
+            
+        Returns:
+            True if the object exists, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """Count the objects, optionally those whose attributes equal ``filters``.
+        
+        Args:
+            filters: Attribute names and the values they must be equal to
+            
+        Returns:
+            The number of matching objects
+        """
+        pass
+
+    @abstractmethod
+    def freshness(self, filters: Optional[Dict[str, Any]] = None) -> Tuple[int, Optional[datetime]]:
+        """Count the objects and find the newest ``updated_at``, in one query.
+        
+        Together the two values change whenever an object is added, updated
+        or deleted, which makes them a cheap version of a collection.
+        
+        Args:
+            filters: Attribute names and the values they must be equal to
+            
+        Returns:
+            A ``(count, newest updated_at)`` tuple; the date is None without objects
+        """
+        pass
+
     @abstractmethod
     def get_all(self) -> List[T]:
         """Retrieve all objects in the repository.
@@ -50,6 +162,38 @@ class Repository(ABC, Generic[T]):
         """
         pass
 
+    @abstractmethod
+    def get_page(self, cursor: Optional[str] = None,
+                 limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[T], Optional[str]]:
+        """Retrieve one page of objects ordered by ``(created_at, id)``.
+        
+        Args:
+            cursor: Opaque cursor returned by the previous page, None for the first page
+            limit: Maximum number of objects to return
+            
+        Returns:
+            A ``(items, next_cursor)`` tuple, ``next_cursor`` is None on the last page
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        pass
+
+    @abstractmethod
+    def iter_all(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[T]:
+        """Iterate over every object ordered by ``(created_at, id)``.
+        
+        Unlike :meth:`get_all`, objects are fetched ``batch_size`` at a time so
+        memory use does not grow with the size of the table.
+        
+        Args:
+            batch_size: Number of objects fetched per round trip
+            
+        Returns:
+            An iterator over all objects in the repository
+        """
+        pass
+
     @abstractmethod
     def update(self, obj_id: str, data: Dict[str, Any]) -> Optional[T]:
         """Update an existing object.
@@ -75,6 +219,33 @@ class Repository(ABC, Generic[T]):
         """
         pass
 
+    @abstractmethod
+    def update_fields(self, obj_id: str, values: Dict[str, Any]) -> int:
+        """Set columns of an object without loading it first.
+        
+        Model validators (``@validates``) do not run: callers validate the values.
+        
+        Args:
+            obj_id: The ID of the object to update
+            values: Column names and their new values
+            
+        Returns:
+            The number of updated rows (0 if the object does not exist)
+        """
+        pass
+
+    @abstractmethod
+    def delete_by_id(self, obj_id: str) -> int:
+        """Delete an object without loading it first.
+        
+        Args:
+            obj_id: The ID of the object to delete
+            
+        Returns:
+            The number of deleted rows (0 if the object does not exist)
+        """
+        pass
+
     @abstractmethod
     def get_by_attribute(self, attr_name: str, attr_value: Any) -> List[T]:
         """Find objects by a specific attribute value.
@@ -92,32 +263,163 @@ class SQLAlchemyRepository(Repository):
     def __init__(self, model):
         self.model = model
 
+    def _query(self, *options):
+        """Start a query on the model with the given loader options.
+        
+        When the RAISE_ON_LAZY_LOAD setting is on, every relationship that is
+        not eagerly loaded by one of ``options`` raises instead of silently
+        emitting one more query (N+1), so tests catch unplanned lazy loads.
+        """
+        return self.model.query.options(*self._load_options(*options))
+
+    def _load_options(self, *options):
+        """Return ``options`` plus the raiseload guard when RAISE_ON_LAZY_LOAD is on."""
+        if current_app.config.get('RAISE_ON_LAZY_LOAD'):
+            return [*options, raiseload('*')]
+        return list(options)
+
+    def _remember(self, obj_id, obj):
+        memo = lookup_memo()
+        if memo is not None:
+            memo[(self.model, obj_id)] = obj
+
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        commit()
+        self._remember(obj.id, obj)
         return obj
 
+    def add_many(self, objs, batch_size=DEFAULT_BATCH_SIZE):
+        # One flush per chunk: the ORM emits each chunk as a single
+        # executemany INSERT per table instead of one statement per object
+        objs = list(objs)
+        for start in range(0, len(objs), batch_size):
+            db.session.add_all(objs[start:start + batch_size])
+            commit()
+        for obj in objs:
+            self._remember(obj.id, obj)
+        return objs
+
     def get(self, obj_id):
-        return self.model.query.get(obj_id)
+        # Chaque id n'est cherché qu'une fois par requête, même s'il n'existe pas
+        memo = lookup_memo()
+        key = (self.model, obj_id)
+        if memo is not None and key in memo:
+            return memo[key]
+        obj = db.session.get(self.model, obj_id, options=self._load_options())
+        if memo is not None:
+            memo[key] = obj
+        return obj
+
+    def get_many(self, obj_ids):
+        memo = lookup_memo()
+        found = {}
+        ids = []
+        for obj_id in dict.fromkeys(obj_ids):
+            if memo is not None and (self.model, obj_id) in memo:
+                if memo[(self.model, obj_id)] is not None:
+                    found[obj_id] = memo[(self.model, obj_id)]
+            else:
+                ids.append(obj_id)
+        # One IN (...) query per chunk keeps us under SQLite's bound-parameter limit
+        for start in range(0, len(ids), DEFAULT_BATCH_SIZE):
+            chunk = ids[start:start + DEFAULT_BATCH_SIZE]
+            for obj in self._query().filter(self.model.id.in_(chunk)):
+                found[obj.id] = obj
+        for obj_id in ids:
+            self._remember(obj_id, found.get(obj_id))
+        return found
+
+    def exists(self, obj_id):
+        memo = lookup_memo()
+        if memo is not None and (self.model, obj_id) in memo:
+            return memo[(self.model, obj_id)] is not None
+        return self._exists_where(self.model.id == obj_id)
+
+    def _exists_where(self, *criteria) -> bool:
+        """Run ``SELECT 1 ... WHERE <criteria> LIMIT 1``: no row is loaded."""
+        statement = select(literal(1)).select_from(self.model).where(*criteria).limit(1)
+        return db.session.execute(statement).first() is not None
+
+    def count(self, filters=None):
+        statement = select(func.count()).select_from(self.model).filter_by(**(filters or {}))
+        return db.session.execute(statement).scalar_one()
+
+    def freshness(self, filters=None):
+        statement = select(func.count(), func.max(self.model.updated_at)).where(
+            *(getattr(self.model, name) == value for name, value in (filters or {}).items()))
+        count, newest = db.session.execute(statement).one()
+        return count, newest
 
     def get_all(self):
-        return self.model.query.all()
+        return self._query().all()
+
+    def get_page(self, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        return self._paginate(self._query(), cursor, limit)
+
+    def iter_all(self, batch_size=DEFAULT_BATCH_SIZE):
+        query = self._query().order_by(self.model.created_at, self.model.id)
+        return self._iter_query(query, batch_size)
+
+    def _iter_query(self, query, batch_size):
+        """Yield the rows of a query in server-side batches.
+        
+        Being a generator, the query only runs when the first row is requested,
+        e.g. once a streaming response starts sending its body.
+        """
+        yield from query.yield_per(batch_size)
+
+    def _paginate(self, query, cursor, limit):
+        """Apply keyset pagination on ``(created_at, id)`` to a query.
+        
+        One extra row is fetched to know whether a next page exists, so the
+        database never has to count or skip rows.
+        """
+        query = query.order_by(self.model.created_at, self.model.id)
+        if cursor:
+            created_at, last_id = decode_cursor(cursor)
+            query = query.filter(or_(
+                self.model.created_at > created_at,
+                and_(self.model.created_at == created_at, self.model.id > last_id)
+            ))
+        items = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+        return items, next_cursor
 
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            commit()
         return obj
 
     def delete(self, obj_id):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            commit()
+            self._remember(obj_id, None)
             return True
         return False
 
+    def update_fields(self, obj_id, values):
+        # Un seul UPDATE ... WHERE id = ? ; la session met à jour les objets
+        # qu'elle a déjà chargés (synchronize_session 'auto')
+        result = db.session.execute(
+            update(self.model).where(self.model.id == obj_id).values(**values))
+        commit()
+        return result.rowcount
+
+    def delete_by_id(self, obj_id):
+        result = db.session.execute(delete(self.model).where(self.model.id == obj_id))
+        commit()
+        if result.rowcount:
+            self._remember(obj_id, None)
+        return result.rowcount
+
     def get_by_attribute(self, attr_name, attr_value):
-        return self.model.query.filter_by(**{attr_name: attr_value}).first()
+        return self._query().filter_by(**{attr_name: attr_value}).first()
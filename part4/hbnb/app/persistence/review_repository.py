@@ -1,6 +1,30 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import select
+from app import db
 from app.models.review import Review
-from app.persistence.repository import SQLAlchemyRepository
+from app.persistence.repository import SQLAlchemyRepository, DEFAULT_PAGE_SIZE
 
 class ReviewRepository(SQLAlchemyRepository):
     def __init__(self):
-        super().__init__(Review)
\ No newline at end of file
+        super().__init__(Review)
+
+    def get_reviews_by_place(self, place_id: str) -> List[Review]:
+        return self._query().filter_by(place_id=place_id) \
+            .order_by(self.model.created_at, self.model.id).all()
+
+    def get_reviews_by_place_page(self, place_id: str, cursor: Optional[str] = None,
+                                  limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Review], Optional[str]]:
+        return self._paginate(self._query().filter_by(place_id=place_id), cursor, limit)
+
+    def get_reviews_by_user(self, user_id: str) -> List[Review]:
+        return self._query().filter_by(user_id=user_id).all()
+
+    def has_user_reviewed_place(self, user_id: str, place_id: str) -> bool:
+        return self._exists_where(Review.user_id == user_id, Review.place_id == place_id)
+
+    def get_review_times_since(self, since: datetime) -> List[Tuple[str, datetime]]:
+        # Parcours de l'index (created_at, id) à partir de la date demandée
+        return db.session.execute(
+            select(Review.place_id, Review.created_at).where(Review.created_at >= since)
+        ).all()
@@ -0,0 +1,109 @@
+"""SQLite R*Tree index of the place coordinates for bounding-box queries.
+
+``places_rtree`` is an R*Tree virtual table holding one point box
+``(lat, lat, lon, lon)`` per place, keyed by the ``rowid`` of the place row.
+Mapper events on :class:`Place` keep it in sync inside the flush that writes
+the place, so it always follows the transaction of the ORM writes. An entry
+left behind by a DELETE run outside the ORM matches no place row, and is
+overwritten if SQLite reuses its rowid.
+
+When the database is not SQLite, when ``USE_RTREE_INDEX`` is off or when
+SQLite was built without the rtree module, :func:`rtree_enabled` is False and
+:class:`~app.persistence.place_repository.PlaceRepository` falls back to a
+range query on the ``(latitude, longitude)`` index.
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from flask import current_app, has_app_context
+from app import db
+from app.models.place import Place
+
+RTREE_TABLE = 'places_rtree'
+
+# Table virtuelle vue par SQLAlchemy (elle n'est pas dans les métadonnées)
+places_rtree = sa.table(RTREE_TABLE, sa.column('id'), sa.column('min_lat'), sa.column('max_lat'),
+                        sa.column('min_lon'), sa.column('max_lon'))
+place_rowid = sa.literal_column('places.rowid')
+
+
+def rtree_enabled() -> bool:
+    """Return True when the places_rtree index serves the current app."""
+    return has_app_context() and current_app.extensions.get('places_rtree', False)
+
+
+def _index_place(connection, place_id: str) -> None:
+    # Le rowid n'est connu qu'après l'INSERT : on le relit avec les coordonnées
+    connection.execute(
+        sa.insert(places_rtree).prefix_with('OR REPLACE').from_select(
+            ['id', 'min_lat', 'max_lat', 'min_lon', 'max_lon'],
+            sa.select(place_rowid, Place.latitude, Place.latitude, Place.longitude, Place.longitude)
+            .where(Place.id == place_id)
+        )
+    )
+
+
+@event.listens_for(Place, 'after_insert')
+def _place_inserted(mapper, connection, target):
+    if rtree_enabled():
+        _index_place(connection, target.id)
+
+
+@event.listens_for(Place, 'after_update')
+def _place_updated(mapper, connection, target):
+    if not rtree_enabled():
+        return
+    state = sa.inspect(target)
+    if state.attrs.latitude.history.has_changes() or state.attrs.longitude.history.has_changes():
+        _index_place(connection, target.id)
+
+
+@event.listens_for(Place, 'before_delete')
+def _place_deleted(mapper, connection, target):
+    # Avant le DELETE : la ligne (et donc son rowid) existe encore
+    if rtree_enabled():
+        connection.execute(
+            sa.delete(places_rtree).where(
+                places_rtree.c.id == sa.select(place_rowid).where(Place.id == target.id).scalar_subquery()
+            )
+        )
+
+
+def rebuild(connection) -> None:
+    """Refill places_rtree from the places table."""
+    connection.exec_driver_sql(f"DELETE FROM {RTREE_TABLE}")
+    connection.exec_driver_sql(
+        f"INSERT INTO {RTREE_TABLE} (id, min_lat, max_lat, min_lon, max_lon) "
+        "SELECT rowid, latitude, latitude, longitude, longitude FROM places"
+    )
+
+
+def init_app(app) -> None:
+    """Create places_rtree if SQLite supports it and bring it up to date.
+
+    Must run once the places table exists (after ``db.create_all()``). The
+    index is rebuilt when its size differs from the places table, which
+    covers a new index on an existing database and rows written outside the
+    ORM.
+    """
+    app.extensions['places_rtree'] = False
+    if not app.config.get('USE_RTREE_INDEX', True):
+        return
+    with app.app_context():
+        if db.engine.dialect.name != 'sqlite':
+            return
+        with db.engine.begin() as connection:
+            try:
+                connection.exec_driver_sql(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {RTREE_TABLE} "
+                    "USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+                )
+            except sa.exc.OperationalError as e:
+                # SQLite compilé sans le module rtree : requêtes sur l'index classique
+                app.logger.warning("R*Tree index unavailable, using the coordinates index: %s", e)
+                return
+            indexed = connection.exec_driver_sql(f"SELECT count(*) FROM {RTREE_TABLE}").scalar()
+            places = connection.exec_driver_sql("SELECT count(*) FROM places").scalar()
+            if indexed != places:
+                rebuild(connection)
+    app.extensions['places_rtree'] = True
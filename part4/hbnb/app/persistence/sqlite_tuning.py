@@ -0,0 +1,92 @@
+"""SQLite tuning applied to every new database connection.
+
+SQLite keeps most of its settings per connection, so the pragmas listed in
+``SQLITE_PRAGMAS`` are set from a ``connect`` event listener on the engine:
+every connection of the pool gets them, not only the first one. With the
+default profile the database runs in WAL mode, where readers no longer wait
+for the writer, with a larger page cache and memory-mapped reads.
+"""
+
+from typing import Any, Dict
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app import db
+
+# Pragmas dont la valeur est lue pour le rapport de démarrage, dans cet ordre
+REPORTED_PRAGMAS = ('journal_mode', 'synchronous', 'busy_timeout', 'cache_size',
+                    'mmap_size', 'temp_store', 'foreign_keys')
+
+
+def _pragma_statements(pragmas: Dict[str, Any]):
+    """Build the PRAGMA statements for the configured settings.
+    
+    Args:
+        pragmas: Mapping of pragma name to value, None values are skipped
+        
+    Raises:
+        ValueError: If a pragma name is not a plain identifier
+    """
+    statements = []
+    for name, value in pragmas.items():
+        if value is None:
+            continue
+        if not name.isidentifier():
+            raise ValueError(f"Invalid SQLite pragma name: {name!r}")
+        statements.append(f"PRAGMA {name}={value}")
+    return statements
+
+
+def install_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """Set the given pragmas on every connection the engine opens.
+    
+    Args:
+        engine: SQLite engine to configure
+        pragmas: Mapping of pragma name to value
+    """
+    statements = _pragma_statements(pragmas)
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def effective_pragmas(engine: Engine) -> Dict[str, Any]:
+    """Read back the settings SQLite actually applied.
+    
+    Some values can differ from the configuration: an in-memory database
+    reports ``journal_mode=memory`` since it cannot use WAL.
+    
+    Returns:
+        Mapping of pragma name to its current value
+    """
+    with engine.connect() as connection:
+        return {name: connection.exec_driver_sql(f"PRAGMA {name}").scalar()
+                for name in REPORTED_PRAGMAS}
+
+
+def init_app(app) -> None:
+    """Install the SQLITE_PRAGMAS of the app config on its SQLite engines.
+    
+    Every SQLite bind is tuned (the read replica too), the report describes
+    the default one. Must run before the first connection is opened (before
+    ``db.create_all()``). Nothing is done for other database backends or when
+    SQLITE_PRAGMAS is empty.
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    if not pragmas:
+        return
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                install_pragmas(engine, pragmas)
+        if db.engine.dialect.name != 'sqlite':
+            return
+        report = effective_pragmas(db.engine)
+    app.extensions['sqlite_pragmas'] = report
+    app.logger.info("SQLite settings: %s",
+                    ', '.join(f"{name}={value}" for name, value in report.items()))
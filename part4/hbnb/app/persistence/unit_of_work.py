@@ -0,0 +1,103 @@
+"""Request-scoped unit of work for the SQLAlchemy repositories.
+
+Repositories never call ``db.session.commit()`` directly: they go through
+:func:`commit`, which only flushes while a unit of work is open. The unit of
+work opened around every HTTP request then commits once when the request
+succeeds, or rolls everything back when it fails, so a request never leaves
+partial state behind and SQLite takes its write lock once per request.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Optional, Tuple
+from flask import g, has_app_context
+from app import db
+
+
+def in_unit_of_work() -> bool:
+    """Return True when a unit of work is open in the current application context."""
+    return has_app_context() and g.get('_uow_depth', 0) > 0
+
+
+def commit() -> None:
+    """Commit the session, or only flush it if a unit of work will commit later.
+    
+    Flushing still sends the pending statements, so constraint violations are
+    raised at the call site rather than at the end of the request.
+    """
+    if in_unit_of_work():
+        db.session.flush()
+    else:
+        db.session.commit()
+
+
+def lookup_memo() -> Optional[Dict[Tuple[type, str], Any]]:
+    """Return the primary-key lookups memoized by the open unit of work.
+    
+    The repositories record every ``get`` result here, misses included, so a
+    request looks each id up at most once however many layers re-check it.
+    
+    Returns:
+        The memo dict keyed by (model, id), or None outside a unit of work
+    """
+    if not in_unit_of_work():
+        return None
+    if '_uow_lookups' not in g:
+        g._uow_lookups = {}
+    return g._uow_lookups
+
+
+def _begin() -> None:
+    g._uow_depth = g.get('_uow_depth', 0) + 1
+
+
+def _end(success: bool) -> None:
+    g._uow_depth -= 1
+    if g._uow_depth == 0:
+        g.pop('_uow_lookups', None)
+        if success:
+            db.session.commit()
+        else:
+            db.session.rollback()
+
+
+@contextmanager
+def unit_of_work():
+    """Run a block of repository calls as a single transaction.
+    
+    Blocks can be nested: inner blocks join the outermost one, which is the
+    only one to commit (or to roll back if an exception escapes).
+    
+    Yields:
+        The database session
+    """
+    _begin()
+    try:
+        yield db.session
+    except BaseException:
+        _end(success=False)
+        raise
+    _end(success=True)
+
+
+def init_app(app) -> None:
+    """Wrap every request of the application in a unit of work.
+    
+    The transaction is committed after a successful (< 400) response and
+    rolled back after an error response or an unhandled exception.
+    """
+    @app.before_request
+    def _begin_request_unit_of_work():
+        _begin()
+
+    @app.after_request
+    def _commit_request_unit_of_work(response):
+        if g.get('_uow_depth', 0) > 0:
+            _end(success=response.status_code < 400)
+        return response
+
+    @app.teardown_request
+    def _rollback_request_unit_of_work(exc):
+        # after_request is skipped when the request raised an unhandled exception
+        if g.get('_uow_depth', 0) > 0:
+            g._uow_depth = 1
+            _end(success=False)
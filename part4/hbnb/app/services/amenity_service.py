@@ -6,10 +6,13 @@ This module provides the AmenityService class which encapsulates all business lo
 related to amenity management, including creation, retrieval, and updates.
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 from app.models.amenity import Amenity
-from app.persistence.repository import Repository
+from app.persistence.repository import Repository, DEFAULT_PAGE_SIZE
 from app.persistence.amenity_repository import AmenityRepository
+from app.services.entity_cache import cached_get, invalidate
+from app.services import generations
 
 class AmenityService:
     """Service class for handling amenity-related operations.
@@ -48,9 +51,44 @@ class AmenityService:
             return existing
             
         amenity = Amenity(name=name)
+        generations.bump('amenities')
         self.repository.add(amenity)
         return amenity
     
+    def create_amenities(self, names: List[str],
+                         dry_run: bool = False) -> Tuple[List[Amenity], List[Dict[str, Any]]]:
+        """Create a batch of amenities.
+        
+        Every name is validated before anything is written; if one name is
+        empty or already taken (in the database or earlier in the batch),
+        no amenity is created.
+        
+        Args:
+            names: The names of the amenities to create
+            dry_run: Only validate the names, nothing is written
+            
+        Returns:
+            A ``(amenities, errors)`` tuple. ``errors`` lists ``{'index', 'message'}``
+            for every invalid name, in which case ``amenities`` is empty
+        """
+        taken = self.repository.get_taken_names(name for name in names if name)
+        amenities: List[Amenity] = []
+        errors: List[Dict[str, Any]] = []
+        for index, name in enumerate(names):
+            if not name:
+                errors.append({'index': index, 'message': "Amenity name cannot be empty"})
+            elif name in taken:
+                errors.append({'index': index, 'message': f"Amenity {name} already exists"})
+            else:
+                taken.add(name)
+                amenities.append(Amenity(name=name))
+
+        if errors or dry_run:
+            return [], errors
+        generations.bump('amenities')
+        self.repository.add_many(amenities)
+        return amenities, []
+    
     def get_amenity(self, amenity_id: str) -> Optional[Amenity]:
         """Retrieve an amenity by its ID.
         
@@ -60,7 +98,18 @@ class AmenityService:
         Returns:
             The Amenity instance if found, None otherwise
         """
-        return self.repository.get(amenity_id)
+        return cached_get(Amenity, amenity_id, self.repository.get)
+    
+    def get_amenities(self, amenity_ids: List[str]) -> Dict[str, Amenity]:
+        """Retrieve several amenities by their IDs in one query.
+        
+        Args:
+            amenity_ids: The unique identifiers of the amenities
+            
+        Returns:
+            A dictionary mapping each existing ID to its Amenity instance
+        """
+        return self.repository.get_many(amenity_ids)
     
     def get_amenity_by_name(self, name: str) -> Optional[Amenity]:
         """Retrieve an amenity by its name.
@@ -85,6 +134,30 @@ class AmenityService:
         """
         return self.repository.get_all()
     
+    def count_amenities(self) -> int:
+        """Return the total number of amenities."""
+        return self.repository.count()
+
+    def get_amenities_freshness(self) -> Tuple[int, Optional[datetime]]:
+        """Return the number of amenities and the newest ``updated_at``."""
+        return self.repository.freshness()
+
+    def get_amenities_page(self, cursor: Optional[str] = None,
+                           limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Amenity], Optional[str]]:
+        """Retrieve one page of amenities, oldest first.
+        
+        Args:
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of amenities to return
+            
+        Returns:
+            A ``(amenities, next_cursor)`` tuple, ``next_cursor`` is None on the last page
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        return self.repository.get_page(cursor, limit)
+    
     def update_amenity(self, amenity_id: str, **updates) -> Optional[Amenity]:
         """Update an amenity's information.
         
@@ -100,6 +173,8 @@ class AmenityService:
         """
         if 'name' in updates and not updates['name']:
             raise ValueError("Amenity name cannot be empty")
+        invalidate(Amenity, amenity_id)
+        generations.bump('amenities')
         return self.repository.update(amenity_id, updates)
     
     def delete_amenity(self, amenity_id: str) -> bool:
@@ -111,10 +186,10 @@ class AmenityService:
         Returns:
             True if the amenity was deleted, False if not found
         """
-        if self.repository.get(amenity_id):
-            self.repository.delete(amenity_id)
-            return True
-        return False
+        invalidate(Amenity, amenity_id)
+        # La suppression retire aussi l'équipement des places (place_amenity)
+        generations.bump('amenities', 'places')
+        return self.repository.delete_by_id(amenity_id) > 0
 
 
 # Singleton instance of the AmenityService
@@ -0,0 +1,224 @@
+#!/usr/bin/python3
+
+"""Read-through cache of the users, places and amenities looked up by id.
+
+Each application process keeps a cache chosen by ``ENTITY_CACHE`` in the app
+config: ``'lru'`` (the default), a bounded LRU whose entries expire after
+``ENTITY_CACHE_TTL_SECONDS``, or ``'none'`` to disable it (e.g. in a test
+that writes to the database behind the services' back). Another backend can
+be registered in ``CACHE_BACKENDS``.
+
+The cache stores the column values of a row, not the ORM object: a hit
+rebuilds a persistent instance attached to the current session without any
+query, so relationships still lazy-load and changes are flushed as usual.
+
+The services invalidate the entries of the rows they write, immediately and
+again once the transaction commits, so that a request reading the old row
+between the two cannot put it back for longer than that.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+import sqlalchemy as sa
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy.orm.attributes import set_committed_value
+from flask import current_app, has_app_context
+from app import db
+from app.persistence.replication import RoutingSession
+
+MISSING = object()
+
+
+class LRUCache:
+    """Bounded least-recently-used cache whose entries expire after a TTL."""
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 60,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = self._expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or MISSING."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return MISSING
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (value, self._clock() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: Hashable) -> None:
+        """Drop every entry whose key is a tuple starting with ``prefix``."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == prefix]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'size': len(self._entries), 'max_entries': self.max_entries,
+                    'hits': self._hits, 'misses': self._misses,
+                    'evictions': self._evictions, 'expirations': self._expirations}
+
+
+class NullCache:
+    """Cache that never stores anything (ENTITY_CACHE = 'none')."""
+
+    def get(self, key):
+        return MISSING
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def delete_prefix(self, prefix):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+
+CACHE_BACKENDS = {
+    'lru': lambda config: LRUCache(config.get('ENTITY_CACHE_MAX_ENTRIES', 10000),
+                                   config.get('ENTITY_CACHE_TTL_SECONDS', 60)),
+    'none': lambda config: NullCache(),
+}
+
+
+def get_cache():
+    """Return the entity cache of the current app, created on first use.
+
+    Raises:
+        ValueError: If ENTITY_CACHE names an unknown backend
+    """
+    cache = current_app.extensions.get('entity_cache')
+    if cache is None:
+        name = current_app.config.get('ENTITY_CACHE', 'lru')
+        try:
+            backend = CACHE_BACKENDS[name]
+        except KeyError:
+            raise ValueError(f"Unknown entity cache backend: {name}")
+        cache = current_app.extensions.setdefault('entity_cache', backend(current_app.config))
+    return cache
+
+
+def _snapshot(obj) -> Optional[Dict[str, Any]]:
+    """Column values of a clean, fully loaded instance, None otherwise."""
+    state = sa.inspect(obj)
+    if state.modified or state.expired_attributes or not state.persistent:
+        return None
+    return {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs}
+
+
+def _rehydrate(model, values: Dict[str, Any]):
+    """Build a persistent instance of the current session from cached values."""
+    obj = sa.inspect(model).class_manager.new_instance()
+    for key, value in values.items():
+        set_committed_value(obj, key, value)
+    make_transient_to_detached(obj)
+    db.session.add(obj)
+    return obj
+
+
+def cached_get(model, obj_id: str, load: Callable[[str], Any]):
+    """Return the instance of ``model`` with this id, through the cache.
+
+    Args:
+        model: The mapped class
+        obj_id: The primary key
+        load: Callable loading the instance from the repository on a miss
+
+    Returns:
+        The instance, or None if it does not exist (misses are not cached)
+    """
+    if not has_app_context() or obj_id is None:
+        return load(obj_id)
+    # Déjà dans la session : c'est la version à jour pour cette requête
+    existing = db.session.identity_map.get(identity_key(model, obj_id))
+    if existing is not None:
+        return existing
+    cache = get_cache()
+    key = (model.__tablename__, obj_id)
+    values = cache.get(key)
+    if values is not MISSING:
+        return _rehydrate(model, values)
+    obj = load(obj_id)
+    if obj is not None:
+        values = _snapshot(obj)
+        if values is not None:
+            cache.set(key, values)
+    return obj
+
+
+def invalidate(model, *obj_ids: str) -> None:
+    """Drop the cached rows of ``model`` written by the current transaction."""
+    if not has_app_context():
+        return
+    keys = [(model.__tablename__, obj_id) for obj_id in obj_ids]
+    cache = get_cache()
+    for key in keys:
+        cache.delete(key)
+    db.session.info.setdefault('entity_cache_invalidations', []).extend(keys)
+
+
+def invalidate_all(model) -> None:
+    """Drop every cached row of ``model`` (after a bulk write)."""
+    if not has_app_context():
+        return
+    get_cache().delete_prefix(model.__tablename__)
+    db.session.info.setdefault('entity_cache_invalidations', []).append((model.__tablename__,))
+
+
+@sa.event.listens_for(RoutingSession, 'after_commit')
+def _invalidate_committed(session):
+    keys = session.info.pop('entity_cache_invalidations', None)
+    if keys and has_app_context():
+        cache = get_cache()
+        for key in keys:
+            if len(key) == 1:
+                cache.delete_prefix(key[0])
+            else:
+                cache.delete(key)
+
+
+@sa.event.listens_for(RoutingSession, 'after_rollback')
+def _forget_rolled_back(session):
+    # Les entrées ont déjà été retirées : elles seront simplement relues
+    session.info.pop('entity_cache_invalidations', None)
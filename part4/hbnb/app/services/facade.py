@@ -4,17 +4,23 @@ This module implements the Facade pattern to provide a simplified interface
 to the complex subsystem of services and repositories in the application.
 """
 
-from typing import Dict, Optional, List
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, List, Tuple
 from .user_service import UserService
 from .place_service import PlaceService
 from .review_service import ReviewService
 from .amenity_service import AmenityService
+from .ranking_service import RankingService
+from .place_index import PlaceIndexService
+from .entity_cache import get_cache
 from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
 from app.models.amenity import Amenity
-from app.persistence.repository import SQLAlchemyRepository
 from app.persistence.user_repository import UserRepository
+from app.persistence.place_repository import PlaceRepository
+from app.persistence.review_repository import ReviewRepository
+from app.persistence.amenity_repository import AmenityRepository
 
 class HBnBFacade:
     """Main facade for the HBnB application.
@@ -31,9 +37,9 @@ class HBnBFacade:
         """
         # Initialize repositories
         user_repo = UserRepository()
-        place_repo = SQLAlchemyRepository(Place)
-        review_repo = SQLAlchemyRepository(Review)
-        amenity_repo = SQLAlchemyRepository(Amenity)
+        place_repo = PlaceRepository()
+        review_repo = ReviewRepository()
+        amenity_repo = AmenityRepository()
         
         # Initialize services with their respective repositories
         self.user_service = UserService(user_repo)
@@ -51,7 +57,13 @@ class HBnBFacade:
             place_service=self.place_service
         )
         self.amenity_service = AmenityService(amenity_repo)
+        self.ranking_service = RankingService(place_repo, review_repo)
+        self.place_index_service = PlaceIndexService(place_repo)
     
+    def get_entity_cache_stats(self) -> Dict[str, int]:
+        """Return the size, hit, miss, eviction and expiration counts of the entity cache."""
+        return get_cache().stats()
+
     # User methods
     def create_user(self, email: str, first_name: str, last_name: str, password: str, is_admin: bool = False) -> User:
         """Create a new user with the provided information.
@@ -94,6 +106,26 @@ class HBnBFacade:
             A list of all User instances
         """
         return self.user_service.get_all_users()
+
+    def count_users(self) -> int:
+        """Return the total number of users."""
+        return self.user_service.count_users()
+
+    def get_users_freshness(self) -> Tuple[int, Optional[datetime]]:
+        """Return the number of users and the newest ``updated_at``."""
+        return self.user_service.get_users_freshness()
+
+    def get_users_page(self, cursor: Optional[str] = None, limit: int = 50) -> Tuple[List[User], Optional[str]]:
+        """Retrieve one page of users.
+        
+        Args:
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of users to return
+            
+        Returns:
+            A ``(users, next_cursor)`` tuple
+        """
+        return self.user_service.get_users_page(cursor, limit)
         
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Retrieve a user by their email address.
@@ -117,17 +149,174 @@ class HBnBFacade:
             The newly created Place instance
         """
         return self.place_service.create_place(**kwargs)
+
+    def create_places(self, owner_id: str, places_data: List[Dict[str, Any]],
+                      dry_run: bool = False) -> Tuple[List[Place], List[Dict[str, Any]]]:
+        """Create a batch of places in as few transactions as possible.
+        
+        Args:
+            owner_id: The ID of the user who owns the new places
+            places_data: List of dictionaries with place fields
+            dry_run: Only validate the items, nothing is written
+            
+        Returns:
+            A ``(places, errors)`` tuple, nothing is created if ``errors`` is not empty
+        """
+        return self.place_service.create_places(owner_id, places_data, dry_run)
     
-    def get_place(self, place_id: str) -> Optional[Place]:
+    def get_place(self, place_id: str, include: Iterable[str] = ()) -> Optional[Place]:
         """Retrieve a place by its ID.
         
         Args:
             place_id: The unique identifier of the place
+            include: Relationships to load eagerly ('owner', 'amenities', 'reviews')
             
         Returns:
             The Place instance if found, None otherwise
         """
-        return self.place_service.get_place(place_id)
+        return self.place_service.get_place(place_id, include)
+
+    def get_top_places(self, limit: int = 10) -> List[Tuple[Place, float]]:
+        """Retrieve the best rated places by Bayesian average rating.
+        
+        Args:
+            limit: Maximum number of places to return
+            
+        Returns:
+            ``(place, score)`` pairs, best first
+        """
+        return self.place_service.get_ranked_places(self.ranking_service.get_top_place_ids(limit))
+
+    def get_trending_places(self, limit: int = 10) -> List[Tuple[Place, float]]:
+        """Retrieve the places with the most recent reviews.
+        
+        Args:
+            limit: Maximum number of places to return
+            
+        Returns:
+            ``(place, score)`` pairs, best first
+        """
+        return self.place_service.get_ranked_places(self.ranking_service.get_trending_place_ids(limit))
+
+    def get_nearby_places(self, latitude: float, longitude: float, radius_km: float,
+                          limit: int, max_radius_km: float) -> List[Tuple[Place, float]]:
+        """Retrieve the places within a radius of a point, nearest first.
+        
+        Args:
+            latitude: Latitude of the center in degrees
+            longitude: Longitude of the center in degrees
+            radius_km: Search radius in kilometers
+            limit: Maximum number of places to return
+            max_radius_km: Largest radius accepted
+            
+        Returns:
+            ``(place, distance_km)`` pairs
+        """
+        return self.place_service.get_nearby_places(latitude, longitude, radius_km,
+                                                    limit, max_radius_km)
+
+    def get_nearest_places(self, latitude: float, longitude: float, k: int = 10,
+                           min_price: Optional[float] = None,
+                           max_price: Optional[float] = None) -> List[Tuple[Place, float]]:
+        """Retrieve the k places nearest to a point within a price range.
+        
+        Args:
+            latitude: Latitude of the point in degrees
+            longitude: Longitude of the point in degrees
+            k: Number of places to return
+            min_price: Optional minimum price per night
+            max_price: Optional maximum price per night
+            
+        Returns:
+            ``(place, distance_km)`` pairs, nearest first
+        """
+        return self.place_service.get_ranked_places(
+            self.place_index_service.nearest_place_ids(latitude, longitude, k, min_price, max_price))
+
+    def get_places_in_bbox_page(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                                cursor: Optional[str] = None,
+                                limit: int = 50) -> Tuple[List[Place], Optional[str]]:
+        """Retrieve one page of the places inside a rectangle.
+        
+        Args:
+            min_lat: Southern edge in degrees
+            min_lon: Western edge in degrees
+            max_lat: Northern edge in degrees
+            max_lon: Eastern edge in degrees
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of places to return
+            
+        Returns:
+            A ``(places, next_cursor)`` tuple
+        """
+        return self.place_service.get_places_in_bbox_page(min_lat, min_lon, max_lat, max_lon,
+                                                          cursor, limit)
+
+    def count_places_in_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> int:
+        """Count the places inside a rectangle."""
+        return self.place_service.count_places_in_bbox(min_lat, min_lon, max_lat, max_lon)
+
+    def fill_missing_geohashes(self) -> int:
+        """Compute the geohash of the places that do not have one yet."""
+        return self.place_service.fill_missing_geohashes()
+
+    def repair_review_aggregates(self) -> int:
+        """Recompute the review aggregates of every place from the reviews.
+        
+        Returns:
+            The number of places that have reviews
+        """
+        return self.place_service.repair_review_aggregates()
+
+    def count_places(self, **filters) -> int:
+        """Count the places matching the search filters.
+        
+        Args:
+            **filters: Same filters as search_places
+            
+        Returns:
+            The number of matching places
+        """
+        return self.place_service.count_places(**filters)
+
+    def get_places_freshness(self) -> Tuple[int, Optional[datetime]]:
+        """Return the number of places and the newest ``updated_at``."""
+        return self.place_service.get_places_freshness()
+
+    def get_place_versions(self, place_id: str) -> Optional[Tuple]:
+        """Return what the detail document of a place depends on, without loading it.
+        
+        Args:
+            place_id: The unique identifier of the place
+            
+        Returns:
+            ``(place updated_at, owner updated_at, amenity count, newest amenity
+            updated_at)``, or None if the place does not exist
+        """
+        return self.place_service.get_place_versions(place_id)
+
+    def get_places_page(self, cursor: Optional[str] = None, limit: int = 50) -> Tuple[List[Place], Optional[str]]:
+        """Retrieve one page of places.
+        
+        Args:
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of places to return
+            
+        Returns:
+            A ``(places, next_cursor)`` tuple
+        """
+        return self.place_service.get_places_page(cursor, limit)
+
+    def iter_places(self, batch_size: int = 1000) -> Iterator[Place]:
+        """Iterate over all places, fetching them in batches.
+        
+        Args:
+            batch_size: Number of places fetched per database round trip
+            
+        Returns:
+            An iterator over all Place instances
+        """
+        return self.place_service.iter_places(batch_size)
     
     # Review methods
     def create_review(self, **kwargs) -> Review:
@@ -141,6 +330,20 @@ class HBnBFacade:
         """
         return self.review_service.create_review(**kwargs)
 
+    def create_reviews(self, user_id: str, reviews_data: List[Dict[str, Any]],
+                       dry_run: bool = False) -> Tuple[List[Review], List[Dict[str, Any]]]:
+        """Create a batch of reviews in as few transactions as possible.
+        
+        Args:
+            user_id: The ID of the user writing the reviews
+            reviews_data: List of dictionaries with review fields
+            dry_run: Only validate the items, nothing is written
+            
+        Returns:
+            A ``(reviews, errors)`` tuple, nothing is created if ``errors`` is not empty
+        """
+        return self.review_service.create_reviews(user_id, reviews_data, dry_run)
+
     def get_review(self, review_id: str) -> Optional[Review]:
         """Retrieve a review by its ID.
         
@@ -159,6 +362,33 @@ class HBnBFacade:
             A list of all Review instances
         """
         return self.review_service.get_all_reviews()
+
+    def count_reviews(self) -> int:
+        """Return the total number of reviews."""
+        return self.review_service.count_reviews()
+
+    def get_reviews_page(self, cursor: Optional[str] = None, limit: int = 50) -> Tuple[List[Review], Optional[str]]:
+        """Retrieve one page of reviews.
+        
+        Args:
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of reviews to return
+            
+        Returns:
+            A ``(reviews, next_cursor)`` tuple
+        """
+        return self.review_service.get_reviews_page(cursor, limit)
+
+    def iter_reviews(self, batch_size: int = 1000) -> Iterator[Review]:
+        """Iterate over all reviews, fetching them in batches.
+        
+        Args:
+            batch_size: Number of reviews fetched per database round trip
+            
+        Returns:
+            An iterator over all Review instances
+        """
+        return self.review_service.iter_reviews(batch_size)
     
     def update_review(self, review_id: str, **updates) -> Optional[Review]:
         """Update a review's information.
@@ -193,6 +423,48 @@ class HBnBFacade:
             A list of Review instances matching the place ID
         """
         return self.review_service.get_reviews_by_place(place_id)
+
+    def get_reviews_by_place_page(self, place_id: str, cursor: Optional[str] = None,
+                                  limit: int = 50) -> Tuple[List[Review], Optional[str]]:
+        """Retrieve one page of the reviews of a place, oldest first.
+        
+        Args:
+            place_id: The unique identifier of the place
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of reviews to return
+            
+        Returns:
+            A ``(reviews, next_cursor)`` tuple
+        """
+        return self.review_service.get_reviews_by_place_page(place_id, cursor, limit)
+
+    def count_reviews_by_place(self, place_id: str) -> int:
+        """Return the number of reviews of a place.
+        
+        Args:
+            place_id: The unique identifier of the place
+        """
+        return self.review_service.count_reviews_by_place(place_id)
+
+    def get_reviews_freshness(self, place_id: Optional[str] = None) -> Tuple[int, Optional[datetime]]:
+        """Return the number of reviews and the newest ``updated_at``.
+        
+        Args:
+            place_id: Only consider the reviews of this place when given
+        """
+        return self.review_service.get_reviews_freshness(place_id)
+
+    def has_user_reviewed_place(self, user_id: str, place_id: str) -> bool:
+        """Check whether a user has already reviewed a place.
+        
+        Args:
+            user_id: The ID of the user
+            place_id: The ID of the place
+            
+        Returns:
+            True if a review by this user for this place exists
+        """
+        return self.review_service.has_user_reviewed_place(user_id, place_id)
     
     # Amenity methods
     def get_amenities(self) -> List[Amenity]:
@@ -214,6 +486,33 @@ class HBnBFacade:
         """
         return self.place_service.search_places(**filters)
 
+    def search_places_page(self, cursor: Optional[str] = None, limit: int = 50,
+                           include: Iterable[str] = (), **filters) -> Tuple[List[Place], Optional[str]]:
+        """Retrieve one page of the places matching the filters.
+        
+        Args:
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of places to return
+            include: Relationships to load eagerly with the places
+            **filters: Keyword arguments for filtering places
+            
+        Returns:
+            A ``(places, next_cursor)`` tuple
+        """
+        return self.place_service.search_places_page(cursor, limit, include, **filters)
+
+    def iter_search_places(self, batch_size: int = 1000, **filters) -> Iterator[Place]:
+        """Iterate over all places matching the filters, fetching them in batches.
+        
+        Args:
+            batch_size: Number of places fetched per database round trip
+            **filters: Keyword arguments for filtering places
+            
+        Returns:
+            An iterator over the matching Place instances
+        """
+        return self.place_service.iter_search_places(batch_size, **filters)
+
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Retrieve a user by their email address.
         
@@ -256,6 +555,19 @@ class HBnBFacade:
         """
         return self.amenity_service.create_amenity(amenity_data['name'])
 
+    def create_amenities(self, amenities_data: List[Dict[str, Any]],
+                         dry_run: bool = False) -> Tuple[List[Amenity], List[Dict[str, Any]]]:
+        """Create a batch of amenities in as few transactions as possible.
+        
+        Args:
+            amenities_data: List of dictionaries with a 'name' key
+            dry_run: Only validate the items, nothing is written
+            
+        Returns:
+            A ``(amenities, errors)`` tuple, nothing is created if ``errors`` is not empty
+        """
+        return self.amenity_service.create_amenities([data['name'] for data in amenities_data], dry_run)
+
     def get_amenity(self, amenity_id):
         """Retrieve an amenity by its ID.
         
@@ -275,6 +587,26 @@ class HBnBFacade:
         """
         return self.amenity_service.get_all_amenities()
 
+    def count_amenities(self) -> int:
+        """Return the total number of amenities."""
+        return self.amenity_service.count_amenities()
+
+    def get_amenities_freshness(self) -> Tuple[int, Optional[datetime]]:
+        """Return the number of amenities and the newest ``updated_at``."""
+        return self.amenity_service.get_amenities_freshness()
+
+    def get_amenities_page(self, cursor: Optional[str] = None, limit: int = 50) -> Tuple[List[Amenity], Optional[str]]:
+        """Retrieve one page of amenities.
+        
+        Args:
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of amenities to return
+            
+        Returns:
+            A ``(amenities, next_cursor)`` tuple
+        """
+        return self.amenity_service.get_amenities_page(cursor, limit)
+
     def update_amenity(self, amenity_id, **amenity_data):
         """Update an amenity's information.
         
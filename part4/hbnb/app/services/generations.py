@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+
+"""Generation counters of the entity types, used to version cached responses.
+
+Every write of the place, amenity or review services calls :func:`bump` for
+the entity types whose list responses it changes. The counters are increased
+once the transaction commits, so a response computed from the old rows is
+always stored under the old generation, and the next read under the new
+generation misses: stale entries are never read again and simply age out
+of the cache.
+
+Counters are kept per application process, like the other in-memory caches:
+with several worker processes, the writes of the other workers are only
+seen once the entries expire (``RESPONSE_CACHE_TTL_SECONDS``).
+"""
+
+import threading
+from typing import Dict, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from app import db
+from app.persistence.replication import RoutingSession
+
+_lock = threading.Lock()
+
+
+def _counters() -> Dict[str, int]:
+    return current_app.extensions.setdefault('generations', {})
+
+
+def current(*entities: str) -> Tuple[int, ...]:
+    """Return the generations of the given entity types."""
+    counters = _counters()
+    return tuple(counters.get(entity, 0) for entity in entities)
+
+
+def bump(*entities: str) -> None:
+    """Record that the current transaction changes these entity types."""
+    if has_app_context():
+        db.session.info.setdefault('generation_bumps', set()).update(entities)
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _bump_committed(session):
+    entities = session.info.pop('generation_bumps', None)
+    if entities and has_app_context():
+        counters = _counters()
+        with _lock:
+            for entity in entities:
+                counters[entity] = counters.get(entity, 0) + 1
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _drop_rolled_back(session):
+    session.info.pop('generation_bumps', None)
@@ -0,0 +1,223 @@
+#!/usr/bin/python3
+
+"""In-memory index of the place coordinates and prices for k-nearest queries.
+
+:class:`PlaceIndex` keeps the id, latitude, longitude and price of every place
+in columnar NumPy arrays. A query computes the haversine distance to all the
+places in a few vectorized operations, masks the places outside the price
+range, and selects the k nearest with ``argpartition`` instead of sorting
+everything.
+
+The index is built from :class:`PlaceRepository` by each application process
+at first use. Place writes record their new values on the session, applied
+to the index once the transaction commits (and dropped if it rolls back), like
+the leaderboard events of the ranking service.
+
+NumPy is optional: without it, or with ``PLACE_INDEX_ENABLED = False``,
+:class:`PlaceIndexService` answers from the database, with geohash searches
+of growing radius.
+"""
+
+import threading
+from typing import Dict, List, Optional, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from app import db
+from app.models.geo import EARTH_RADIUS_KM
+from app.persistence.replication import RoutingSession
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    np = None
+
+# Rayons successifs du repli SQL ; le dernier couvre toute la Terre
+SQL_SEARCH_RADII_KM = (5, 25, 100, 500, 2500, 20040)
+
+
+class PlaceIndex:
+    """Columnar arrays of the place coordinates and prices.
+
+    Rows are appended in arrays grown by doubling; updating a place rewrites
+    its row in place. Coordinates are kept in radians with the cosine of the
+    latitude precomputed, which is what the haversine formula needs.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self._lock = threading.Lock()
+        self._positions: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._size = 0
+        self._allocate(max(capacity, 16))
+
+    def _allocate(self, capacity: int) -> None:
+        columns = {}
+        for name in ('lat', 'lon', 'cos_lat', 'price'):
+            column = np.full(capacity, np.nan)
+            if self._size:
+                column[:self._size] = getattr(self, '_' + name)[:self._size]
+            columns[name] = column
+        # Nouveaux tableaux complets avant la bascule : une lecture en cours
+        # garde les anciens, toujours cohérents
+        self._lat, self._lon = columns['lat'], columns['lon']
+        self._cos_lat, self._price = columns['cos_lat'], columns['price']
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    @classmethod
+    def from_rows(cls, rows) -> 'PlaceIndex':
+        """Build an index from ``(id, latitude, longitude, price)`` rows."""
+        rows = list(rows)
+        index = cls(len(rows))
+        if rows:
+            ids, lats, lons, prices = zip(*rows)
+            size = len(ids)
+            index._lat[:size] = np.radians(np.asarray(lats, dtype=np.float64))
+            index._lon[:size] = np.radians(np.asarray(lons, dtype=np.float64))
+            index._cos_lat[:size] = np.cos(index._lat[:size])
+            index._price[:size] = np.asarray(prices, dtype=np.float64)
+            index._ids = list(ids)
+            index._positions = {place_id: position for position, place_id in enumerate(ids)}
+            index._size = size
+        return index
+
+    def upsert(self, place_id: str, latitude: float, longitude: float, price: float) -> None:
+        """Add a place or update its row."""
+        with self._lock:
+            position = self._positions.get(place_id)
+            if position is None:
+                if self._size == len(self._lat):
+                    self._allocate(2 * len(self._lat))
+                position = self._size
+                self._ids.append(place_id)
+                self._positions[place_id] = position
+                self._size += 1
+            lat = np.radians(latitude)
+            self._lat[position] = lat
+            self._lon[position] = np.radians(longitude)
+            self._cos_lat[position] = np.cos(lat)
+            self._price[position] = price
+
+    def remove(self, place_id: str) -> None:
+        """Remove a place: its row stays allocated but never matches again."""
+        with self._lock:
+            position = self._positions.pop(place_id, None)
+            if position is not None:
+                self._ids[position] = None
+                self._lat[position] = np.nan
+
+    def nearest(self, latitude: float, longitude: float, k: int,
+                min_price: Optional[float] = None,
+                max_price: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Return the ``k`` places nearest to a point within a price range.
+
+        Returns:
+            ``(place_id, distance_km)`` pairs, nearest first
+        """
+        with self._lock:
+            size = self._size
+            lat, lon = self._lat[:size], self._lon[:size]
+            cos_lat, price = self._cos_lat[:size], self._price[:size]
+            ids = self._ids[:size]
+        if not size or k < 1:
+            return []
+        lat0, lon0 = np.radians(latitude), np.radians(longitude)
+        a = np.sin((lat - lat0) / 2) ** 2 + np.cos(lat0) * cos_lat * np.sin((lon - lon0) / 2) ** 2
+        distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        # Places supprimées (NaN) et hors budget : distance infinie
+        excluded = np.isnan(distances)
+        if min_price is not None:
+            excluded |= price < min_price
+        if max_price is not None:
+            excluded |= price > max_price
+        distances[excluded] = np.inf
+        matches = size - int(np.count_nonzero(excluded))
+        k = min(k, matches)
+        if k == 0:
+            return []
+        nearest = np.argpartition(distances, k - 1)[:k] if k < size else np.arange(size)
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+        return [(ids[i], float(distances[i])) for i in nearest if np.isfinite(distances[i])]
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def record_place_write(place) -> None:
+    """Record the coordinates and price of a written place for the in-memory index."""
+    db.session.info.setdefault('place_index_events', []).append(
+        (place.id, place.latitude, place.longitude, place.price))
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _apply_committed_writes(session):
+    events = session.info.pop('place_index_events', None)
+    if events and has_app_context():
+        index = current_app.extensions.get('place_index')
+        if index is not None:
+            for place_id, latitude, longitude, price in events:
+                index.upsert(place_id, latitude, longitude, price)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _drop_rolled_back_writes(session):
+    session.info.pop('place_index_events', None)
+
+
+class PlaceIndexService:
+    """Service class answering the k-nearest place queries."""
+
+    def __init__(self, place_repository):
+        """Initialize the PlaceIndexService with the repository it loads from.
+
+        Args:
+            place_repository: Repository providing the coordinates of the places
+        """
+        self.place_repository = place_repository
+        self._build_lock = threading.Lock()
+
+    def enabled(self) -> bool:
+        """Return True when queries are served by the in-memory index."""
+        return numpy_available() and current_app.config.get('PLACE_INDEX_ENABLED', True)
+
+    def get_index(self) -> PlaceIndex:
+        """Return the index of the current app, building it on first use."""
+        index = current_app.extensions.get('place_index')
+        if index is None:
+            with self._build_lock:
+                index = current_app.extensions.get('place_index')
+                if index is None:
+                    index = PlaceIndex.from_rows(self.place_repository.iter_coordinates())
+                    current_app.extensions['place_index'] = index
+        return index
+
+    def nearest_place_ids(self, latitude: float, longitude: float, k: int,
+                          min_price: Optional[float] = None,
+                          max_price: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Return ``(place_id, distance_km)`` of the k nearest places, nearest first.
+
+        Raises:
+            ValueError: If the point, k or the price range is invalid
+        """
+        if not -90 <= latitude <= 90:
+            raise ValueError("lat must be between -90 and 90")
+        if not -180 <= longitude <= 180:
+            raise ValueError("lon must be between -180 and 180")
+        if k < 1:
+            raise ValueError("k must be a positive integer")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError("min_price cannot be greater than max_price")
+        if self.enabled():
+            return self.get_index().nearest(latitude, longitude, k, min_price, max_price)
+        return self._nearest_from_database(latitude, longitude, k, min_price, max_price)
+
+    def _nearest_from_database(self, latitude, longitude, k, min_price, max_price):
+        # Les k plus proches dans un rayon r sont les k plus proches tout court
+        for radius_km in SQL_SEARCH_RADII_KM:
+            matches = self.place_repository.nearby(latitude, longitude, radius_km, k,
+                                                   min_price, max_price)
+            if len(matches) >= k:
+                break
+        return [(place.id, distance) for place, distance in matches]
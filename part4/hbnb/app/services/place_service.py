@@ -6,17 +6,23 @@ This module provides the PlaceService class which encapsulates all business logi
 related to place management, including creation, retrieval, and updates.
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from http import HTTPStatus
 from flask_restx import abort
 
+from app.models.base_model import utcnow
 from app.models.place import Place
 from app.models.amenity import Amenity
 from app.models.review import Review
 from app.models.user import User
-from app.persistence.repository import Repository
+from app.persistence.repository import Repository, DEFAULT_BATCH_SIZE, DEFAULT_PAGE_SIZE
 from app.persistence.place_repository import PlaceRepository
 from app.services.user_service import user_service as global_user_service
+from app.services.ranking_service import record_rating_change
+from app.services.place_index import record_place_write
+from app.services.entity_cache import cached_get, invalidate, invalidate_all
+from app.services import generations
 
 class PlaceService:
     """Service class for handling place-related operations.
@@ -45,22 +51,29 @@ class PlaceService:
         Raises:
             ValueError: If user doesn't exist
         """
-        if not self.user_service.get_user(user_id):
+        if not self.user_service.user_exists(user_id):
             raise ValueError(f"User with id {user_id} does not exist")
 
-    def _validate_amenities_exist(self, amenity_ids: List[str]) -> None:
-        """Check if all amenity IDs in the list exist.
+    def _validate_amenities_exist(self, amenity_ids: List[str]) -> List[Amenity]:
+        """Check if all amenity IDs in the list exist and load them.
+        
+        All amenities are fetched with a single query.
         
         Args:
             amenity_ids: List of amenity IDs to validate
             
+        Returns:
+            The Amenity instances, in the order of ``amenity_ids``
+            
         Raises:
             ValueError: If any amenity doesn't exist
         """
         from app.services.facade import hbnb_facade as facade
+        found = facade.amenity_service.get_amenities(amenity_ids)
         for amenity_id in amenity_ids:
-            if not facade.amenity_service.get_amenity(amenity_id):
+            if amenity_id not in found:
                 raise ValueError(f"Amenity with id {amenity_id} does not exist")
+        return [found[amenity_id] for amenity_id in dict.fromkeys(amenity_ids)]
 
     def create_place(self, title: str, description: str, price: float,
                    latitude: float, longitude: float, owner_id: str,
@@ -85,9 +98,8 @@ class PlaceService:
         # Validate user exists
         self._validate_user_exists(owner_id)
         
-        # Validate amenities if provided
-        if amenities:
-            self._validate_amenities_exist(amenities)
+        # Validate and load amenities if provided
+        place_amenities = self._validate_amenities_exist(amenities) if amenities else []
 
         # Create the place
         place = Place(
@@ -99,33 +111,86 @@ class PlaceService:
             owner_id=owner_id
         )
         place.reviews = []
-        
-        # Associate amenities if provided
-        if amenities:
-            from app.services.facade import hbnb_facade as facade
-            for amenity_id in amenities:
-                amenity = facade.amenity_service.get_amenity(amenity_id)
-                if amenity:
-                    place.amenities.append(amenity)
+        place.amenities.extend(place_amenities)
     
+        # user.places is the backref of owner_id: no extra write is needed
+        generations.bump('places')
         self.repository.add(place)
-    
-        # Update user's places list
-        self.user_service.add_user_place(owner_id, place.id)
-    
+        record_place_write(place)
         return place
     
     
-    def get_place(self, place_id: str) -> Optional[Place]:
+    def create_places(self, owner_id: str, places_data: List[Dict[str, Any]],
+                      dry_run: bool = False) -> Tuple[List[Place], List[Dict[str, Any]]]:
+        """Create a batch of places owned by the same user.
+        
+        Every item is validated before anything is written; if one item is
+        invalid, no place is created. Valid batches are flushed chunk by chunk
+        inside the current unit of work.
+        
+        Args:
+            owner_id: The ID of the user who owns the new places
+            places_data: List of dictionaries with the same fields as create_place
+            dry_run: Only validate the items, nothing is written
+            
+        Returns:
+            A ``(places, errors)`` tuple. ``errors`` lists ``{'index', 'message'}``
+            for every invalid item, in which case ``places`` is empty
+            
+        Raises:
+            ValueError: If the owner doesn't exist
+        """
+        from app.services.facade import hbnb_facade as facade
+        self._validate_user_exists(owner_id)
+
+        # Load the amenities of the whole batch with one query
+        amenities_by_id = facade.amenity_service.get_amenities(
+            [amenity_id for data in places_data for amenity_id in data.get('amenities') or []]
+        )
+        places: List[Place] = []
+        errors: List[Dict[str, Any]] = []
+        for index, data in enumerate(places_data):
+            try:
+                amenities = []
+                for amenity_id in dict.fromkeys(data.get('amenities') or []):
+                    if amenity_id not in amenities_by_id:
+                        raise ValueError(f"Amenity with id {amenity_id} does not exist")
+                    amenities.append(amenities_by_id[amenity_id])
+                place = Place(
+                    title=data['title'],
+                    description=data['description'],
+                    price=data['price'],
+                    latitude=data['latitude'],
+                    longitude=data['longitude'],
+                    owner_id=owner_id
+                )
+                place.amenities.extend(amenities)
+                places.append(place)
+            except ValueError as e:
+                errors.append({'index': index, 'message': str(e)})
+
+        if errors or dry_run:
+            return [], errors
+        generations.bump('places')
+        self.repository.add_many(places)
+        for place in places:
+            record_place_write(place)
+        return places, []
+    
+    def get_place(self, place_id: str, include: Iterable[str] = ()) -> Optional[Place]:
         """Retrieve a place by its ID.
         
         Args:
             place_id: The unique identifier of the place
+            include: Relationships to load eagerly with the place
+                ('owner', 'amenities', 'reviews')
             
         Returns:
             The Place instance if found, None otherwise
         """
-        return self.repository.get(place_id)
+        if include:
+            return self.repository.get_with(place_id, include)
+        return cached_get(Place, place_id, self.repository.get)
     
     def get_all_places(self) -> List[Place]:
         """Retrieve all places in the system.
@@ -135,6 +200,192 @@ class PlaceService:
         """
         return self.repository.get_all()
     
+    def get_ranked_places(self, ranking: List[Tuple[str, float]]) -> List[Tuple[Place, float]]:
+        """Load the places of a leaderboard with a single query.
+        
+        Args:
+            ranking: ``(place_id, score)`` pairs, best first
+            
+        Returns:
+            ``(place, score)`` pairs in the same order, without the deleted places
+        """
+        places = self.repository.get_many(place_id for place_id, _ in ranking)
+        return [(places[place_id], score) for place_id, score in ranking if place_id in places]
+
+    def get_nearby_places(self, latitude: float, longitude: float, radius_km: float,
+                          limit: int, max_radius_km: float) -> List[Tuple[Place, float]]:
+        """Find the places around a point, nearest first.
+        
+        Args:
+            latitude: Latitude of the center in degrees
+            longitude: Longitude of the center in degrees
+            radius_km: Search radius in kilometers
+            limit: Maximum number of places to return
+            max_radius_km: Largest radius accepted
+            
+        Returns:
+            ``(place, distance_km)`` pairs
+            
+        Raises:
+            ValueError: If the center, the radius or the limit is invalid
+        """
+        if not -90 <= latitude <= 90:
+            raise ValueError("lat must be between -90 and 90")
+        if not -180 <= longitude <= 180:
+            raise ValueError("lon must be between -180 and 180")
+        if not 0 < radius_km <= max_radius_km:
+            raise ValueError(f"radius_km must be greater than 0 and at most {max_radius_km}")
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+        return self.repository.nearby(latitude, longitude, radius_km, limit)
+
+    @staticmethod
+    def _validate_bbox(min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> None:
+        if not -90 <= min_lat <= max_lat <= 90:
+            raise ValueError("min_lat and max_lat must be between -90 and 90, min_lat <= max_lat")
+        if not (-180 <= min_lon <= 180 and -180 <= max_lon <= 180):
+            raise ValueError("min_lon and max_lon must be between -180 and 180")
+
+    def get_places_in_bbox_page(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float,
+                                cursor: Optional[str] = None,
+                                limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Place], Optional[str]]:
+        """Retrieve one page of the places inside a rectangle, oldest first.
+        
+        Args:
+            min_lat: Southern edge in degrees
+            min_lon: Western edge in degrees, greater than max_lon when the
+                rectangle crosses the antimeridian
+            max_lat: Northern edge in degrees
+            max_lon: Eastern edge in degrees
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of places to return
+            
+        Returns:
+            A ``(places, next_cursor)`` tuple, ``next_cursor`` is None on the last page
+            
+        Raises:
+            ValueError: If the rectangle or the cursor is invalid
+        """
+        self._validate_bbox(min_lat, min_lon, max_lat, max_lon)
+        return self.repository.bbox_page(min_lat, min_lon, max_lat, max_lon, cursor, limit)
+
+    def count_places_in_bbox(self, min_lat: float, min_lon: float, max_lat: float, max_lon: float) -> int:
+        """Count the places inside a rectangle.
+        
+        Raises:
+            ValueError: If the rectangle is invalid
+        """
+        self._validate_bbox(min_lat, min_lon, max_lat, max_lon)
+        return self.repository.count_bbox(min_lat, min_lon, max_lat, max_lon)
+
+    def fill_missing_geohashes(self) -> int:
+        """Compute the geohash of the places that do not have one yet.
+        
+        Returns:
+            The number of places updated
+        """
+        invalidate_all(Place)
+        generations.bump('places')
+        return self.repository.fill_missing_geohashes()
+
+    def record_review_ratings(self, place_id: str, added: Iterable[int] = (),
+                              removed: Iterable[int] = ()) -> None:
+        """Update the review aggregates of a place for added and removed ratings.
+        
+        Must run in the transaction that writes the reviews themselves.
+        
+        Args:
+            place_id: The ID of the reviewed place
+            added: Ratings of the reviews added to the place
+            removed: Ratings of the reviews removed from the place
+        """
+        added, removed = list(added), list(removed)
+        histogram = {rating: added.count(rating) - removed.count(rating) for rating in range(1, 6)}
+        invalidate(Place, place_id)
+        # Les listes de places exposent review_count et average_rating
+        generations.bump('places')
+        self.repository.apply_review_deltas(place_id, len(added) - len(removed),
+                                            sum(added) - sum(removed), histogram)
+        record_rating_change(place_id, len(added) - len(removed), sum(added) - sum(removed))
+
+    def repair_review_aggregates(self) -> int:
+        """Recompute the review aggregates of every place from the reviews.
+        
+        Returns:
+            The number of places that have reviews
+        """
+        invalidate_all(Place)
+        generations.bump('places')
+        return self.repository.recompute_review_aggregates()
+
+    def place_exists(self, place_id: str) -> bool:
+        """Check that a place exists without loading the row.
+        
+        Args:
+            place_id: The ID of the place to check
+            
+        Returns:
+            True if the place exists, False otherwise
+        """
+        return self.repository.exists(place_id)
+
+    def count_places(self, **filters) -> int:
+        """Count the places matching the filter criteria.
+        
+        Args:
+            **filters: Same filters as search_places
+            
+        Returns:
+            The number of matching places
+            
+        Raises:
+            ValueError: If a filter value is invalid
+        """
+        return self.repository.count_search(filters)
+
+    def get_places_freshness(self) -> Tuple[int, Optional[datetime]]:
+        """Return the number of places and the newest ``updated_at``."""
+        return self.repository.freshness()
+
+    def get_place_versions(self, place_id: str) -> Optional[Tuple]:
+        """Return what the detail document of a place depends on, without loading it.
+        
+        Args:
+            place_id: The unique identifier of the place
+            
+        Returns:
+            ``(place updated_at, owner updated_at, amenity count, newest amenity
+            updated_at)``, or None if the place does not exist
+        """
+        return self.repository.detail_versions(place_id)
+
+    def get_places_page(self, cursor: Optional[str] = None,
+                        limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Place], Optional[str]]:
+        """Retrieve one page of places, oldest first.
+        
+        Args:
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of places to return
+            
+        Returns:
+            A ``(places, next_cursor)`` tuple, ``next_cursor`` is None on the last page
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        return self.repository.get_page(cursor, limit)
+    
+    def iter_places(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Place]:
+        """Iterate over all places, oldest first, fetching them in batches.
+        
+        Args:
+            batch_size: Number of places fetched per database round trip
+            
+        Returns:
+            An iterator over all Place instances
+        """
+        return self.repository.iter_all(batch_size)
+    
     def update_place(self, place_id: str, **updates) -> Optional[Place]:
         """Update a place's information.
         
@@ -148,49 +399,82 @@ class PlaceService:
         Raises:
             ValueError: If any amenity doesn't exist or if validation fails
         """
-        # Validate amenities if they're being updated
+        # Validate amenities if they're being updated, and swap the IDs for the objects
         if 'amenities' in updates:
-            self._validate_amenities_exist(updates['amenities'])
+            updates['amenities'] = self._validate_amenities_exist(updates['amenities'] or [])
             
-        # Get the current place to preserve existing fields
-        place = self.get_place(place_id)
+        # Get the current place to preserve existing fields; replacing the
+        # amenities needs the current collection to compute the changes
+        place = self.get_place(place_id, include=('amenities',) if 'amenities' in updates else ())
         if not place:
             return None
             
+        invalidate(Place, place_id)
+        generations.bump('places')
         # Update the place attributes
         for key, value in updates.items():
             if hasattr(place, key):
                 setattr(place, key, value)
+        if 'amenities' in updates:
+            # Changer les liens place_amenity ne met pas à jour la ligne de la place ;
+            # même horloge que le onupdate de la colonne
+            place.updated_at = utcnow()
                 
         # Save the updated place
         self.repository.add(place)
+        if updates.keys() & {'latitude', 'longitude', 'price'}:
+            record_place_write(place)
         return place
     
     def search_places(self, **filters) -> List[Place]:
         """Search for places based on filter criteria.
         
         Args:
-            **filters: Keyword arguments for filtering places (e.g., min_price, max_price)
+            **filters: Keyword arguments for filtering places: min_price, max_price,
+                min_rating (minimum average rating), amenities (list of amenity IDs
+                that must all be present) and owner_id
             
         Returns:
             A list of Place instances matching the filter criteria
+            
+        Raises:
+            ValueError: If a filter value is invalid
         """
-        all_places = self.get_all_places()
+        return self.repository.search(filters)
+    
+    def search_places_page(self, cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE,
+                           include: Iterable[str] = (), **filters) -> Tuple[List[Place], Optional[str]]:
+        """Retrieve one page of the places matching the filter criteria, oldest first.
         
-        # Apply filters
-        filtered_places = all_places
-        if 'min_price' in filters:
-            filtered_places = [p for p in filtered_places 
-                            if p.price >= float(filters['min_price'])]
-        if 'max_price' in filters:
-            filtered_places = [p for p in filtered_places 
-                            if p.price <= float(filters['max_price'])]
+        Args:
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of places to return
+            include: Relationships to load eagerly with the places
+            **filters: Same filters as search_places
             
-        return filtered_places
+        Returns:
+            A ``(places, next_cursor)`` tuple, ``next_cursor`` is None on the last page
+            
+        Raises:
+            ValueError: If the cursor or a filter value is invalid
+        """
+        return self.repository.search_page(filters, cursor, limit, include)
+    
+    def iter_search_places(self, batch_size: int = DEFAULT_BATCH_SIZE, **filters) -> Iterator[Place]:
+        """Iterate over all places matching the filter criteria, fetching them in batches.
+        
+        Args:
+            batch_size: Number of places fetched per database round trip
+            **filters: Same filters as search_places
+            
+        Returns:
+            An iterator over the matching Place instances
+        """
+        return self.repository.iter_search(filters, batch_size)
     
     def add_review(self, place_id: str, review: Review) -> bool:
         """Ajoute un avis à la place"""
-        place = self.get_place(place_id)
+        place = self.get_place(place_id, include=('reviews',))
         if not place:
             return False
             
@@ -203,32 +487,36 @@ class PlaceService:
     
     def get_place_reviews(self, place_id: str) -> List[Review]:
         """Récupère tous les avis d'une place"""
-        place = self.get_place(place_id)
+        place = self.get_place(place_id, include=('reviews',))
         return place.reviews if place else []
     
     def add_amenity(self, place_id: str, amenity: Amenity) -> bool:
         """Ajoute un équipement à la place"""
-        place = self.get_place(place_id)
+        place = self.get_place(place_id, include=('amenities',))
         if not place:
             return False
             
         if amenity not in place.amenities:
+            generations.bump('places')
             place.amenities.append(amenity)
+            place.updated_at = utcnow()
             return True
         return False
     
     def get_place_amenities(self, place_id: str) -> List[Amenity]:
         """Récupère tous les équipements d'une place"""
-        place = self.get_place(place_id)
+        place = self.get_place(place_id, include=('amenities',))
         return place.amenities if place else []
     
     def remove_amenity(self, place_id: str, amenity: Amenity) -> bool:
         """Supprime un équipement de la place"""
-        place = self.get_place(place_id)
+        place = self.get_place(place_id, include=('amenities',))
         if not place or amenity not in place.amenities:
             return False
             
+        generations.bump('places')
         place.amenities.remove(amenity)
+        place.updated_at = utcnow()
         return True
 
 
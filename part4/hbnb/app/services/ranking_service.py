@@ -0,0 +1,251 @@
+#!/usr/bin/python3
+
+"""Ranking service module for the top-rated and trending place leaderboards.
+
+Both leaderboards are kept in memory and updated incrementally: review writes
+record ranking events on the session, applied once the transaction commits
+(and dropped if it rolls back). Each application process rebuilds its
+rankings from the database at first use and every ``RANKING_REFRESH_SECONDS``,
+which also brings in the writes made by the other worker processes.
+
+- Top rated: Bayesian average ``(C * m + rating_sum) / (C + review_count)``,
+  where ``m`` is the mean rating of all reviews and ``C`` is
+  ``RANKING_PRIOR_WEIGHT``, so a single 5-star review does not beat a place
+  with hundreds of good reviews.
+- Trending: sum over the reviews of ``exp(-λ age)``, with λ derived from
+  ``TRENDING_HALF_LIFE_HOURS``.
+"""
+
+import heapq
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Hashable, List, Optional, Tuple
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from app import db
+from app.models.base_model import utcnow
+from app.persistence.replication import RoutingSession
+
+# Reviews older than this many half-lives weigh less than 0.5% and are not loaded
+TRENDING_HORIZON_HALF_LIVES = 8
+
+
+class TopK:
+    """The ``size`` best scores among all the tracked keys.
+
+    Every score is kept in a dict but only the best ``size`` entries are
+    kept sorted, so reading the leaderboard costs O(size). Raising a score
+    updates the sorted entries in place; lowering the score of an entry of
+    the leaderboard marks it stale, and it is rebuilt from the dict with a
+    single heap selection on the next read.
+
+    The dict is deliberately not bounded by ``size``: refilling the
+    leaderboard when one of its entries drops needs the scores of the keys
+    outside it. It holds one float per tracked key, as many as the reviewed
+    places for the top-rated board and the places reviewed within the
+    horizon for the trending one, and is rebuilt at each refresh.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._scores: Dict[Hashable, float] = {}
+        self._top: List[Tuple[float, Hashable]] = []
+        self._stale = False
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def get(self, key: Hashable, default: float = 0.0) -> float:
+        return self._scores.get(key, default)
+
+    def set(self, key: Hashable, score: float) -> None:
+        previous = self._scores.get(key)
+        self._scores[key] = score
+        if self._stale:
+            return
+        if previous is not None and (previous, key) in self._top:
+            if score < previous and len(self._scores) > len(self._top):
+                # Une autre clé hors du classement peut maintenant le dépasser
+                self._stale = True
+                return
+            self._top.remove((previous, key))
+        elif len(self._top) == self.size and (score, key) <= self._top[-1]:
+            return
+        self._top.append((score, key))
+        self._top.sort(key=lambda entry: (-entry[0], entry[1]))
+        del self._top[self.size:]
+
+    def remove(self, key: Hashable) -> None:
+        score = self._scores.pop(key, None)
+        if score is not None and (score, key) in self._top:
+            self._stale = True
+
+    def items(self, limit: Optional[int] = None) -> List[Tuple[Hashable, float]]:
+        """Return the best ``(key, score)`` pairs, best first."""
+        if self._stale:
+            self._top = heapq.nsmallest(self.size, ((s, k) for k, s in self._scores.items()),
+                                        key=lambda entry: (-entry[0], entry[1]))
+            self._stale = False
+        return [(key, score) for score, key in self._top[:limit]]
+
+
+class PlaceRankings:
+    """In-memory top-rated and trending leaderboards of the places."""
+
+    def __init__(self, size: int, prior_weight: float, half_life_hours: float):
+        self.prior_weight = prior_weight
+        self.decay = math.log(2) / (half_life_hours * 3600)
+        self.horizon = timedelta(hours=half_life_hours * TRENDING_HORIZON_HALF_LIVES)
+        # Les scores de tendance sont stockés relativement à cet instant : ils ne
+        # font que croître, et le classement ne change pas quand le temps passe
+        self.epoch = time.time()
+        self.built_at = time.monotonic()
+        self.top = TopK(size)
+        self.trending = TopK(size)
+        self._ratings: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+        # Totaux de tous les avis, tenus à jour par apply() pour la moyenne a priori
+        self._review_count = 0
+        self._rating_sum = 0
+
+    def load(self, aggregates, review_times) -> None:
+        """Fill the leaderboards from the database rows.
+
+        Args:
+            aggregates: ``(place_id, review_count, rating_sum)`` of the reviewed places
+            review_times: ``(place_id, created_at)`` of the recent reviews
+        """
+        with self._lock:
+            self._ratings = {place_id: [count, total] for place_id, count, total in aggregates}
+            self._review_count = sum(count for count, _ in self._ratings.values())
+            self._rating_sum = sum(total for _, total in self._ratings.values())
+            for place_id, (count, total) in self._ratings.items():
+                self.top.set(place_id, self._bayesian_average(count, total))
+            for place_id, created_at in review_times:
+                self._add_activity(place_id, created_at, 1)
+
+    @property
+    def prior_mean(self) -> float:
+        """Mean rating of all the reviews, ``m`` of the Bayesian average."""
+        return self._rating_sum / self._review_count if self._review_count else 0.0
+
+    def _bayesian_average(self, count: int, total: int) -> float:
+        return (self.prior_weight * self.prior_mean + total) / (self.prior_weight + count)
+
+    def _add_activity(self, place_id: str, created_at: datetime, delta: int) -> None:
+        # created_at est en UTC naïf : timestamp() seul le lirait en heure locale
+        timestamp = created_at.replace(tzinfo=timezone.utc).timestamp()
+        weight = math.exp(self.decay * (timestamp - self.epoch))
+        score = self.trending.get(place_id) + delta * weight
+        if score <= 1e-9:
+            self.trending.remove(place_id)
+        else:
+            self.trending.set(place_id, score)
+
+    def apply(self, events) -> None:
+        """Apply the ranking events of a committed transaction.
+
+        The totals behind the prior mean follow every rating change, and the
+        places of the events are scored with the current prior. The other
+        places keep the prior of their last score until the next refresh:
+        rescoring them all on each review would cost O(places).
+        """
+        with self._lock:
+            for kind, place_id, *values in events:
+                if kind == 'rating':
+                    self._review_count += values[0]
+                    self._rating_sum += values[1]
+                    count, total = self._ratings.setdefault(place_id, [0, 0])
+                    count, total = count + values[0], total + values[1]
+                    self._ratings[place_id] = [count, total]
+                    if count > 0:
+                        self.top.set(place_id, self._bayesian_average(count, total))
+                    else:
+                        del self._ratings[place_id]
+                        self.top.remove(place_id)
+                elif kind == 'activity':
+                    created_at, delta = values
+                    if utcnow() - created_at <= self.horizon:
+                        self._add_activity(place_id, created_at, delta)
+
+    def top_places(self, limit: int) -> List[Tuple[str, float]]:
+        with self._lock:
+            return [(place_id, round(score, 4)) for place_id, score in self.top.items(limit)]
+
+    def trending_places(self, limit: int) -> List[Tuple[str, float]]:
+        """Return the trending places with their decayed score at this instant."""
+        factor = math.exp(-self.decay * (time.time() - self.epoch))
+        with self._lock:
+            return [(place_id, round(score * factor, 4))
+                    for place_id, score in self.trending.items(limit)]
+
+
+def _pending_events() -> list:
+    return db.session.info.setdefault('ranking_events', [])
+
+
+def record_rating_change(place_id: str, count: int, rating_sum: int) -> None:
+    """Record a change of the review aggregates of a place for the leaderboards."""
+    if count or rating_sum:
+        _pending_events().append(('rating', place_id, count, rating_sum))
+
+
+def record_review_activity(place_id: str, created_at: datetime, delta: int) -> None:
+    """Record a review added to (delta=1) or removed from (delta=-1) a place."""
+    _pending_events().append(('activity', place_id, created_at, delta))
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _apply_committed_events(session):
+    events = session.info.pop('ranking_events', None)
+    if events and has_app_context():
+        rankings = current_app.extensions.get('place_rankings')
+        if rankings is not None:
+            rankings.apply(events)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _drop_rolled_back_events(session):
+    session.info.pop('ranking_events', None)
+
+
+class RankingService:
+    """Service class serving the place leaderboards of the current application."""
+
+    def __init__(self, place_repository, review_repository):
+        """Initialize the RankingService with the repositories it loads from.
+
+        Args:
+            place_repository: Repository providing the review aggregates of the places
+            review_repository: Repository providing the creation times of the reviews
+        """
+        self.place_repository = place_repository
+        self.review_repository = review_repository
+        self._build_lock = threading.Lock()
+
+    def get_rankings(self) -> PlaceRankings:
+        """Return the leaderboards of the current app, (re)building them when too old."""
+        config = current_app.config
+        rankings = current_app.extensions.get('place_rankings')
+        if rankings is None or time.monotonic() - rankings.built_at > config['RANKING_REFRESH_SECONDS']:
+            with self._build_lock:
+                built = current_app.extensions.get('place_rankings')
+                if built is not rankings:
+                    # Reconstruit par un autre thread pendant l'attente du verrou
+                    return built
+                rankings = PlaceRankings(config['RANKING_SIZE'], config['RANKING_PRIOR_WEIGHT'],
+                                         config['TRENDING_HALF_LIFE_HOURS'])
+                rankings.load(self.place_repository.get_review_aggregates(),
+                              self.review_repository.get_review_times_since(utcnow() - rankings.horizon))
+                current_app.extensions['place_rankings'] = rankings
+        return rankings
+
+    def get_top_place_ids(self, limit: int) -> List[Tuple[str, float]]:
+        """Return ``(place_id, bayesian_average)`` of the best rated places."""
+        return self.get_rankings().top_places(limit)
+
+    def get_trending_place_ids(self, limit: int) -> List[Tuple[str, float]]:
+        """Return ``(place_id, score)`` of the places with the most recent reviews."""
+        return self.get_rankings().trending_places(limit)
@@ -6,12 +6,16 @@ This module provides the ReviewService class which encapsulates all business log
 related to review management, including creation, retrieval, and updates.
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from flask_restx import abort
 from http import HTTPStatus
 from app.models.review import Review
-from app.persistence.repository import Repository
+from app.persistence.repository import Repository, DEFAULT_BATCH_SIZE, DEFAULT_PAGE_SIZE
 from app.persistence.review_repository import ReviewRepository
+from app.persistence.unit_of_work import unit_of_work
+from app.services.ranking_service import record_review_activity
+from app.services import generations
 
 class ReviewService:
     """Service class for handling review-related operations.
@@ -42,7 +46,7 @@ class ReviewService:
         Raises:
             HTTPException: 404 if user doesn't exist
         """
-        if self.user_service and not self.user_service.get_user(user_id):
+        if self.user_service and not self.user_service.user_exists(user_id):
             abort(HTTPStatus.NOT_FOUND, f"User with id {user_id} does not exist")
     
     def _validate_place_exists(self, place_id: str) -> None:
@@ -54,7 +58,7 @@ class ReviewService:
         Raises:
             HTTPException: 404 if place doesn't exist
         """
-        if self.place_service and not self.place_service.get_place(place_id):
+        if self.place_service and not self.place_service.place_exists(place_id):
             abort(HTTPStatus.NOT_FOUND, f"Place with id {place_id} does not exist")
     
     def create_review(self, text: str, rating: int, 
@@ -87,8 +91,81 @@ class ReviewService:
             place_id=place_id,
             user_id=user_id
         )
-        self.repository.add(review)
+        # L'avis et les agrégats de la place sont écrits dans la même transaction
+        with unit_of_work():
+            generations.bump('reviews')
+            self.repository.add(review)
+            self._record_ratings(place_id, added=[review.rating])
+            record_review_activity(place_id, review.created_at, 1)
         return review
+
+    def _record_ratings(self, place_id: str, added=(), removed=()) -> None:
+        """Report added/removed ratings to the aggregates of the place."""
+        if self.place_service:
+            self.place_service.record_review_ratings(place_id, added, removed)
+    
+    def create_reviews(self, user_id: str, reviews_data: List[Dict[str, Any]],
+                       dry_run: bool = False) -> Tuple[List[Review], List[Dict[str, Any]]]:
+        """Create a batch of reviews written by the same user.
+        
+        Every item is validated before anything is written; if one item is
+        invalid, no review is created. A user cannot review their own place
+        or review the same place twice, including within the batch.
+        
+        Args:
+            user_id: The ID of the user writing the reviews
+            reviews_data: List of dictionaries with ``text``, ``rating`` and ``place_id``
+            dry_run: Only validate the items, nothing is written
+            
+        Returns:
+            A ``(reviews, errors)`` tuple. ``errors`` lists ``{'index', 'message'}``
+            for every invalid item, in which case ``reviews`` is empty
+            
+        Raises:
+            HTTPException: 404 if the user doesn't exist
+        """
+        self._validate_user_exists(user_id)
+
+        reviewed_place_ids = {r.place_id for r in self.get_reviews_by_user(user_id)}
+        places_by_id = {}
+        reviews: List[Review] = []
+        errors: List[Dict[str, Any]] = []
+        for index, data in enumerate(reviews_data):
+            place_id = data['place_id']
+            try:
+                if place_id not in places_by_id:
+                    places_by_id[place_id] = self.place_service.get_place(place_id)
+                place = places_by_id[place_id]
+                if not place:
+                    raise ValueError(f"Place with id {place_id} does not exist")
+                if place.owner_id == user_id:
+                    raise ValueError("You cannot review your own place")
+                if place_id in reviewed_place_ids:
+                    raise ValueError("You have already reviewed this place")
+                review = Review(
+                    text=data['text'],
+                    rating=data['rating'],
+                    place_id=place_id,
+                    user_id=user_id
+                )
+                reviewed_place_ids.add(place_id)
+                reviews.append(review)
+            except ValueError as e:
+                errors.append({'index': index, 'message': str(e)})
+
+        if errors or dry_run:
+            return [], errors
+        ratings_by_place: Dict[str, List[int]] = {}
+        for review in reviews:
+            ratings_by_place.setdefault(review.place_id, []).append(review.rating)
+        with unit_of_work():
+            generations.bump('reviews')
+            self.repository.add_many(reviews)
+            for place_id, ratings in ratings_by_place.items():
+                self._record_ratings(place_id, added=ratings)
+            for review in reviews:
+                record_review_activity(review.place_id, review.created_at, 1)
+        return reviews, []
     
     def get_review(self, review_id: str) -> Optional[Review]:
         """Retrieve a review by its ID.
@@ -109,6 +186,53 @@ class ReviewService:
         """
         return self.repository.get_all()
     
+    def count_reviews(self) -> int:
+        """Return the total number of reviews."""
+        return self.repository.count()
+
+    def count_reviews_by_place(self, place_id: str) -> int:
+        """Return the number of reviews of a place.
+        
+        Args:
+            place_id: The ID of the place
+        """
+        return self.repository.count({'place_id': place_id})
+
+    def get_reviews_freshness(self, place_id: Optional[str] = None) -> Tuple[int, Optional[datetime]]:
+        """Return the number of reviews and the newest ``updated_at``.
+        
+        Args:
+            place_id: Only consider the reviews of this place when given
+        """
+        return self.repository.freshness({'place_id': place_id} if place_id else None)
+
+    def get_reviews_page(self, cursor: Optional[str] = None,
+                         limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Review], Optional[str]]:
+        """Retrieve one page of reviews, oldest first.
+        
+        Args:
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of reviews to return
+            
+        Returns:
+            A ``(reviews, next_cursor)`` tuple, ``next_cursor`` is None on the last page
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        return self.repository.get_page(cursor, limit)
+    
+    def iter_reviews(self, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Review]:
+        """Iterate over all reviews, oldest first, fetching them in batches.
+        
+        Args:
+            batch_size: Number of reviews fetched per database round trip
+            
+        Returns:
+            An iterator over all Review instances
+        """
+        return self.repository.iter_all(batch_size)
+    
     def get_reviews_by_place(self, place_id: str) -> List[Review]:
         """Retrieve all reviews for a specific place.
         
@@ -118,8 +242,24 @@ class ReviewService:
         Returns:
             A list of Review instances for the specified place
         """
-        return [r for r in self.repository.get_all() 
-                if getattr(r, 'place_id', None) == place_id]
+        return self.repository.get_reviews_by_place(place_id)
+    
+    def get_reviews_by_place_page(self, place_id: str, cursor: Optional[str] = None,
+                                  limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[Review], Optional[str]]:
+        """Retrieve one page of the reviews of a place, oldest first.
+        
+        Args:
+            place_id: The ID of the place to get reviews for
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of reviews to return
+            
+        Returns:
+            A ``(reviews, next_cursor)`` tuple, ``next_cursor`` is None on the last page
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        return self.repository.get_reviews_by_place_page(place_id, cursor, limit)
     
     def get_reviews_by_user(self, user_id: str) -> List[Review]:
         """Retrieve all reviews written by a specific user.
@@ -130,8 +270,19 @@ class ReviewService:
         Returns:
             A list of Review instances written by the specified user
         """
-        return [r for r in self.repository.get_all() 
-                if getattr(r, 'user_id', None) == user_id]
+        return self.repository.get_reviews_by_user(user_id)
+    
+    def has_user_reviewed_place(self, user_id: str, place_id: str) -> bool:
+        """Check whether a user has already reviewed a place.
+        
+        Args:
+            user_id: The ID of the user
+            place_id: The ID of the place
+            
+        Returns:
+            True if a review by this user for this place exists
+        """
+        return self.repository.has_user_reviewed_place(user_id, place_id)
     
     def update_review(self, review_id: str, **updates) -> Optional[Review]:
         """Update a review's information.
@@ -157,8 +308,21 @@ class ReviewService:
         # Validate rating is between 1 and 5 if being updated
         if 'rating' in updates and not 1 <= updates['rating'] <= 5:
             abort(HTTPStatus.BAD_REQUEST, "Rating must be between 1 and 5")
-            
-        return self.repository.update(review_id, updates)
+
+        with unit_of_work():
+            review = self.repository.get(review_id)
+            if not review:
+                return None
+            old_place_id, old_rating = review.place_id, review.rating
+            generations.bump('reviews')
+            review = self.repository.update(review_id, updates)
+            if (review.place_id, review.rating) != (old_place_id, old_rating):
+                self._record_ratings(old_place_id, removed=[old_rating])
+                self._record_ratings(review.place_id, added=[review.rating])
+            if review.place_id != old_place_id:
+                record_review_activity(old_place_id, review.created_at, -1)
+                record_review_activity(review.place_id, review.created_at, 1)
+        return review
     
     def delete_review(self, review_id: str) -> bool:
         """Delete a review from the system.
@@ -169,10 +333,18 @@ class ReviewService:
         Returns:
             True if the review was deleted, False if not found
         """
-        if self.repository.get(review_id):
-            self.repository.delete(review_id)
-            return True
-        return False
+        # La note est nécessaire pour les agrégats : l'avis est lu (déjà en
+        # mémoire quand l'endpoint l'a chargé pour vérifier l'auteur)
+        with unit_of_work():
+            review = self.repository.get(review_id)
+            if not review:
+                return False
+            place_id, rating, created_at = review.place_id, review.rating, review.created_at
+            generations.bump('reviews')
+            self.repository.delete_by_id(review_id)
+            self._record_ratings(place_id, removed=[rating])
+            record_review_activity(place_id, created_at, -1)
+        return True
 
 
 # Singleton instance of the ReviewService
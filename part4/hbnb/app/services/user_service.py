@@ -6,10 +6,12 @@ This module provides the UserService class which encapsulates all business logic
 related to user management, including creation, retrieval, and updates.
 """
 
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from app.models.user import User
-from app.persistence.repository import Repository
+from app.persistence.repository import Repository, DEFAULT_PAGE_SIZE
 from app.persistence.user_repository import UserRepository
+from app.services.entity_cache import cached_get, invalidate
 
 class UserService:
     """Service class for handling user-related operations.
@@ -66,7 +68,7 @@ class UserService:
         Returns:
             The User instance if found, None otherwise
         """
-        return self.repository.get(user_id)
+        return cached_get(User, user_id, self.repository.get)
     
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Retrieve a user by their email address.
@@ -87,6 +89,41 @@ class UserService:
         """
         return self.repository.get_all()
     
+    def user_exists(self, user_id: str) -> bool:
+        """Check that a user exists without loading the row.
+        
+        Args:
+            user_id: The ID of the user to check
+            
+        Returns:
+            True if the user exists, False otherwise
+        """
+        return self.repository.exists(user_id)
+
+    def count_users(self) -> int:
+        """Return the total number of users."""
+        return self.repository.count()
+
+    def get_users_freshness(self) -> Tuple[int, Optional[datetime]]:
+        """Return the number of users and the newest ``updated_at``."""
+        return self.repository.freshness()
+
+    def get_users_page(self, cursor: Optional[str] = None,
+                       limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List[User], Optional[str]]:
+        """Retrieve one page of users, oldest first.
+        
+        Args:
+            cursor: Cursor returned by the previous page, None for the first page
+            limit: Maximum number of users to return
+            
+        Returns:
+            A ``(users, next_cursor)`` tuple, ``next_cursor`` is None on the last page
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        return self.repository.get_page(cursor, limit)
+    
     def update_user(self, user_id: str, **updates) -> Optional[User]:
         """Update a user's information.
         
@@ -105,6 +142,7 @@ class UserService:
             if existing and existing.id != user_id:
                 raise ValueError(f"A user with email {updates['email']} already exists.")
         
+        invalidate(User, user_id)
         return self.repository.update(user_id, updates)
     
     def delete_user(self, user_id: str) -> bool:
@@ -116,10 +154,8 @@ class UserService:
         Returns:
             True if the user was deleted, False if not found
         """
-        if self.repository.get(user_id):
-            self.repository.delete(user_id)
-            return True
-        return False
+        invalidate(User, user_id)
+        return self.repository.delete_by_id(user_id) > 0
     
 
     
@@ -137,12 +173,14 @@ class UserService:
         if not user:
             return False
         # Import ici pour éviter les imports circulaires
+        from app import db
         from app.models.place import Place
-        place = Place.query.get(place_id)
+        place = db.session.get(Place, place_id)
         if not place:
             return False
         if place not in user.places:
             user.places.append(place)
+            invalidate(Place, place_id)
             return True
         return False
     
@@ -0,0 +1,35 @@
+"""Base test case of the tests running the app on an in-memory database."""
+
+import unittest
+from app import create_app, db
+from app.config import Config
+from app.services.facade import hbnb_facade as facade
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+
+class AppTestCase(unittest.TestCase):
+    """Builds a fresh app from ``config`` for every test and drops its tables afterwards.
+
+    Subclasses override ``config`` with a subclass of TestConfig to change a
+    setting, and fill the database after calling ``super().setUp()``.
+    """
+    config = TestConfig
+
+    def setUp(self):
+        self.app = create_app(self.config)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def create_user(self, email='owner@example.com', first_name='Place', last_name='Owner', **kwargs):
+        """Create a user through the facade, inside an app context; defaults to the place owner."""
+        kwargs.setdefault('password', 'hashed')
+        return facade.create_user(email=email, first_name=first_name, last_name=last_name, **kwargs)
@@ -0,0 +1,42 @@
+"""Helper counting the SQL statements sent to the database during a block."""
+
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import db
+
+
+class QueryCounter:
+    """Statements executed on every engine of ``db`` while the counter is active."""
+
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def selects(self):
+        return [s for s in self.statements if s.lstrip().upper().startswith('SELECT')]
+
+    def report(self) -> str:
+        """Return a readable summary, used in assertion messages."""
+        lines = [f"{len(self.statements)} statements, {len(self.selects)} SELECT"]
+        lines += [f"  {' '.join(s.split())[:120]}" for s in self.statements]
+        return '\n'.join(lines)
+
+
+@contextmanager
+def count_queries(app):
+    """Count the statements sent to the app's engines inside the block.
+    
+    Yields:
+        A QueryCounter filled as the statements run
+    """
+    counter = QueryCounter()
+    on_execute = lambda conn, cursor, statement, *args: counter.statements.append(statement)
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', on_execute)
+    try:
+        yield counter
+    finally:
+        for engine in engines:
+            event.remove(engine, 'before_cursor_execute', on_execute)
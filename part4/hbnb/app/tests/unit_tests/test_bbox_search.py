@@ -0,0 +1,105 @@
+from app import db
+from app.persistence.spatial_index import RTREE_TABLE
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase, TestConfig
+from app.tests.query_counter import count_queries
+
+
+class FallbackConfig(TestConfig):
+    USE_RTREE_INDEX = False
+
+
+POINTS = {
+    'Louvre': (48.8606, 2.3376),
+    'Notre-Dame': (48.8530, 2.3499),
+    'Versailles': (48.8049, 2.1204),
+    'London': (51.5074, -0.1278),
+    'Fiji': (-17.7134, 178.0650),
+    'Samoa': (-13.7590, -172.1046),
+}
+
+
+class BboxSearchMixin:
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            self.place_ids = {}
+            for title, (lat, lon) in POINTS.items():
+                self.place_ids[title] = facade.create_place(
+                    title=title, description='A place', price=50.0, latitude=lat,
+                    longitude=lon, owner_id=owner.id).id
+
+    def titles(self, query):
+        response = self.client.get(f'/api/v1/places/in_bbox?{query}')
+        self.assertEqual(response.status_code, 200, response.json)
+        return sorted(place['title'] for place in response.json)
+
+    def test_places_inside_rectangle(self):
+        self.assertEqual(self.titles('min_lat=48.8&min_lon=2.1&max_lat=48.9&max_lon=2.4'),
+                         ['Louvre', 'Notre-Dame', 'Versailles'])
+        self.assertEqual(self.titles('min_lat=48.85&min_lon=2.3&max_lat=48.9&max_lon=2.4'),
+                         ['Louvre', 'Notre-Dame'])
+
+    def test_rectangle_across_antimeridian(self):
+        self.assertEqual(self.titles('min_lat=-20&min_lon=170&max_lat=-10&max_lon=-170'),
+                         ['Fiji', 'Samoa'])
+
+    def test_pagination(self):
+        query = 'min_lat=40&min_lon=-10&max_lat=60&max_lon=10&limit=2'
+        response = self.client.get(f'/api/v1/places/in_bbox?{query}')
+        self.assertEqual(response.headers['X-Total-Count'], '4')
+        seen = [place['title'] for place in response.json]
+        cursor = response.headers['X-Next-Cursor']
+        response = self.client.get(f'/api/v1/places/in_bbox?{query}&cursor={cursor}')
+        seen += [place['title'] for place in response.json]
+        self.assertNotIn('X-Next-Cursor', response.headers)
+        self.assertEqual(sorted(seen), ['London', 'Louvre', 'Notre-Dame', 'Versailles'])
+
+    def test_index_follows_writes(self):
+        with self.app.app_context():
+            facade.place_service.update_place(self.place_ids['London'], latitude=48.86, longitude=2.35)
+            db.session.commit()
+        self.assertEqual(self.titles('min_lat=48.85&min_lon=2.3&max_lat=48.9&max_lon=2.4'),
+                         ['London', 'Louvre', 'Notre-Dame'])
+        with self.app.app_context():
+            facade.place_service.repository.delete(self.place_ids['Louvre'])
+            db.session.commit()
+        self.assertEqual(self.titles('min_lat=48.85&min_lon=2.3&max_lat=48.9&max_lon=2.4'),
+                         ['London', 'Notre-Dame'])
+
+    def test_invalid_rectangle(self):
+        for query in ('min_lat=49&min_lon=2&max_lat=48&max_lon=3', 'min_lat=48&min_lon=2&max_lat=95&max_lon=3',
+                      'min_lat=48&min_lon=-200&max_lat=49&max_lon=3', 'min_lat=48&min_lon=2&max_lat=49'):
+            response = self.client.get(f'/api/v1/places/in_bbox?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+
+class TestBboxWithRtree(BboxSearchMixin, AppTestCase):
+    def test_query_reads_the_rtree(self):
+        with self.app.app_context():
+            self.assertTrue(self.app.extensions['places_rtree'])
+            indexed = db.session.execute(db.text(f"SELECT count(*) FROM {RTREE_TABLE}")).scalar()
+            self.assertEqual(indexed, len(POINTS))
+            with count_queries(self.app) as queries:
+                facade.get_places_in_bbox_page(48.8, 2.1, 48.9, 2.4)
+        self.assertIn(RTREE_TABLE, queries.selects[0])
+
+    def test_rebuilt_when_out_of_sync(self):
+        with self.app.app_context():
+            db.session.execute(db.text(f"DELETE FROM {RTREE_TABLE}"))
+            db.session.commit()
+            from app.persistence import spatial_index
+            spatial_index.init_app(self.app)
+            indexed = db.session.execute(db.text(f"SELECT count(*) FROM {RTREE_TABLE}")).scalar()
+        self.assertEqual(indexed, len(POINTS))
+
+
+class TestBboxFallback(BboxSearchMixin, AppTestCase):
+    config = FallbackConfig
+
+    def test_query_uses_coordinates_index(self):
+        self.assertFalse(self.app.extensions['places_rtree'])
+        with self.app.app_context(), count_queries(self.app) as queries:
+            facade.get_places_in_bbox_page(48.8, 2.1, 48.9, 2.4)
+        self.assertNotIn(RTREE_TABLE, queries.selects[0])
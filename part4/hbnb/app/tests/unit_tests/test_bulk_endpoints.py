@@ -0,0 +1,116 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase
+from app.tests.query_counter import count_queries
+
+
+class TestBulkEndpoints(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            guest = self.create_user('guest@example.com', 'Guest', 'User')
+            admin = self.create_user('admin@example.com', 'Admin', 'User', is_admin=True)
+            self.owner_headers = {'Authorization': f'Bearer {create_access_token(identity=owner.id)}'}
+            self.guest_headers = {'Authorization': f'Bearer {create_access_token(identity=guest.id)}'}
+            self.admin_headers = {'Authorization': f'Bearer {create_access_token(identity=admin.id)}'}
+
+    def place(self, i, **overrides):
+        data = {'title': f'Place {i}', 'description': 'A place', 'price': 50.0,
+                'latitude': 10.0, 'longitude': 20.0}
+        data.update(overrides)
+        return data
+
+    def test_bulk_create_places(self):
+        response = self.client.post('/api/v1/places/bulk', headers=self.owner_headers,
+                                    json=[self.place(i) for i in range(3)])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([p['title'] for p in response.json], ['Place 0', 'Place 1', 'Place 2'])
+        with self.app.app_context():
+            self.assertEqual(Place.query.count(), 3)
+
+    def test_bulk_create_places_reports_every_invalid_item(self):
+        response = self.client.post('/api/v1/places/bulk', headers=self.owner_headers, json=[
+            self.place(0),
+            self.place(1, price='cheap'),
+            self.place(2, latitude=120.0),
+            self.place(3, amenities=['missing-amenity'])
+        ])
+        # Erreurs de schéma et erreurs métier dans la même réponse
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e['index'] for e in response.json['errors']], [1, 2, 3])
+        with self.app.app_context():
+            self.assertEqual(Place.query.count(), 0)
+
+    def test_bulk_create_reviews(self):
+        places = self.client.post('/api/v1/places/bulk', headers=self.owner_headers,
+                                  json=[self.place(i) for i in range(2)]).json
+        reviews = [{'text': 'Great', 'rating': 5, 'place_id': p['id']} for p in places]
+
+        response = self.client.post('/api/v1/reviews/bulk', headers=self.owner_headers, json=reviews)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(len(response.json['errors']), 2)
+
+        response = self.client.post('/api/v1/reviews/bulk', headers=self.guest_headers,
+                                    json=reviews + reviews[:1])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e['index'] for e in response.json['errors']], [2])
+
+        response = self.client.post('/api/v1/reviews/bulk', headers=self.guest_headers, json=reviews)
+        self.assertEqual(response.status_code, 201)
+        with self.app.app_context():
+            self.assertEqual(Review.query.count(), 2)
+
+    def test_bulk_create_amenities(self):
+        response = self.client.post('/api/v1/amenities/bulk', headers=self.guest_headers,
+                                    json=[{'name': 'WiFi'}])
+        self.assertEqual(response.status_code, 403)
+
+        response = self.client.post('/api/v1/amenities/bulk', headers=self.admin_headers,
+                                    json=[{'name': 'WiFi'}, {'name': 'Pool'}, {'name': 'WiFi'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e['index'] for e in response.json['errors']], [2])
+
+        response = self.client.post('/api/v1/amenities/bulk', headers=self.admin_headers,
+                                    json=[{'name': 'WiFi'}, {'name': 'Pool'}])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json), 2)
+
+    def test_bulk_create_amenities_reports_every_invalid_item(self):
+        with self.app.app_context():
+            facade.create_amenity({'name': 'WiFi'})
+            facade.create_amenity({'name': 'Sauna'})
+        with count_queries(self.app) as counter:
+            response = self.client.post('/api/v1/amenities/bulk', headers=self.admin_headers, json=[
+                {'name': 'WiFi'}, {'title': 'Pool'}, {'name': ''}, {'name': 'Pool'}, {'name': 'Pool'}
+            ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([e['index'] for e in response.json['errors']], [0, 1, 2, 4])
+        # Seuls les noms du lot sont cherchés, pas toute la table
+        name_lookups = [s for s in counter.selects if 'amenities.name IN' in s]
+        self.assertEqual(len(name_lookups), 1)
+        self.assertEqual(len([s for s in counter.selects if 'FROM amenities' in s]), 1)
+        with self.app.app_context():
+            self.assertEqual(Amenity.query.count(), 2)
+
+    def test_item_level_errors_have_no_field_prefix(self):
+        response = self.client.post('/api/v1/amenities/bulk', headers=self.admin_headers,
+                                    json=[{'name': 'Pool'}, 'Sauna'])
+        self.assertEqual(response.status_code, 400)
+        error, = response.json['errors']
+        self.assertEqual(error['index'], 1)
+        self.assertFalse(error['message'].startswith(':'), error['message'])
+        self.assertIn("'Sauna'", error['message'])
+
+    def test_bulk_payload_must_be_a_list(self):
+        response = self.client.post('/api/v1/amenities/bulk', headers=self.admin_headers,
+                                    json={'name': 'WiFi'})
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
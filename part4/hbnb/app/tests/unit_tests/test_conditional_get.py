@@ -0,0 +1,161 @@
+import os
+import time
+import unittest
+from datetime import datetime, timezone
+from flask_jwt_extended import create_access_token
+from werkzeug.http import parse_date
+from app.persistence.unit_of_work import unit_of_work
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase
+from app.tests.query_counter import count_queries
+
+
+class TestConditionalGet(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            guest = self.create_user('guest@example.com', 'Guest', 'User')
+            amenity = facade.create_amenity({'name': 'Wifi'})
+            place = facade.create_place(title='Loft', description='A place', price=90.0,
+                                        latitude=10.0, longitude=20.0, owner_id=owner.id,
+                                        amenities=[amenity.id])
+            review = facade.create_review(text='Nice', rating=4, place_id=place.id, user_id=guest.id)
+            self.owner_id, self.guest_id = owner.id, guest.id
+            self.place_id, self.amenity_id, self.review_id = place.id, amenity.id, review.id
+            self.guest_headers = {'Authorization': f'Bearer {create_access_token(identity=guest.id)}'}
+
+    def revalidate(self, url, response):
+        """GET url again with the ETag of response, return (response, SELECT count)."""
+        with count_queries(self.app) as counter:
+            again = self.client.get(url, headers={'If-None-Match': response.headers['ETag']})
+        return again, len(counter.selects)
+
+    def test_detail_documents_have_weak_validators(self):
+        for url in (f'/api/v1/places/{self.place_id}', f'/api/v1/users/{self.owner_id}',
+                    f'/api/v1/amenities/{self.amenity_id}', f'/api/v1/reviews/{self.review_id}'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            self.assertTrue(response.headers['ETag'].startswith('W/"'), url)
+            self.assertIn('Last-Modified', response.headers)
+            again, _ = self.revalidate(url, response)
+            self.assertEqual(again.status_code, 304, url)
+            self.assertEqual(again.get_data(), b'')
+            self.assertEqual(again.headers['ETag'], response.headers['ETag'])
+
+    def test_place_not_modified_does_not_load_the_document(self):
+        url = f'/api/v1/places/{self.place_id}'
+        response = self.client.get(url)
+        again, selects = self.revalidate(url, response)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(selects, 1)
+
+    def test_if_modified_since(self):
+        url = f'/api/v1/places/{self.place_id}'
+        response = self.client.get(url)
+        again = self.client.get(url, headers={'If-Modified-Since': response.headers['Last-Modified']})
+        self.assertEqual(again.status_code, 304)
+        again = self.client.get(url, headers={'If-Modified-Since': 'Sat, 01 Jan 2000 00:00:00 GMT'})
+        self.assertEqual(again.status_code, 200)
+        # If-None-Match l'emporte sur If-Modified-Since
+        again = self.client.get(url, headers={'If-None-Match': 'W/"other"',
+                                              'If-Modified-Since': response.headers['Last-Modified']})
+        self.assertEqual(again.status_code, 200)
+
+    def test_last_modified_is_not_in_the_future(self):
+        response = self.client.get(f'/api/v1/places/{self.place_id}')
+        self.assertLessEqual(parse_date(response.headers['Last-Modified']), datetime.now(timezone.utc))
+
+    def test_place_etag_follows_embedded_rows(self):
+        url = f'/api/v1/places/{self.place_id}'
+        changes = (
+            lambda: facade.update_user(self.owner_id, first_name='Renamed'),
+            lambda: facade.update_amenity(self.amenity_id, name='Fibre'),
+            lambda: facade.place_service.update_place(self.place_id, amenities=[]),
+            lambda: facade.place_service.update_place(self.place_id, price=120.0),
+        )
+        for change in changes:
+            response = self.client.get(url)
+            with self.app.app_context(), unit_of_work():
+                change()
+            again, _ = self.revalidate(url, response)
+            self.assertEqual(again.status_code, 200)
+            self.assertNotEqual(again.headers['ETag'], response.headers['ETag'])
+
+    def test_review_aggregates_change_the_place_etag(self):
+        other = self.client.get(f'/api/v1/places/{self.place_id}')
+        with self.app.app_context():
+            user = self.create_user('third@example.com', 'Third', 'User')
+            facade.create_review(text='Good', rating=5, place_id=self.place_id, user_id=user.id)
+        again, _ = self.revalidate(f'/api/v1/places/{self.place_id}', other)
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.json['review_count'], 2)
+
+    def test_collections(self):
+        for url in ('/api/v1/places/', '/api/v1/amenities/', '/api/v1/reviews/', '/api/v1/users/',
+                    f'/api/v1/reviews/places/{self.place_id}/reviews',
+                    '/api/v1/places/nearby?lat=10&lon=20&radius_km=5'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            again, _ = self.revalidate(url, response)
+            self.assertEqual(again.status_code, 304, url)
+
+    def test_collection_etag_changes_with_writes_and_arguments(self):
+        response = self.client.get('/api/v1/amenities/')
+        other_page = self.client.get('/api/v1/amenities/?limit=1')
+        self.assertNotEqual(other_page.headers['ETag'], response.headers['ETag'])
+        with self.app.app_context():
+            facade.create_amenity({'name': 'Pool'})
+        again, _ = self.revalidate('/api/v1/amenities/', response)
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(len(again.json['amenities']), 2)
+
+    def test_updates_change_the_collection_etag(self):
+        with self.app.app_context():
+            facade.create_place(title='Studio', description='Another place', price=50.0,
+                                latitude=11.0, longitude=21.0, owner_id=self.owner_id)
+        response = self.client.get('/api/v1/places/')
+        # La place mise à jour n'est pas la plus récente
+        with self.app.app_context(), unit_of_work():
+            facade.place_service.update_place(self.place_id, price=120.0)
+        again, _ = self.revalidate('/api/v1/places/', response)
+        self.assertEqual(again.status_code, 200)
+        self.assertNotEqual(again.headers['ETag'], response.headers['ETag'])
+
+    def test_deletes_change_the_collection_etag(self):
+        url = f'/api/v1/reviews/places/{self.place_id}/reviews'
+        response = self.client.get(url)
+        deleted = self.client.delete(f'/api/v1/reviews/{self.review_id}', headers=self.guest_headers)
+        self.assertEqual(deleted.status_code, 200, deleted.json)
+        again, _ = self.revalidate(url, response)
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.json, [])
+
+    def test_missing_rows_have_no_validators(self):
+        response = self.client.get('/api/v1/places/missing', headers={'If-None-Match': '*'})
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response.headers)
+
+
+@unittest.skipUnless(hasattr(time, 'tzset'), "time.tzset is needed to change the time zone")
+class TestConditionalGetOutsideUTC(TestConditionalGet):
+    """Same tests on a server whose local time is ahead of UTC."""
+
+    def setUp(self):
+        previous = os.environ.get('TZ')
+        os.environ['TZ'] = 'Asia/Tokyo'
+        time.tzset()
+        self.addCleanup(self.restore_time_zone, previous)
+        super().setUp()
+
+    @staticmethod
+    def restore_time_zone(previous):
+        if previous is None:
+            os.environ.pop('TZ', None)
+        else:
+            os.environ['TZ'] = previous
+        time.tzset()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.config import Config, ProductionConfig, database_url
+
+
+class TestProductionConfig(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+        class TestConfig(ProductionConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(self.tmpdir.name, 'prod.db')
+
+        self.app = create_app(TestConfig)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_debug_is_off(self):
+        self.assertFalse(self.app.debug)
+        self.assertFalse(self.app.config['DEBUG'])
+
+    def test_engine_options_are_applied(self):
+        with self.app.app_context():
+            pool = db.engine.pool
+            self.assertEqual(pool.size(), ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS['pool_size'])
+            self.assertEqual(pool._max_overflow, ProductionConfig.SQLALCHEMY_ENGINE_OPTIONS['max_overflow'])
+            self.assertTrue(pool._pre_ping)
+
+    def test_config_debug_is_not_forced(self):
+        class TestConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite://'
+
+        self.assertFalse(create_app(TestConfig).debug)
+
+
+class TestDatabaseUrl(unittest.TestCase):
+    def test_default_without_env(self):
+        with mock.patch.dict(os.environ, clear=True):
+            self.assertEqual(database_url('sqlite:///x.db'), 'sqlite:///x.db')
+
+    def test_postgres_scheme_is_rewritten(self):
+        with mock.patch.dict(os.environ, {'DATABASE_URL': 'postgres://u:p@db/hbnb'}):
+            self.assertEqual(database_url('sqlite:///x.db'), 'postgresql://u:p@db/hbnb')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from unittest import mock
+from app.api.v1 import places
+from app.api.v1.document_cache import ByteBudgetCache
+from app.persistence.unit_of_work import unit_of_work
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase, TestConfig
+from app.tests.query_counter import count_queries
+
+
+class DisabledConfig(TestConfig):
+    PLACE_DOCUMENT_CACHE_BYTES = 0
+
+
+class TestByteBudgetCache(unittest.TestCase):
+    def test_versions_must_match(self):
+        cache = ByteBudgetCache(max_bytes=100)
+        cache.set('a', 1, b'old')
+        self.assertEqual(cache.get('a', 1), b'old')
+        self.assertIsNone(cache.get('a', 2))
+        cache.set('a', 2, b'newer')
+        self.assertIsNone(cache.get('a', 1))
+        self.assertEqual(cache.stats()['bytes'], 5)
+
+    def test_byte_budget(self):
+        cache = ByteBudgetCache(max_bytes=10)
+        cache.set('a', 1, b'1234')
+        cache.set('b', 1, b'1234')
+        cache.get('a', 1)
+        cache.set('c', 1, b'1234')
+        self.assertIsNone(cache.get('b', 1))
+        self.assertEqual(cache.get('a', 1), b'1234')
+        cache.set('d', 1, b'x' * 11)
+        self.assertIsNone(cache.get('d', 1))
+        stats = cache.stats()
+        self.assertEqual((stats['size'], stats['bytes'], stats['evictions']), (2, 8, 1))
+
+
+class TestPlaceDocumentCache(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            amenity = facade.create_amenity({'name': 'Wifi'})
+            place = facade.create_place(title='Loft', description='A place', price=90.0,
+                                        latitude=10.0, longitude=20.0, owner_id=owner.id,
+                                        amenities=[amenity.id])
+            self.owner_id, self.amenity_id, self.place_id = owner.id, amenity.id, place.id
+        self.url = f'/api/v1/places/{self.place_id}'
+
+    def get(self):
+        """GET the place document, return (response, SELECT count, format calls)."""
+        with mock.patch.object(places, 'format_place_response',
+                               wraps=places.format_place_response) as formatter, \
+                count_queries(self.app) as counter:
+            response = self.client.get(self.url)
+        return response, len(counter.selects), formatter.call_count
+
+    def test_hit_returns_the_same_bytes_without_serializing(self):
+        first, _, formatted = self.get()
+        self.assertEqual(formatted, 1)
+        second, selects, formatted = self.get()
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.mimetype, 'application/json')
+        self.assertEqual(second.headers['ETag'], first.headers['ETag'])
+        self.assertEqual(formatted, 0)
+        # Seulement la requête des versions, partagée avec l'ETag
+        self.assertEqual(selects, 1)
+
+    def test_versions_follow_the_embedded_rows(self):
+        changes = (
+            (lambda: facade.update_user(self.owner_id, first_name='Renamed'),
+             lambda doc: doc['owner']['first_name'] == 'Renamed'),
+            (lambda: facade.update_amenity(self.amenity_id, name='Fibre'),
+             lambda doc: doc['amenities'][0]['name'] == 'Fibre'),
+            (lambda: facade.place_service.update_place(self.place_id, amenities=[]),
+             lambda doc: doc['amenities'] == []),
+            (lambda: facade.place_service.update_place(self.place_id, title='Studio'),
+             lambda doc: doc['title'] == 'Studio'),
+        )
+        for change, check in changes:
+            self.get()
+            with self.app.app_context(), unit_of_work():
+                change()
+            response, _, formatted = self.get()
+            self.assertEqual(formatted, 1)
+            self.assertTrue(check(response.json), response.json)
+
+    def test_missing_place_is_not_cached(self):
+        self.url = '/api/v1/places/missing'
+        for _ in range(2):
+            response, _, _ = self.get()
+            self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.app.extensions['document_cache'].stats()['size'], 0)
+
+
+class TestPlaceDocumentCacheDisabled(TestPlaceDocumentCache):
+    config = DisabledConfig
+
+    def test_hit_returns_the_same_bytes_without_serializing(self):
+        self.get()
+        _, _, formatted = self.get()
+        self.assertEqual(formatted, 1)
+        self.assertNotIn('document_cache', self.app.extensions)
+
+    def test_missing_place_is_not_cached(self):
+        self.assertNotIn('document_cache', self.app.extensions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import db
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase, TestConfig
+
+
+class EagerConfig(TestConfig):
+    RAISE_ON_LAZY_LOAD = True
+
+
+class TestEagerLoading(AppTestCase):
+    """Les endpoints doivent charger d'avance ce qu'ils sérialisent"""
+    config = EagerConfig
+
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            guest = self.create_user('guest@example.com', 'Guest', 'User')
+            self.amenity_ids = [facade.create_amenity({'name': f'Amenity {i}'}).id for i in range(5)]
+            place = facade.create_place(title='Loft', description='A place', price=90.0,
+                                        latitude=10.0, longitude=20.0, owner_id=owner.id,
+                                        amenities=self.amenity_ids[:2])
+            facade.create_review(text='Nice', rating=5, place_id=place.id, user_id=guest.id)
+            self.place_id = place.id
+            self.token = create_access_token(identity=owner.id)
+
+    def count_selects(self, call):
+        statements = []
+        on_execute = lambda *args: statements.append(args[2])
+        with self.app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', on_execute)
+            try:
+                response = call()
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', on_execute)
+        return response, len([s for s in statements if s.lstrip().startswith('SELECT')])
+
+    def test_place_detail(self):
+        response, selects = self.count_selects(
+            lambda: self.client.get(f'/api/v1/places/{self.place_id}'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['owner']['email'], 'owner@example.com')
+        self.assertEqual(len(response.json['amenities']), 2)
+        # Versions pour l'ETag, place + propriétaire en jointure, puis les équipements
+        self.assertEqual(selects, 3)
+
+    def test_place_detail_query_count_does_not_grow(self):
+        with self.app.app_context():
+            facade.place_service.update_place(self.place_id, amenities=self.amenity_ids)
+        response, selects = self.count_selects(
+            lambda: self.client.get(f'/api/v1/places/{self.place_id}'))
+        self.assertEqual(len(response.json['amenities']), 5)
+        self.assertEqual(selects, 3)
+
+    def test_place_list(self):
+        response = self.client.get('/api/v1/places/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['title'] for p in response.json], ['Loft'])
+
+    def test_update_amenities(self):
+        response = self.client.put(f'/api/v1/places/{self.place_id}',
+                                   json={'amenities': self.amenity_ids[1:3]},
+                                   headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response.status_code, 200)
+        detail = self.client.get(f'/api/v1/places/{self.place_id}').json
+        self.assertEqual(sorted(a['id'] for a in detail['amenities']), sorted(self.amenity_ids[1:3]))
+
+    def test_place_reviews(self):
+        response = self.client.get(f'/api/v1/reviews/places/{self.place_id}/reviews')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json), 1)
+
+    def test_lazy_load_raises(self):
+        with self.app.app_context():
+            place = facade.get_place(self.place_id)
+            with self.assertRaises(Exception):
+                list(place.amenities)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import unittest
+from app import db
+from app.persistence.unit_of_work import unit_of_work
+from app.services.entity_cache import LRUCache, MISSING, NullCache
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase, TestConfig
+from app.tests.query_counter import count_queries
+
+
+class NoCacheConfig(TestConfig):
+    ENTITY_CACHE = 'none'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2, ttl_seconds=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('c', 3)
+        self.assertIs(cache.get('b'), MISSING)
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+        self.assertEqual(cache.stats(), {'size': 2, 'max_entries': 2, 'hits': 3, 'misses': 1,
+                                         'evictions': 1, 'expirations': 0})
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = LRUCache(max_entries=10, ttl_seconds=5, clock=clock)
+        cache.set('a', 1)
+        clock.now = 4.9
+        self.assertEqual(cache.get('a'), 1)
+        clock.now = 5.0
+        self.assertIs(cache.get('a'), MISSING)
+        self.assertEqual(cache.stats()['expirations'], 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_delete_prefix(self):
+        cache = LRUCache()
+        cache.set(('places', '1'), 1)
+        cache.set(('places', '2'), 2)
+        cache.set(('users', '1'), 3)
+        cache.delete_prefix('places')
+        self.assertEqual(len(cache), 1)
+
+    def test_null_cache(self):
+        cache = NullCache()
+        cache.set('a', 1)
+        self.assertIs(cache.get('a'), MISSING)
+
+
+class TestEntityCache(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            guest = self.create_user('guest@example.com', 'Guest', 'User')
+            place = facade.create_place(title='Loft', description='A place', price=90.0,
+                                        latitude=10.0, longitude=20.0, owner_id=owner.id)
+            amenity = facade.create_amenity({'name': 'Wifi'})
+            self.owner_id, self.guest_id = owner.id, guest.id
+            self.place_id, self.amenity_id = place.id, amenity.id
+
+    def lookup(self, getter, obj_id):
+        """Look an object up in a fresh unit of work, return (object attributes, SELECT count)."""
+        with self.app.app_context(), count_queries(self.app) as counter:
+            with unit_of_work():
+                obj = getter(obj_id)
+                values = None if obj is None else dict(vars(obj))
+        return values, len(counter.selects)
+
+    def test_hits_do_not_query(self):
+        for getter, obj_id in ((facade.get_user, self.owner_id), (facade.get_place, self.place_id),
+                               (facade.get_amenity, self.amenity_id)):
+            self.lookup(getter, obj_id)
+            values, selects = self.lookup(getter, obj_id)
+            self.assertEqual(selects, 0)
+            self.assertEqual(values['id'], obj_id)
+        with self.app.app_context():
+            stats = facade.get_entity_cache_stats()
+        self.assertEqual(stats['hits'], 3)
+        self.assertEqual(stats['size'], 3)
+
+    def test_hit_is_attached_to_the_session(self):
+        self.lookup(facade.get_place, self.place_id)
+        with self.app.app_context(), unit_of_work():
+            place = facade.get_place(self.place_id)
+            self.assertIn(place, db.session)
+            # Les relations se chargent normalement
+            self.assertEqual(place.user.id, self.owner_id)
+            place.title = 'Renamed'
+        with self.app.app_context():
+            self.assertEqual(facade.place_service.repository.get(self.place_id).title, 'Renamed')
+
+    def test_updates_invalidate(self):
+        self.lookup(facade.get_user, self.owner_id)
+        self.lookup(facade.get_amenity, self.amenity_id)
+        self.lookup(facade.get_place, self.place_id)
+        with self.app.app_context(), unit_of_work():
+            facade.update_user(self.owner_id, first_name='Renamed')
+            facade.update_amenity(self.amenity_id, name='Fibre')
+            facade.place_service.update_place(self.place_id, price=120.0)
+        self.assertEqual(self.lookup(facade.get_user, self.owner_id)[0]['first_name'], 'Renamed')
+        self.assertEqual(self.lookup(facade.get_amenity, self.amenity_id)[0]['name'], 'Fibre')
+        self.assertEqual(self.lookup(facade.get_place, self.place_id)[0]['price'], 120.0)
+
+    def test_review_aggregates_invalidate_the_place(self):
+        self.lookup(facade.get_place, self.place_id)
+        with self.app.app_context(), unit_of_work():
+            facade.create_review(text='Nice', rating=4, place_id=self.place_id, user_id=self.guest_id)
+        values, _ = self.lookup(facade.get_place, self.place_id)
+        self.assertEqual((values['review_count'], values['rating_sum']), (1, 4))
+
+    def test_deletes_invalidate(self):
+        self.lookup(facade.get_amenity, self.amenity_id)
+        with self.app.app_context(), unit_of_work():
+            facade.amenity_service.delete_amenity(self.amenity_id)
+        self.assertEqual(self.lookup(facade.get_amenity, self.amenity_id), (None, 1))
+
+    def test_uncommitted_changes_are_not_cached(self):
+        with self.app.app_context():
+            with self.assertRaises(RuntimeError), unit_of_work():
+                facade.update_amenity(self.amenity_id, name='Fibre')
+                facade.get_amenity(self.amenity_id)
+                raise RuntimeError
+        self.assertEqual(self.lookup(facade.get_amenity, self.amenity_id)[0]['name'], 'Wifi')
+
+    def test_lru_bounded(self):
+        self.app.config['ENTITY_CACHE_MAX_ENTRIES'] = 1
+        self.app.extensions.pop('entity_cache', None)
+        self.lookup(facade.get_user, self.owner_id)
+        self.lookup(facade.get_user, self.guest_id)
+        self.assertEqual(self.lookup(facade.get_user, self.owner_id)[1], 1)
+        with self.app.app_context():
+            self.assertEqual(facade.get_entity_cache_stats()['evictions'], 2)
+
+
+class TestEntityCacheDisabled(AppTestCase):
+    config = NoCacheConfig
+
+    def test_every_lookup_queries(self):
+        with self.app.app_context():
+            user_id = self.create_user().id
+            for _ in range(2):
+                with count_queries(self.app) as counter, unit_of_work():
+                    facade.get_user(user_id)
+                self.assertEqual(len(counter.selects), 1)
+            self.assertEqual(facade.get_entity_cache_stats(), {})
@@ -0,0 +1,83 @@
+import gzip
+import os
+import re
+import tempfile
+import unittest
+from app.frontend import IMMUTABLE, REVALIDATE, brotli, build_assets
+from app.tests.base import AppTestCase
+
+
+class TestFrontend(AppTestCase):
+    def shell_references(self, page):
+        """Script, stylesheet and image references of an HTML shell."""
+        html = self.client.get(f'/app/{page}').get_data(as_text=True)
+        return re.findall(r'(?:src|href)="([^"]+\.(?:css|js|png))"', html)
+
+    def test_shells_use_fingerprinted_assets(self):
+        references = self.shell_references('index.html')
+        self.assertIn('style.css', [re.sub(r'\.[0-9a-f]{12}\.', '.', r) for r in references])
+        for reference in references:
+            self.assertRegex(reference, r'\.[0-9a-f]{12}\.(css|js|png)$')
+            response = self.client.get(f'/app/{reference}')
+            self.assertEqual(response.status_code, 200, reference)
+            self.assertEqual(response.headers['Cache-Control'], IMMUTABLE)
+
+    def test_shells_are_revalidated(self):
+        response = self.client.get('/app/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/html')
+        self.assertEqual(response.headers['Cache-Control'], REVALIDATE)
+        again = self.client.get('/app/index.html', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.get_data(), b'')
+
+    def test_precompressed_variants(self):
+        plain = self.client.get('/app/script.js')
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertEqual(plain.headers['Vary'], 'Accept-Encoding')
+        compressed = self.client.get('/app/script.js', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(compressed.headers['Content-Encoding'], 'gzip')
+        self.assertLess(len(compressed.get_data()), len(plain.get_data()))
+        self.assertEqual(gzip.decompress(compressed.get_data()), plain.get_data())
+        self.assertNotEqual(compressed.headers['ETag'], plain.headers['ETag'])
+        # Les PNG sont déjà compressés
+        image = self.client.get('/app/images/logo.png', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', image.headers)
+
+    @unittest.skipIf(brotli is None, 'brotli is not installed')
+    def test_brotli_is_preferred(self):
+        response = self.client.get('/app/style.css', headers={'Accept-Encoding': 'gzip, br'})
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+
+    def test_only_frontend_files_are_served(self):
+        for path in ('run.py', 'config.py', 'README.md', 'requirements.txt', 'app/config.py',
+                     'instance/create_tables.sql', '../run.py', 'missing.js'):
+            self.assertEqual(self.client.get(f'/app/{path}').status_code, 404, path)
+        # La documentation de l'API garde /
+        self.assertEqual(self.client.get('/').status_code, 200)
+
+
+class TestBuildAssets(unittest.TestCase):
+    def build(self, css):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'style.css'), 'w') as f:
+                f.write(css)
+            with open(os.path.join(directory, 'index.html'), 'w') as f:
+                f.write('<link rel="stylesheet" href="style.css"><a href="login.html">Login</a>')
+            with open(os.path.join(directory, 'notes.txt'), 'w') as f:
+                f.write('not served')
+            return build_assets(directory)
+
+    def test_new_content_gets_a_new_name(self):
+        first, second = self.build('body { color: red; }'), self.build('body { color: blue; }')
+        names = lambda assets: {name for name in assets if name.startswith('style.') and name != 'style.css'}
+        self.assertEqual(len(names(first)), 1)
+        self.assertNotEqual(names(first), names(second))
+        self.assertNotIn('notes.txt', first)
+        html = first['index.html'].variants['identity'].decode()
+        self.assertIn(f'href="{names(first).pop()}"', html)
+        self.assertIn('href="login.html"', html)
+
+
+if __name__ == '__main__':
+    unittest.main()
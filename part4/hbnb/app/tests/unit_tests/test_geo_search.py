@@ -0,0 +1,169 @@
+import math
+import os
+import sqlite3
+import tempfile
+import unittest
+import sqlalchemy as sa
+from app import create_app, db
+from app.models import geo
+from app.models.place import Place
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase, TestConfig
+from app.tests.query_counter import count_queries
+
+
+class TestGeohash(unittest.TestCase):
+    def test_encode_known_value(self):
+        self.assertEqual(geo.encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+
+    def test_covering_cells_contain_the_circle(self):
+        for lat, lon, radius in ((48.8566, 2.3522, 3), (0.0, 179.99, 20), (-33.9, 18.4, 150)):
+            cells = geo.covering_cells(lat, lon, radius)
+            self.assertLessEqual(len(cells), 9)
+            lat_radius, lon_radius = geo.radius_in_degrees(lat, radius)
+            for dlat in (-lat_radius, 0, lat_radius):
+                for dlon in (-lon_radius, 0, lon_radius):
+                    point_lon = (lon + dlon + 180) % 360 - 180
+                    point = geo.encode(lat + dlat, point_lon)
+                    self.assertTrue(any(point.startswith(cell) for cell in cells),
+                                    (lat, lon, radius, dlat, dlon))
+
+    def test_latitude_extent_covers_the_radius(self):
+        for lat in (0.0, 45.0, -60.0):
+            for radius in (0.5, 5, 250):
+                lat_radius, _ = geo.radius_in_degrees(lat, radius)
+                self.assertGreaterEqual(geo.haversine_km(lat, 0.0, lat + lat_radius, 0.0), radius - 1e-9)
+
+    def test_haversine(self):
+        # Paris - Londres : ~343,5 km
+        self.assertAlmostEqual(geo.haversine_km(48.8566, 2.3522, 51.5074, -0.1278), 343.5, delta=1)
+
+
+class TestNearbyPlaces(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            self.owner_id = owner.id
+            points = {
+                'Louvre': (48.8606, 2.3376),
+                'Notre-Dame': (48.8530, 2.3499),
+                'Versailles': (48.8049, 2.1204),
+                'London': (51.5074, -0.1278),
+            }
+            self.place_ids = {}
+            for title, (lat, lon) in points.items():
+                self.place_ids[title] = facade.create_place(
+                    title=title, description='A place', price=50.0, latitude=lat,
+                    longitude=lon, owner_id=owner.id).id
+
+    def test_geohash_follows_coordinates(self):
+        with self.app.app_context():
+            place = db.session.get(Place, self.place_ids['London'])
+            self.assertEqual(place.geohash, geo.encode(51.5074, -0.1278))
+            facade.place_service.update_place(place.id, latitude=40.7128, longitude=-74.0060)
+            self.assertEqual(place.geohash, geo.encode(40.7128, -74.0060))
+
+    def test_nearby_sorted_by_distance(self):
+        response = self.client.get('/api/v1/places/nearby?lat=48.8566&lon=2.3522&radius_km=5')
+        self.assertEqual(response.status_code, 200)
+        titles = [place['title'] for place in response.json]
+        self.assertEqual(titles, ['Notre-Dame', 'Louvre'])
+        distances = [place['distance_km'] for place in response.json]
+        self.assertEqual(distances, sorted(distances))
+
+        response = self.client.get('/api/v1/places/nearby?lat=48.8566&lon=2.3522&radius_km=30&limit=2')
+        self.assertEqual([place['title'] for place in response.json], ['Notre-Dame', 'Louvre'])
+        response = self.client.get('/api/v1/places/nearby?lat=48.8566&lon=2.3522&radius_km=30')
+        self.assertEqual(len(response.json), 3)
+
+    def test_nearby_keeps_places_on_the_north_south_edge(self):
+        # 4,997 km plein nord et plein sud du centre, dans un rayon de 5 km
+        lat = math.degrees(4.997 / geo.EARTH_RADIUS_KM)
+        with self.app.app_context():
+            for title, latitude in (('North', lat), ('South', -lat)):
+                facade.create_place(title=title, description='A place', price=50.0,
+                                    latitude=latitude, longitude=0.0, owner_id=self.owner_id)
+        response = self.client.get('/api/v1/places/nearby?lat=0&lon=0&radius_km=5')
+        self.assertEqual(sorted(place['title'] for place in response.json), ['North', 'South'])
+
+    def test_nearby_uses_geohash_ranges(self):
+        with self.app.app_context(), count_queries(self.app) as queries:
+            matches = facade.get_nearby_places(48.8566, 2.3522, 5, 10, 500)
+        self.assertEqual(len(matches), 2)
+        self.assertEqual(len(queries.selects), 1, queries.report())
+        self.assertIn('places.geohash >=', queries.selects[0])
+
+    def test_invalid_arguments(self):
+        for query in ('lat=48.8&lon=2.3&radius_km=0', 'lat=48.8&lon=2.3&radius_km=501',
+                      'lat=91&lon=2.3', 'lat=48.8&lon=2.3&limit=0', 'lon=2.3'):
+            response = self.client.get(f'/api/v1/places/nearby?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_backfill_legacy_rows(self):
+        with self.app.app_context():
+            db.session.execute(db.update(Place).values(geohash=None))
+            db.session.commit()
+            self.assertEqual(facade.get_nearby_places(48.8566, 2.3522, 5, 10, 500), [])
+            self.assertEqual(facade.fill_missing_geohashes(), 4)
+            self.assertEqual(len(facade.get_nearby_places(48.8566, 2.3522, 5, 10, 500)), 2)
+
+
+class TestBackfillExistingDatabase(unittest.TestCase):
+    """backfill-geohash sur une base créée avant les colonnes geohash et agrégats"""
+
+    # Table places d'origine, sans geohash ni agrégats des avis
+    LEGACY_COLUMNS = ('id', 'title', 'description', 'price', 'latitude', 'longitude',
+                      'owner_id', 'created_at', 'updated_at')
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, 'legacy.db')
+        with sqlite3.connect(path) as connection:
+            connection.execute(
+                "CREATE TABLE places (id CHAR(36) PRIMARY KEY, title VARCHAR(255) NOT NULL, "
+                "description TEXT NOT NULL, price DECIMAL(10,2) NOT NULL, latitude FLOAT NOT NULL, "
+                "longitude FLOAT NOT NULL, owner_id CHAR(36) NOT NULL, created_at TIMESTAMP, "
+                "updated_at TIMESTAMP, FOREIGN KEY (owner_id) REFERENCES users(id))")
+        connection.close()
+
+        class LegacyConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + path
+
+        self.app = create_app(LegacyConfig)
+        with self.app.app_context():
+            owner = facade.create_user(email='owner@example.com', first_name='Place',
+                                       last_name='Owner', password='hashed')
+            legacy_places = sa.table('places', *(sa.column(c.name, c.type) for c in Place.__table__.c
+                                                 if c.name in self.LEGACY_COLUMNS))
+            place = Place(title='Louvre', description='A place', price=50.0,
+                          latitude=48.8606, longitude=2.3376, owner_id=owner.id)
+            db.session.execute(sa.insert(legacy_places).values(
+                **{name: getattr(place, name) for name in self.LEGACY_COLUMNS}))
+            db.session.commit()
+            self.place_id = place.id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_command_adds_the_missing_columns(self):
+        runner = self.app.test_cli_runner()
+        with self.app.app_context():
+            result = runner.invoke(args=['backfill-geohash'])
+            self.assertIsNone(result.exception, result.output)
+            self.assertIn('places.geohash', result.output)
+            self.assertIn('Geohash computed for 1 places', result.output)
+            place = facade.get_place(self.place_id)
+            self.assertEqual(place.geohash, geo.encode(48.8606, 2.3376, len(place.geohash)))
+            self.assertEqual(place.review_count, 0)
+            indexes = {index['name'] for index in sa.inspect(db.engine).get_indexes('places')}
+            self.assertEqual(indexes, {index.name for index in Place.__table__.indexes})
+            self.assertIn('ix_places_created_at_id', result.output)
+            # Une seconde exécution ne touche plus au schéma
+            result = runner.invoke(args=['backfill-geohash'])
+            self.assertNotIn('Columns added', result.output)
+            self.assertNotIn('Indexes created', result.output)
+            self.assertIn('Geohash computed for 0 places', result.output)
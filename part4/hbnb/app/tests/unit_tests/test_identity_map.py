@@ -0,0 +1,97 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence.unit_of_work import unit_of_work
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase, TestConfig
+from app.tests.query_counter import count_queries
+
+
+class NoCacheConfig(TestConfig):
+    # Ces tests comptent les requêtes du mémo par requête, sans le cache d'entités
+    ENTITY_CACHE = 'none'
+
+
+class TestIdentityMap(AppTestCase):
+    config = NoCacheConfig
+
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            guest = self.create_user('guest@example.com', 'Guest', 'User')
+            place = facade.create_place(title='Loft', description='A place', price=90.0,
+                                        latitude=10.0, longitude=20.0, owner_id=owner.id)
+            review = facade.create_review(text='Nice', rating=5, place_id=place.id, user_id=guest.id)
+            self.owner_id, self.place_id, self.review_id = owner.id, place.id, review.id
+            self.owner_headers = {'Authorization': f'Bearer {create_access_token(identity=owner.id)}'}
+            self.guest_headers = {'Authorization': f'Bearer {create_access_token(identity=guest.id)}'}
+
+    def primary_key_lookups(self, counter, model):
+        """SELECT ... WHERE <table>.id = ? statements of the counter for a model."""
+        table = model.__tablename__
+        return [s for s in counter.selects
+                if f'FROM {table}' in s and f'WHERE {table}.id = ?' in s]
+
+    def test_update_place_looks_up_each_id_once(self):
+        with count_queries(self.app) as counter:
+            response = self.client.put(f'/api/v1/places/{self.place_id}', json={'price': 120.0},
+                                       headers=self.owner_headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.primary_key_lookups(counter, User)), 1, counter.report())
+        self.assertEqual(len(self.primary_key_lookups(counter, Place)), 1, counter.report())
+        self.assertEqual(len(counter.selects), 2, counter.report())
+
+    def test_update_review_looks_up_each_id_once(self):
+        with count_queries(self.app) as counter:
+            response = self.client.put(f'/api/v1/reviews/{self.review_id}',
+                                       json={'text': 'Great', 'rating': 4},
+                                       headers=self.guest_headers)
+        self.assertEqual(response.status_code, 200, response.json)
+        for model in (User, Place, Review):
+            self.assertLessEqual(len(self.primary_key_lookups(counter, model)), 1, counter.report())
+
+    def test_misses_are_memoized(self):
+        with self.app.app_context(), unit_of_work():
+            with count_queries(self.app) as counter:
+                for _ in range(3):
+                    self.assertIsNone(facade.get_user('missing'))
+            self.assertEqual(len(counter.selects), 1, counter.report())
+
+    def test_delete_forgets_the_object(self):
+        with self.app.app_context(), unit_of_work():
+            self.assertIsNotNone(facade.get_review(self.review_id))
+            facade.delete_review(self.review_id)
+            self.assertIsNone(facade.get_review(self.review_id))
+
+    def test_exists_does_not_load_rows(self):
+        with self.app.app_context():
+            with count_queries(self.app) as counter:
+                self.assertTrue(facade.user_service.user_exists(self.owner_id))
+                self.assertFalse(facade.place_service.place_exists('missing'))
+            self.assertEqual(len(counter.selects), 2, counter.report())
+            for statement in counter.selects:
+                self.assertTrue(statement.startswith('SELECT ? AS anon_1'), counter.report())
+            with unit_of_work():
+                facade.get_user(self.owner_id)
+                with count_queries(self.app) as counter:
+                    self.assertTrue(facade.user_service.user_exists(self.owner_id))
+                # Déjà chargé pendant la requête : pas de requête
+                self.assertEqual(counter.statements, [])
+
+    def test_memo_is_per_request(self):
+        with self.app.app_context():
+            with unit_of_work():
+                facade.get_user(self.owner_id)
+            with count_queries(self.app) as counter:
+                with unit_of_work():
+                    db.session.expunge_all()
+                    facade.get_user(self.owner_id)
+            self.assertEqual(len(counter.selects), 1, counter.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
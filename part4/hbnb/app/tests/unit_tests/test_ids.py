@@ -0,0 +1,69 @@
+import unittest
+import uuid
+import sqlalchemy as sa
+from app import create_app, db
+from app.models.ids import UUIDString, new_id, uuid7
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase, TestConfig
+
+
+class TestUUID7(unittest.TestCase):
+    def test_version_and_variant(self):
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_ids_are_time_ordered(self):
+        ids = [str(uuid7()) for _ in range(5000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_generator_is_configurable(self):
+        self.assertEqual(uuid.UUID(new_id()).version, 7)
+
+        class LegacyConfig(TestConfig):
+            ID_GENERATOR = 'uuid4'
+
+        app = create_app(LegacyConfig)
+        with app.app_context():
+            self.assertEqual(uuid.UUID(new_id()).version, 4)
+            app.config['ID_GENERATOR'] = 'unknown'
+            with self.assertRaises(ValueError):
+                new_id()
+            db.session.remove()
+            db.drop_all()
+
+
+class TestModelIds(AppTestCase):
+    def test_ids_follow_creation_order(self):
+        with self.app.app_context():
+            created = [facade.create_amenity({'name': f'Amenity {i}'}).id for i in range(20)]
+            self.assertEqual(sorted(created), created)
+            self.assertEqual(len(created[0]), 36)
+
+
+class TestBinaryIds(unittest.TestCase):
+    def setUp(self):
+        self.engine = sa.create_engine('sqlite://')
+        metadata = sa.MetaData()
+        self.table = sa.Table('things', metadata, sa.Column('id', UUIDString(binary=True), primary_key=True))
+        metadata.create_all(self.engine)
+
+    def test_stored_as_16_bytes_and_read_as_string(self):
+        thing_id = str(uuid7())
+        with self.engine.begin() as connection:
+            connection.execute(self.table.insert().values(id=thing_id))
+            raw = connection.exec_driver_sql('SELECT id, length(id) FROM things').one()
+            self.assertEqual(raw[1], 16)
+            found = connection.execute(sa.select(self.table.c.id).where(self.table.c.id == thing_id))
+            self.assertEqual(found.scalar_one(), thing_id)
+
+    def test_invalid_id_matches_nothing(self):
+        with self.engine.begin() as connection:
+            connection.execute(self.table.insert().values(id=str(uuid7())))
+            found = connection.execute(sa.select(self.table.c.id).where(self.table.c.id == 'missing'))
+            self.assertIsNone(found.first())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import json
+import unittest
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase, TestConfig
+
+
+class StreamConfig(TestConfig):
+    STREAM_BATCH_SIZE = 2
+
+
+class TestListStreaming(AppTestCase):
+    config = StreamConfig
+
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            for i in range(5):
+                facade.create_place(title=f'Place {i}', description='A place', price=10.0 * i,
+                                    latitude=10.0, longitude=20.0, owner_id=owner.id)
+
+    def test_stream_query_param(self):
+        response = self.client.get('/api/v1/places/?stream=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines],
+                         [f'Place {i}' for i in range(5)])
+
+    def test_stream_accept_header(self):
+        response = self.client.get('/api/v1/reviews/', headers={'Accept': 'application/x-ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+        self.assertEqual(response.get_data(as_text=True), '')
+
+    def test_json_by_default(self):
+        response = self.client.get('/api/v1/places/', headers={'Accept': '*/*'})
+        self.assertEqual(response.mimetype, 'application/json')
+        self.assertEqual(len(response.json), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase
+
+
+class TestPagination(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            for i in range(5):
+                facade.create_amenity({'name': f'Amenity {i}'})
+
+    def test_walk_all_pages(self):
+        names = []
+        cursor = None
+        while True:
+            url = '/api/v1/amenities/?limit=2'
+            if cursor:
+                url += f'&cursor={cursor}'
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = response.json['amenities']
+            self.assertLessEqual(len(page), 2)
+            names.extend(a['name'] for a in page)
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                break
+        self.assertEqual(names, [f'Amenity {i}' for i in range(5)])
+
+    def test_default_page_size(self):
+        self.app.config['DEFAULT_PAGE_SIZE'] = 3
+        response = self.client.get('/api/v1/amenities/')
+        self.assertEqual(len(response.json['amenities']), 3)
+        self.assertIn('X-Next-Cursor', response.headers)
+
+    def test_limit_is_capped(self):
+        self.app.config['MAX_PAGE_SIZE'] = 4
+        response = self.client.get('/api/v1/amenities/?limit=1000')
+        self.assertEqual(len(response.json['amenities']), 4)
+
+    def test_total_count_header(self):
+        response = self.client.get('/api/v1/amenities/?limit=2')
+        self.assertEqual(len(response.json['amenities']), 2)
+        self.assertEqual(response.headers['X-Total-Count'], '5')
+        for url in ('/api/v1/users/', '/api/v1/places/', '/api/v1/reviews/'):
+            self.assertEqual(self.client.get(url).headers['X-Total-Count'], '0')
+
+    def test_headers_exposed_to_other_origins(self):
+        response = self.client.get('/api/v1/amenities/?limit=2',
+                                   headers={'Origin': 'http://example.com'})
+        exposed = {name.strip() for name in response.headers['Access-Control-Expose-Headers'].split(',')}
+        self.assertTrue({'X-Next-Cursor', 'X-Total-Count', 'ETag', 'Last-Modified'} <= exposed)
+        self.assertIn('X-Next-Cursor', response.headers)
+
+    def test_limit_must_be_positive(self):
+        for limit in (0, -1):
+            response = self.client.get(f'/api/v1/amenities/?limit={limit}')
+            self.assertEqual(response.status_code, 400, limit)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/v1/amenities/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_endpoints_are_paginated(self):
+        for url in ('/api/v1/users/', '/api/v1/places/', '/api/v1/reviews/'):
+            response = self.client.get(url + '?limit=1')
+            self.assertEqual(response.status_code, 200)
+            self.assertIsInstance(response.json, list)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import math
+import unittest
+from app.models.geo import EARTH_RADIUS_KM
+from app.persistence.unit_of_work import unit_of_work
+from app.services.facade import hbnb_facade as facade
+from app.services.place_index import PlaceIndex, numpy_available
+from app.tests.base import AppTestCase, TestConfig
+from app.tests.query_counter import count_queries
+
+
+class DatabaseConfig(TestConfig):
+    PLACE_INDEX_ENABLED = False
+
+
+# (latitude, longitude, price)
+PLACES = {
+    'Louvre': (48.8606, 2.3376, 200.0),
+    'Notre-Dame': (48.8530, 2.3499, 90.0),
+    'Versailles': (48.8049, 2.1204, 60.0),
+    'London': (51.5074, -0.1278, 80.0),
+    'Sydney': (-33.8688, 151.2093, 40.0),
+}
+
+
+@unittest.skipUnless(numpy_available(), 'NumPy is not installed')
+class TestPlaceIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PlaceIndex.from_rows(
+            (title, lat, lon, price) for title, (lat, lon, price) in PLACES.items())
+
+    def test_nearest_sorted_by_distance(self):
+        nearest = self.index.nearest(48.8566, 2.3522, 3)
+        self.assertEqual([place_id for place_id, _ in nearest], ['Notre-Dame', 'Louvre', 'Versailles'])
+        self.assertAlmostEqual(nearest[0][1], 0.427, delta=0.01)
+
+    def test_price_mask(self):
+        nearest = self.index.nearest(48.8566, 2.3522, 2, max_price=85)
+        self.assertEqual([place_id for place_id, _ in nearest], ['Versailles', 'London'])
+        nearest = self.index.nearest(48.8566, 2.3522, 10, min_price=100)
+        self.assertEqual([place_id for place_id, _ in nearest], ['Louvre'])
+
+    def test_upsert_and_remove(self):
+        index = PlaceIndex(capacity=1)
+        for position in range(40):
+            index.upsert(f'p{position}', 10.0, 20.0 + position / 100, 50.0)
+        index.upsert('p39', 10.0, 19.9, 50.0)
+        index.remove('p0')
+        self.assertEqual(len(index), 39)
+        self.assertEqual([place_id for place_id, _ in index.nearest(10.0, 19.9, 2)], ['p39', 'p1'])
+
+
+class NearestPlacesMixin:
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            self.owner_id = owner.id
+            for title, (lat, lon, price) in PLACES.items():
+                facade.create_place(title=title, description='A place', price=price,
+                                    latitude=lat, longitude=lon, owner_id=owner.id)
+
+    def titles(self, query):
+        response = self.client.get(f'/api/v1/places/nearest?{query}')
+        self.assertEqual(response.status_code, 200, response.json)
+        return [place['title'] for place in response.json]
+
+    def test_nearest_within_budget(self):
+        self.assertEqual(self.titles('lat=48.8566&lon=2.3522&k=3'), ['Notre-Dame', 'Louvre', 'Versailles'])
+        self.assertEqual(self.titles('lat=48.8566&lon=2.3522&k=2&max_price=85'), ['Versailles', 'London'])
+        self.assertEqual(self.titles('lat=48.8566&lon=2.3522&k=10&max_price=50'), ['Sydney'])
+
+    def test_new_and_updated_places(self):
+        self.titles('lat=0&lon=0&k=1')
+        with self.app.app_context():
+            with unit_of_work():
+                place = facade.create_place(title='Eiffel', description='A place', price=70.0,
+                                            latitude=48.8584, longitude=2.2945, owner_id=self.owner_id)
+                place_id = place.id
+        self.assertEqual(self.titles('lat=48.8584&lon=2.2945&k=1&max_price=100'), ['Eiffel'])
+        with self.app.app_context():
+            with unit_of_work():
+                facade.place_service.update_place(place_id, price=500.0)
+        self.assertEqual(self.titles('lat=48.8584&lon=2.2945&k=1&max_price=100'), ['Notre-Dame'])
+
+    def test_invalid_arguments(self):
+        for query in ('lat=91&lon=0', 'lat=0&lon=0&k=0', 'lat=0&lon=0&min_price=10&max_price=5', 'lon=0'):
+            response = self.client.get(f'/api/v1/places/nearest?{query}')
+            self.assertEqual(response.status_code, 400, query)
+
+
+@unittest.skipUnless(numpy_available(), 'NumPy is not installed')
+class TestNearestFromIndex(NearestPlacesMixin, AppTestCase):
+    def test_rolled_back_write_not_indexed(self):
+        self.titles('lat=0&lon=0&k=1')
+        with self.app.app_context():
+            with self.assertRaises(RuntimeError), unit_of_work():
+                facade.create_place(title='Ghost', description='A place', price=10.0,
+                                    latitude=0.0, longitude=0.0, owner_id=self.owner_id)
+                raise RuntimeError
+        self.assertEqual(len(self.app.extensions['place_index']), len(PLACES))
+
+    def test_served_without_distance_query(self):
+        self.titles('lat=0&lon=0&k=1')
+        with self.app.app_context(), count_queries(self.app) as queries:
+            facade.get_nearest_places(48.8566, 2.3522, 3)
+        # Seul le chargement des 3 places par id touche la base
+        self.assertEqual(len(queries.selects), 1, queries.report())
+        self.assertIn('places.id IN', queries.selects[0])
+
+
+class TestNearestFromDatabase(NearestPlacesMixin, AppTestCase):
+    config = DatabaseConfig
+
+    @unittest.skipUnless(numpy_available(), 'NumPy is not installed')
+    def test_same_answer_as_the_index_on_the_edge_of_the_window(self):
+        # Au nord, à 4,997 km, juste dans la première fenêtre de 5 km ;
+        # à l'est, plus loin mais aussi dans la fenêtre
+        edge = {'North': (math.degrees(4.997 / EARTH_RADIUS_KM), 0.0),
+                'East': (0.0, math.degrees(4.999 / EARTH_RADIUS_KM))}
+        with self.app.app_context():
+            rows = []
+            for title, (lat, lon) in edge.items():
+                place = facade.create_place(title=title, description='A place', price=50.0,
+                                            latitude=lat, longitude=lon, owner_id=self.owner_id)
+                rows.append((place.id, lat, lon, 50.0))
+            index = PlaceIndex.from_rows(rows)
+            expected = [place_id for place_id, _ in index.nearest(0.0, 0.0, 1)]
+            found = [place_id for place_id, _ in
+                     facade.place_index_service.nearest_place_ids(0.0, 0.0, 1)]
+        self.assertEqual(found, expected)
+        self.assertEqual(self.titles('lat=0&lon=0&k=1'), ['North'])
@@ -0,0 +1,87 @@
+import unittest
+from sqlalchemy import event
+from app import db
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase
+
+
+class TestPlaceSearch(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            other = self.create_user('other@example.com', 'Other', 'Owner')
+            guests = [self.create_user(f'guest{i}@example.com', 'Guest', 'User') for i in range(2)]
+            wifi = facade.create_amenity({'name': 'WiFi'})
+            pool = facade.create_amenity({'name': 'Pool'})
+            self.owner_id, self.wifi_id, self.pool_id = owner.id, wifi.id, pool.id
+
+            def place(title, price, owner_id, amenities):
+                return facade.create_place(title=title, description='A place', price=price,
+                                           latitude=10.0, longitude=20.0, owner_id=owner_id,
+                                           amenities=amenities)
+            cheap = place('Cheap', 20.0, owner.id, [wifi.id])
+            place('Mid', 80.0, owner.id, [wifi.id, pool.id])
+            luxury = place('Luxury', 300.0, other.id, [wifi.id, pool.id])
+            for guest, rating in zip(guests, (5, 4)):
+                facade.create_review(text='Nice', rating=rating, place_id=luxury.id, user_id=guest.id)
+            facade.create_review(text='Meh', rating=2, place_id=cheap.id, user_id=guests[0].id)
+
+    def titles(self, query):
+        response = self.client.get('/api/v1/places/' + query)
+        self.assertEqual(response.status_code, 200)
+        return [p['title'] for p in response.json]
+
+    def test_price_range(self):
+        self.assertEqual(self.titles('?min_price=50&max_price=100'), ['Mid'])
+        self.assertEqual(self.titles('?max_price=100'), ['Cheap', 'Mid'])
+
+    def test_required_amenities(self):
+        self.assertEqual(self.titles(f'?amenities={self.wifi_id}'), ['Cheap', 'Mid', 'Luxury'])
+        self.assertEqual(self.titles(f'?amenities={self.wifi_id},{self.pool_id}'), ['Mid', 'Luxury'])
+
+    def test_min_rating_and_owner(self):
+        self.assertEqual(self.titles('?min_rating=4'), ['Luxury'])
+        self.assertEqual(self.titles(f'?owner_id={self.owner_id}'), ['Cheap', 'Mid'])
+
+    def test_total_count_header(self):
+        response = self.client.get(f'/api/v1/places/?amenities={self.wifi_id}&limit=1')
+        self.assertEqual(len(response.json), 1)
+        self.assertEqual(response.headers['X-Total-Count'], '3')
+        response = self.client.get('/api/v1/places/?min_rating=4')
+        self.assertEqual(response.headers['X-Total-Count'], '1')
+
+    def test_filters_combine_with_pagination(self):
+        response = self.client.get(f'/api/v1/places/?amenities={self.wifi_id}&limit=2')
+        self.assertEqual([p['title'] for p in response.json], ['Cheap', 'Mid'])
+        cursor = response.headers['X-Next-Cursor']
+        self.assertEqual(self.titles(f'?amenities={self.wifi_id}&limit=2&cursor={cursor}'), ['Luxury'])
+
+    def test_single_query(self):
+        statements = []
+        on_execute = lambda *args: statements.append(args[2])
+        with self.app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', on_execute)
+            try:
+                self.titles(f'?min_price=10&min_rating=1&amenities={self.wifi_id},{self.pool_id}')
+            finally:
+                event.remove(db.engine, 'before_cursor_execute', on_execute)
+        selects = [s for s in statements if s.lstrip().startswith('SELECT')]
+        # La page elle-même, le COUNT de l'en-tête X-Total-Count et le
+        # count/max(updated_at) de l'ETag de la collection
+        self.assertEqual(len(selects), 3)
+        self.assertEqual(len([s for s in selects if s.lstrip().startswith('SELECT count(')]), 2)
+
+    def test_invalid_filters(self):
+        response = self.client.get('/api/v1/places/?min_price=100&max_price=10')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/v1/places/?min_rating=9&stream=1')
+        self.assertEqual(response.status_code, 400)
+
+    def test_stream_honours_filters(self):
+        response = self.client.get('/api/v1/places/?max_price=100&stream=1')
+        self.assertEqual(len(response.get_data(as_text=True).splitlines()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from datetime import timedelta
+from app import db
+from app.models.base_model import utcnow
+from app.models.review import Review
+from app.persistence.unit_of_work import unit_of_work
+from app.services.facade import hbnb_facade as facade
+from app.services.ranking_service import PlaceRankings, TopK
+from app.tests.base import AppTestCase
+from app.tests.query_counter import count_queries
+
+
+class TestTopK(unittest.TestCase):
+    def test_keeps_best_scores(self):
+        top = TopK(3)
+        for key, score in zip('abcdef', (5, 1, 4, 2, 6, 3)):
+            top.set(key, score)
+        self.assertEqual(top.items(), [('e', 6), ('a', 5), ('c', 4)])
+        self.assertEqual(top.items(2), [('e', 6), ('a', 5)])
+
+    def test_lowered_member_is_replaced(self):
+        top = TopK(2)
+        for key, score in (('a', 5), ('b', 4), ('c', 3)):
+            top.set(key, score)
+        top.set('a', 1)
+        self.assertEqual(top.items(), [('b', 4), ('c', 3)])
+        top.set('c', 10)
+        self.assertEqual(top.items(), [('c', 10), ('b', 4)])
+
+    def test_remove(self):
+        top = TopK(2)
+        for key, score in (('a', 5), ('b', 4), ('c', 3)):
+            top.set(key, score)
+        top.remove('a')
+        self.assertEqual(top.items(), [('b', 4), ('c', 3)])
+        self.assertEqual(len(top), 2)
+
+
+class TestPlaceRankings(unittest.TestCase):
+    def test_prior_follows_applied_ratings(self):
+        rankings = PlaceRankings(size=5, prior_weight=5, half_life_hours=24)
+        rankings.load([], [])
+        # Premier avis : la moyenne a priori devient 1, pas 0 (ni l'ancienne)
+        rankings.apply([('rating', 'a', 1, 1)])
+        self.assertEqual(rankings.prior_mean, 1.0)
+        self.assertEqual(rankings.top_places(5), [('a', 1.0)])
+        rankings.apply([('rating', 'b', 1, 5)])
+        self.assertEqual(rankings.prior_mean, 3.0)
+        self.assertEqual(rankings.top_places(1), [('b', round((5 * 3 + 5) / 6, 4))])
+        # Suppression du dernier avis de b
+        rankings.apply([('rating', 'b', -1, -5)])
+        self.assertEqual(rankings.prior_mean, 1.0)
+        self.assertEqual([place_id for place_id, _ in rankings.top_places(5)], ['a'])
+
+
+class TestLeaderboards(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            self.guest_ids = [self.create_user(f'guest{i}@example.com', 'Guest', 'User').id
+                              for i in range(6)]
+            self.place_ids = {}
+            for title in ('Popular', 'Lucky', 'Poor', 'Quiet'):
+                self.place_ids[title] = facade.create_place(
+                    title=title, description='A place', price=50.0, latitude=10.0,
+                    longitude=20.0, owner_id=owner.id).id
+            for guest_id in self.guest_ids:
+                self.review('Popular', guest_id, 5)
+            self.review('Lucky', self.guest_ids[0], 5)
+            for guest_id in self.guest_ids[:3]:
+                self.review('Poor', guest_id, 2)
+
+    def review(self, title, guest_id, rating):
+        return facade.create_review(text='Review', rating=rating,
+                                    place_id=self.place_ids[title], user_id=guest_id)
+
+    def titles(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [p['title'] for p in response.json]
+
+    def test_top_uses_bayesian_average(self):
+        # Popular et Lucky ont la même moyenne brute (5), mais un seul avis pèse peu
+        response = self.client.get('/api/v1/places/top')
+        self.assertEqual([p['title'] for p in response.json], ['Popular', 'Lucky', 'Poor'])
+        scores = [p['score'] for p in response.json]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(self.titles('/api/v1/places/top?limit=1'), ['Popular'])
+
+    def test_rankings_follow_review_writes(self):
+        before = {p['title']: p['score'] for p in self.client.get('/api/v1/places/top').json}
+        with self.app.app_context():
+            rankings = self.app.extensions['place_rankings']
+            review = self.review('Quiet', self.guest_ids[0], 5)
+            for guest_id in self.guest_ids[3:]:
+                self.review('Poor', guest_id, 5)
+            facade.delete_review(review.id)
+        # Mis à jour sans reconstruction depuis la base
+        self.assertIs(self.app.extensions['place_rankings'], rankings)
+        after = {p['title']: p['score'] for p in self.client.get('/api/v1/places/top').json}
+        self.assertNotIn('Quiet', after)
+        self.assertGreater(after['Poor'], before['Poor'])
+        self.assertEqual(self.titles('/api/v1/places/trending')[0], 'Poor')
+
+    def test_rolled_back_writes_are_ignored(self):
+        self.titles('/api/v1/places/top')
+        with self.app.app_context():
+            with self.assertRaises(RuntimeError):
+                with unit_of_work():
+                    self.review('Quiet', self.guest_ids[0], 5)
+                    raise RuntimeError('abort the transaction')
+        self.assertNotIn('Quiet', self.titles('/api/v1/places/top'))
+        self.assertNotIn('Quiet', self.titles('/api/v1/places/trending'))
+
+    def test_trending_decays_old_reviews(self):
+        with self.app.app_context():
+            # Les avis de Popular datent d'il y a deux semaines
+            db.session.execute(db.update(Review)
+                               .where(Review.place_id == self.place_ids['Popular'])
+                               .values(created_at=utcnow() - timedelta(days=14)))
+            db.session.commit()
+        self.assertEqual(self.titles('/api/v1/places/trending'), ['Poor', 'Lucky', 'Popular'])
+
+    def test_reads_do_not_scan_reviews(self):
+        self.titles('/api/v1/places/top')
+        with count_queries(self.app) as counter:
+            self.titles('/api/v1/places/top')
+            self.titles('/api/v1/places/trending')
+        # Une requête IN (...) par classement pour charger les places
+        self.assertEqual(len(counter.selects), 2, counter.report())
+        self.assertFalse(any('FROM reviews' in s for s in counter.selects), counter.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.config import Config
+from app.persistence.replication import use_primary
+from app.persistence.unit_of_work import unit_of_work
+from app.services.facade import hbnb_facade as facade
+
+
+class TestReadReplica(unittest.TestCase):
+    sync_on_commit = True
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        tmpdir, sync_on_commit = self.tmpdir.name, self.sync_on_commit
+
+        class TestConfig(Config):
+            TESTING = True
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmpdir, 'primary.db')
+            SQLALCHEMY_BINDS = {'replica': 'sqlite:///' + os.path.join(tmpdir, 'replica.db')}
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+            READ_REPLICA_BIND = 'replica'
+            REPLICA_SYNC_ON_COMMIT = sync_on_commit
+
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            self.amenity_id = facade.create_amenity({'name': 'WiFi'}).id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+        # db est partagé : sans cela, le drop_all() des autres tests chercherait le bind
+        db.metadatas.pop('replica', None)
+        self.tmpdir.cleanup()
+
+    def statements_by_engine(self, call):
+        """Run call and return the SELECT count sent to (primary, replica)."""
+        counts = {}
+        with self.app.app_context():
+            listeners = {}
+            for key, engine in db.engines.items():
+                counts[key] = 0
+
+                def on_execute(conn, cursor, statement, *args, key=key):
+                    if statement.lstrip().startswith('SELECT'):
+                        counts[key] += 1
+                listeners[key] = on_execute
+                event.listen(engine, 'before_cursor_execute', on_execute)
+            try:
+                result = call()
+            finally:
+                for key, engine in db.engines.items():
+                    event.remove(engine, 'before_cursor_execute', listeners[key])
+        return result, counts[None], counts['replica']
+
+    def test_reads_go_to_replica(self):
+        response, primary, replica = self.statements_by_engine(
+            lambda: self.client.get(f'/api/v1/amenities/{self.amenity_id}'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((primary, replica), (0, 1))
+
+    def test_read_your_writes(self):
+        replica_selects = []
+        on_execute = lambda *args: replica_selects.append(args[2])
+        with self.app.app_context(), unit_of_work():
+            amenity = facade.create_amenity({'name': 'Pool'})
+            db.session.expire_all()
+            # Écrit mais pas encore commité ni copié : la lecture doit aller au primaire
+            event.listen(db.engines['replica'], 'before_cursor_execute', on_execute)
+            try:
+                self.assertEqual(facade.get_amenity(amenity.id).name, 'Pool')
+            finally:
+                event.remove(db.engines['replica'], 'before_cursor_execute', on_execute)
+        self.assertEqual(replica_selects, [])
+
+    def test_use_primary(self):
+        def read():
+            with use_primary():
+                return facade.get_amenity(self.amenity_id).name
+        name, primary, replica = self.statements_by_engine(read)
+        self.assertEqual(name, 'WiFi')
+        self.assertEqual((primary, replica), (1, 0))
+
+    def test_replica_is_synced_after_commit(self):
+        with self.app.app_context():
+            amenity_id = facade.create_amenity({'name': 'Pool'}).id
+        name, primary, replica = self.statements_by_engine(lambda: facade.get_amenity(amenity_id).name)
+        self.assertEqual(name, 'Pool')
+        self.assertEqual((primary, replica), (0, 1))
+
+
+class TestUnsyncedReplica(TestReadReplica):
+    """Sans synchronisation, le réplica ne voit que l'état du démarrage"""
+    sync_on_commit = False
+
+    def test_reads_go_to_replica(self):
+        response = self.client.get(f'/api/v1/amenities/{self.amenity_id}')
+        self.assertEqual(response.status_code, 404)
+
+    def test_replica_is_synced_after_commit(self):
+        with self.app.app_context():
+            self.assertIsNone(facade.get_amenity(self.amenity_id))
+            with use_primary():
+                self.assertIsNotNone(facade.get_amenity(self.amenity_id))
+
+
+class TestReplicaConfig(unittest.TestCase):
+    def test_unknown_bind(self):
+        class TestConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite://'
+            READ_REPLICA_BIND = 'replica'
+
+        with self.assertRaises(ValueError):
+            create_app(TestConfig)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import unittest
+from sqlalchemy import event, text
+from app import db
+from app.models.amenity import Amenity
+from app.persistence.in_memory_repository import InMemoryRepository
+from app.persistence.amenity_repository import AmenityRepository
+from app.persistence.unit_of_work import unit_of_work
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase
+from app.tests.query_counter import count_queries
+
+
+class TestInMemoryRepository(unittest.TestCase):
+    def setUp(self):
+        self.repository = InMemoryRepository()
+        self.amenities = self.repository.add_many([Amenity(name=f'Amenity {i}') for i in range(5)])
+
+    def test_get_many(self):
+        ids = [self.amenities[0].id, self.amenities[3].id, 'missing']
+        found = self.repository.get_many(ids)
+        self.assertEqual(set(found), {self.amenities[0].id, self.amenities[3].id})
+
+    def test_update_fields_and_delete_by_id(self):
+        amenity = self.amenities[0]
+        self.assertEqual(self.repository.update_fields(amenity.id, {'name': 'Fibre'}), 1)
+        self.assertEqual(self.repository.get(amenity.id).name, 'Fibre')
+        self.assertEqual(self.repository.delete_by_id(amenity.id), 1)
+        self.assertEqual(self.repository.delete_by_id(amenity.id), 0)
+
+    def test_get_page(self):
+        page, cursor = self.repository.get_page(limit=3)
+        self.assertEqual(page, self.amenities[:3])
+        page, cursor = self.repository.get_page(cursor, limit=3)
+        self.assertEqual(page, self.amenities[3:])
+        self.assertIsNone(cursor)
+
+
+class TestSQLAlchemyRepository(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.repository = AmenityRepository()
+        amenities = self.repository.add_many([Amenity(name=f'Amenity {i}') for i in range(5)])
+        self.ids = [a.id for a in amenities]
+        self.statements = []
+        self.on_execute = lambda *args: self.statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', self.on_execute)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self.on_execute)
+        self.ctx.pop()
+        super().tearDown()
+
+    def test_get_many_runs_one_query(self):
+        ids = self.ids[:3] + ['missing']
+        found = self.repository.get_many(ids)
+        self.assertEqual(set(found), set(ids[:3]))
+        self.assertEqual(len(self.statements), 1)
+
+    def test_create_place_loads_amenities_once(self):
+        owner = self.create_user()
+        db.session.expire_all()
+        self.statements.clear()
+        with unit_of_work():
+            place = facade.create_place(title='Cozy', description='A place', price=50.0,
+                                        latitude=10.0, longitude=20.0, owner_id=owner.id,
+                                        amenities=self.ids)
+            self.assertEqual(len(place.amenities), 5)
+        amenity_selects = [s for s in self.statements
+                           if s.lstrip().startswith('SELECT') and 'FROM amenities' in s]
+        self.assertEqual(len(amenity_selects), 1)
+
+    def test_delete_linked_amenity(self):
+        owner = self.create_user()
+        place = facade.create_place(title='Cozy', description='A place', price=50.0,
+                                    latitude=10.0, longitude=20.0, owner_id=owner.id,
+                                    amenities=self.ids[:2])
+        place_id, updated_at = place.id, place.updated_at
+        db.session.commit()
+        self.assertTrue(facade.amenity_service.delete_amenity(self.ids[0]))
+        db.session.commit()
+        db.session.expire_all()
+        place = facade.get_place(place_id)
+        self.assertEqual([a.id for a in place.amenities], [self.ids[1]])
+        self.assertGreater(place.updated_at, updated_at)
+
+    def test_create_place_rejects_unknown_amenity(self):
+        owner = self.create_user()
+        with self.assertRaises(ValueError):
+            facade.create_place(title='Cozy', description='A place', price=50.0,
+                                latitude=10.0, longitude=20.0, owner_id=owner.id,
+                                amenities=[self.ids[0], 'missing'])
+
+
+class TestReviewRepository(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        owner = self.create_user()
+        self.place = facade.create_place(title='Cozy', description='A place', price=50.0,
+                                         latitude=10.0, longitude=20.0, owner_id=owner.id)
+        self.users = [self.create_user(f'guest{i}@example.com', 'Guest', 'User') for i in range(3)]
+        for user in self.users:
+            facade.create_review(text='Nice', rating=4, place_id=self.place.id, user_id=user.id)
+
+    def tearDown(self):
+        self.ctx.pop()
+        super().tearDown()
+
+    def test_reviews_by_place_use_index(self):
+        plan = db.session.execute(text(
+            'EXPLAIN QUERY PLAN SELECT * FROM reviews WHERE place_id = :place_id '
+            'ORDER BY created_at, id'), {'place_id': self.place.id}).all()
+        details = ' '.join(row[-1] for row in plan)
+        self.assertIn('ix_reviews_place_id_created_at_id', details)
+        self.assertNotIn('TEMP B-TREE', details)
+
+    def test_filters(self):
+        self.assertEqual(len(facade.get_reviews_by_place(self.place.id)), 3)
+        self.assertEqual(len(facade.review_service.get_reviews_by_user(self.users[0].id)), 1)
+        self.assertTrue(facade.has_user_reviewed_place(self.users[0].id, self.place.id))
+        self.assertFalse(facade.has_user_reviewed_place(self.place.owner_id, self.place.id))
+
+    def test_delete_loaded_review_runs_no_select(self):
+        review_id = facade.get_reviews_by_place(self.place.id)[0].id
+        with unit_of_work():
+            facade.get_review(review_id)  # chargé par l'endpoint pour vérifier l'auteur
+            with count_queries(self.app) as counter:
+                self.assertTrue(facade.delete_review(review_id))
+        # DELETE de l'avis + UPDATE des agrégats de la place, sans relecture
+        self.assertEqual([s.split()[0] for s in counter.statements], ['DELETE', 'UPDATE'], counter.report())
+        self.assertFalse(facade.delete_review(review_id))
+        self.assertEqual(len(facade.get_reviews_by_place(self.place.id)), 2)
+
+    def test_update_fields_is_one_statement(self):
+        review = facade.get_reviews_by_place(self.place.id)[0]
+        with count_queries(self.app) as counter:
+            self.assertEqual(facade.review_service.repository.update_fields(review.id, {'text': 'Great'}), 1)
+        self.assertEqual(len(counter.statements), 1, counter.report())
+        # L'objet déjà chargé est synchronisé avec la base
+        self.assertEqual(review.text, 'Great')
+        self.assertEqual(facade.review_service.repository.update_fields('missing', {'text': 'x'}), 0)
+
+    def test_place_reviews_endpoint_is_paged(self):
+        client = self.app.test_client()
+        response = client.get(f'/api/v1/reviews/places/{self.place.id}/reviews?limit=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json), 2)
+        cursor = response.headers['X-Next-Cursor']
+        response = client.get(f'/api/v1/reviews/places/{self.place.id}/reviews?limit=2&cursor={cursor}')
+        self.assertEqual(len(response.json), 1)
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
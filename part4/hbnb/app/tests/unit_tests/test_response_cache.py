@@ -0,0 +1,109 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app.persistence.unit_of_work import unit_of_work
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase, TestConfig
+from app.tests.query_counter import count_queries
+
+
+class DisabledConfig(TestConfig):
+    RESPONSE_CACHE_ENABLED = False
+
+
+class TestResponseCache(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            guest = self.create_user('guest@example.com', 'Guest', 'User')
+            place = facade.create_place(title='Loft', description='A place', price=90.0,
+                                        latitude=10.0, longitude=20.0, owner_id=owner.id)
+            amenity = facade.create_amenity({'name': 'Wifi'})
+            self.owner_id, self.guest_id = owner.id, guest.id
+            self.place_id, self.amenity_id = place.id, amenity.id
+            self.guest_headers = {'Authorization': f'Bearer {create_access_token(identity=guest.id)}'}
+
+    def get(self, url, **kwargs):
+        """GET url, return (response, statement count without the ETag validators query)."""
+        with count_queries(self.app) as counter:
+            response = self.client.get(url, **kwargs)
+        return response, len([s for s in counter.statements if 'max(' not in s])
+
+    def test_hit_does_not_query(self):
+        first, _ = self.get('/api/v1/places/?limit=10')
+        second, statements = self.get('/api/v1/places/?limit=10')
+        self.assertEqual(statements, 0)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.mimetype, 'application/json')
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.headers.get('X-Total-Count'), first.headers.get('X-Total-Count'))
+
+    def test_query_string_is_normalized(self):
+        self.get('/api/v1/places/?limit=10&min_price=50')
+        _, statements = self.get('/api/v1/places/?min_price=50&limit=10')
+        self.assertEqual(statements, 0)
+        _, statements = self.get('/api/v1/places/?min_price=60&limit=10')
+        self.assertGreater(statements, 0)
+
+    def test_commit_changes_the_generation(self):
+        self.get('/api/v1/places/')
+        with self.app.app_context(), unit_of_work():
+            facade.place_service.update_place(self.place_id, title='Renamed')
+        response, statements = self.get('/api/v1/places/')
+        self.assertGreater(statements, 0)
+        self.assertEqual(response.json[0]['title'], 'Renamed')
+
+    def test_writes_only_expire_their_lists(self):
+        self.get('/api/v1/amenities/')
+        self.get('/api/v1/places/')
+        with self.app.app_context(), unit_of_work():
+            facade.create_amenity({'name': 'Fibre'})
+        response, statements = self.get('/api/v1/amenities/')
+        self.assertGreater(statements, 0)
+        self.assertEqual(len(response.json['amenities']), 2)
+        self.assertEqual(self.get('/api/v1/places/')[1], 0)
+
+    def test_new_review_expires_reviews_and_places(self):
+        self.get(f'/api/v1/reviews/places/{self.place_id}/reviews')
+        self.get('/api/v1/places/')
+        response = self.client.post('/api/v1/reviews/', headers=self.guest_headers,
+                                    json={'text': 'Nice', 'rating': 4, 'place_id': self.place_id})
+        self.assertEqual(response.status_code, 201, response.json)
+        reviews, _ = self.get(f'/api/v1/reviews/places/{self.place_id}/reviews')
+        self.assertEqual(len(reviews.json), 1)
+        places, _ = self.get('/api/v1/places/')
+        self.assertEqual(places.json[0]['review_count'], 1)
+
+    def test_rolled_back_writes_keep_the_generation(self):
+        self.get('/api/v1/places/')
+        with self.app.app_context():
+            with self.assertRaises(RuntimeError), unit_of_work():
+                facade.place_service.update_place(self.place_id, title='Renamed')
+                raise RuntimeError
+        self.assertEqual(self.get('/api/v1/places/')[1], 0)
+
+    def test_errors_and_streams_are_not_cached(self):
+        for _ in range(2):
+            response, statements = self.get('/api/v1/reviews/places/missing/reviews')
+            self.assertEqual(response.status_code, 404)
+            self.assertGreater(statements, 0)
+        self.get('/api/v1/places/')
+        response, statements = self.get('/api/v1/places/',
+                                        headers={'Accept': 'application/x-ndjson'})
+        self.assertGreater(statements, 0)
+        self.assertEqual(response.mimetype, 'application/x-ndjson')
+
+
+class TestResponseCacheDisabled(AppTestCase):
+    config = DisabledConfig
+
+    def test_every_request_queries(self):
+        for _ in range(2):
+            with count_queries(self.app) as counter:
+                self.assertEqual(self.client.get('/api/v1/amenities/').status_code, 200)
+            self.assertGreater(len(counter.statements), 0)
+        self.assertNotIn('response_cache', self.app.extensions)
+
+
+if __name__ == '__main__':
+    unittest.main()
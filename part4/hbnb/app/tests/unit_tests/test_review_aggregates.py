@@ -0,0 +1,88 @@
+import unittest
+from app import db
+from app.models.place import Place
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase
+
+
+class TestReviewAggregates(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        owner = self.create_user()
+        self.guests = [self.create_user(f'guest{i}@example.com', 'Guest', 'User') for i in range(3)]
+        self.place = facade.create_place(title='Loft', description='A place', price=90.0,
+                                         latitude=10.0, longitude=20.0, owner_id=owner.id)
+        self.other = facade.create_place(title='Barn', description='A place', price=40.0,
+                                         latitude=10.0, longitude=20.0, owner_id=owner.id)
+
+    def tearDown(self):
+        self.ctx.pop()
+        super().tearDown()
+
+    def aggregates(self, place_id):
+        db.session.expire_all()
+        place = facade.get_place(place_id)
+        return place.review_count, place.rating_sum, place.rating_histogram
+
+    def review(self, guest, rating, place=None):
+        return facade.create_review(text='Nice', rating=rating,
+                                    place_id=(place or self.place).id, user_id=guest.id)
+
+    def test_create_update_delete(self):
+        first = self.review(self.guests[0], 5)
+        self.review(self.guests[1], 3)
+        count, total, histogram = self.aggregates(self.place.id)
+        self.assertEqual((count, total), (2, 8))
+        self.assertEqual(histogram, {'1': 0, '2': 0, '3': 1, '4': 0, '5': 1})
+
+        facade.update_review(first.id, rating=4)
+        count, total, histogram = self.aggregates(self.place.id)
+        self.assertEqual((count, total, histogram['5'], histogram['4']), (2, 7, 0, 1))
+
+        facade.update_review(first.id, place_id=self.other.id)
+        self.assertEqual(self.aggregates(self.place.id)[:2], (1, 3))
+        self.assertEqual(self.aggregates(self.other.id)[:2], (1, 4))
+
+        facade.delete_review(first.id)
+        self.assertEqual(self.aggregates(self.other.id), (0, 0, dict.fromkeys('12345', 0)))
+
+    def test_bulk_create(self):
+        reviews, errors = facade.create_reviews(self.guests[0].id, [
+            {'text': 'Nice', 'rating': 5, 'place_id': self.place.id},
+            {'text': 'Meh', 'rating': 2, 'place_id': self.other.id},
+        ])
+        self.assertEqual(errors, [])
+        self.assertEqual(self.aggregates(self.place.id)[:2], (1, 5))
+        self.assertEqual(self.aggregates(self.other.id)[:2], (1, 2))
+
+    def test_responses_show_average(self):
+        self.review(self.guests[0], 5)
+        self.review(self.guests[1], 2)
+        detail = self.client.get(f'/api/v1/places/{self.place.id}').json
+        self.assertEqual(detail['review_count'], 2)
+        self.assertEqual(detail['average_rating'], 3.5)
+        self.assertEqual(detail['rating_histogram']['5'], 1)
+        listed = {p['title']: p for p in self.client.get('/api/v1/places/').json}
+        self.assertEqual(listed['Loft']['average_rating'], 3.5)
+        self.assertIsNone(listed['Barn']['average_rating'])
+
+    def test_repair_command(self):
+        self.review(self.guests[0], 5)
+        self.review(self.guests[1], 4)
+        self.review(self.guests[2], 1, place=self.other)
+        # Agrégats corrompus, par exemple par un import SQL direct
+        db.session.execute(db.update(Place).values(review_count=42, rating_sum=0, rating_count_5=7))
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(args=['repair-review-aggregates'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('2 reviewed places', result.output)
+        self.assertEqual(self.aggregates(self.place.id),
+                         (2, 9, {'1': 0, '2': 0, '3': 0, '4': 1, '5': 1}))
+        self.assertEqual(self.aggregates(self.other.id)[:2], (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
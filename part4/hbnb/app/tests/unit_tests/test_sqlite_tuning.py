@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from app import create_app, db
+from app.config import Config
+from app.persistence.sqlite_tuning import effective_pragmas
+
+
+class TestSQLiteTuning(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+        class TestConfig(Config):
+            TESTING = True
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(self.tmpdir.name, 'test.db')
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+        self.app = create_app(TestConfig)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_startup_report(self):
+        report = self.app.extensions['sqlite_pragmas']
+        self.assertEqual(report['journal_mode'], 'wal')
+        self.assertEqual(report['synchronous'], 1)  # NORMAL
+        self.assertEqual(report['busy_timeout'], 5000)
+        self.assertEqual(report['cache_size'], -64000)
+        self.assertEqual(report['temp_store'], 2)  # MEMORY
+        self.assertEqual(report['foreign_keys'], 1)
+
+    def test_every_pooled_connection_is_tuned(self):
+        with self.app.app_context():
+            first = db.engine.connect()
+            try:
+                # Une deuxième connexion ouverte en même temps vient du pool
+                self.assertEqual(effective_pragmas(db.engine)['foreign_keys'], 1)
+                self.assertEqual(first.exec_driver_sql('PRAGMA busy_timeout').scalar(), 5000)
+            finally:
+                first.close()
+
+    def test_pragmas_can_be_disabled(self):
+        class PlainConfig(Config):
+            TESTING = True
+            SQLALCHEMY_DATABASE_URI = 'sqlite://'
+            SQLITE_PRAGMAS = {}
+
+        app = create_app(PlainConfig)
+        self.assertNotIn('sqlite_pragmas', app.extensions)
+        with app.app_context():
+            self.assertEqual(effective_pragmas(db.engine)['foreign_keys'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
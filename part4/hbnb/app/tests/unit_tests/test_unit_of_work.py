@@ -0,0 +1,69 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import db
+from app.models.amenity import Amenity
+from app.models.review import Review
+from app.persistence.unit_of_work import unit_of_work
+from app.services.facade import hbnb_facade as facade
+from app.tests.base import AppTestCase
+
+
+class TestUnitOfWork(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.app.app_context():
+            owner = self.create_user()
+            self.headers = {'Authorization': f'Bearer {create_access_token(identity=owner.id)}'}
+            self.commits = []
+            self.on_commit = self.commits.append
+            event.listen(db.engine, 'commit', self.on_commit)
+
+    def tearDown(self):
+        with self.app.app_context():
+            event.remove(db.engine, 'commit', self.on_commit)
+        super().tearDown()
+
+    def test_rollback_on_exception(self):
+        with self.app.app_context():
+            with self.assertRaises(RuntimeError):
+                with unit_of_work():
+                    facade.create_amenity({'name': 'WiFi'})
+                    with unit_of_work():
+                        facade.create_amenity({'name': 'Pool'})
+                    raise RuntimeError('boom')
+            self.assertEqual(Amenity.query.count(), 0)
+
+    def test_commit_once_at_the_end(self):
+        with self.app.app_context():
+            with unit_of_work():
+                facade.create_amenity({'name': 'WiFi'})
+                facade.create_amenity({'name': 'Pool'})
+                self.assertEqual(self.commits, [])
+            self.assertEqual(len(self.commits), 1)
+            self.assertEqual(Amenity.query.count(), 2)
+
+    def test_one_commit_per_request(self):
+        response = self.client.post('/api/v1/places/', headers=self.headers, json={
+            'title': 'Cozy', 'description': 'A place', 'price': 50.0,
+            'latitude': 10.0, 'longitude': 20.0
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.commits), 1)
+
+    def test_error_response_rolls_back(self):
+        place = self.client.post('/api/v1/places/', headers=self.headers, json={
+            'title': 'Cozy', 'description': 'A place', 'price': 50.0,
+            'latitude': 10.0, 'longitude': 20.0
+        }).json
+        # The review is written before the ownership check rejects it
+        response = self.client.post('/api/v1/reviews/', headers=self.headers, json={
+            'text': 'My own place is great', 'rating': 5, 'place_id': place['id']
+        })
+        self.assertEqual(response.status_code, 403)
+        with self.app.app_context():
+            self.assertEqual(Review.query.count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Compare the development and production engine profiles under concurrency.
+
+Each profile serves the same paginated GET /api/v1/places/ requests from
+several threads against a file SQLite database. The report gives the request
+rate and the number of DBAPI connections opened: a pool smaller than the
+number of threads keeps closing and reopening its overflow connections.
+
+Usage (from part4/hbnb):
+    python -m benchmarks.bench_engine_profiles [--threads 16] [--requests 200]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from sqlalchemy import event
+from app import create_app, db
+from app.config import DevelopmentConfig, ProductionConfig
+from app.services.facade import hbnb_facade as facade
+
+
+def make_app(base, db_path):
+    class BenchConfig(base):
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + db_path
+    return create_app(BenchConfig)
+
+
+def seed(app, places):
+    with app.app_context():
+        owner = facade.create_user(email='bench@example.com', first_name='Bench',
+                                   last_name='Owner', password='hashed')
+        facade.create_places(owner.id, [
+            {'title': f'Place {i}', 'description': 'Bench', 'price': float(i % 300),
+             'latitude': 10.0, 'longitude': 20.0}
+            for i in range(places)])
+
+
+def run_profile(name, base, threads, requests, places):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app = make_app(base, os.path.join(tmpdir, 'bench.db'))
+        seed(app, places)
+        connects = []
+        with app.app_context():
+            engine = db.engine
+            engine.dispose()
+        event.listen(engine, 'connect', lambda *args: connects.append(1))
+
+        def worker():
+            client = app.test_client()
+            for _ in range(requests):
+                response = client.get('/api/v1/places/?limit=50')
+                assert response.status_code == 200
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        engine.dispose()
+
+    total = threads * requests
+    print(f"{name:<12} debug={str(app.debug):<5} pool={engine.pool.__class__.__name__:<10} "
+          f"{total / elapsed:8.0f} req/s  connections opened: {len(connects)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=200, help='requests per thread')
+    parser.add_argument('--places', type=int, default=500)
+    args = parser.parse_args()
+    for name, base in (('development', DevelopmentConfig), ('production', ProductionConfig)):
+        run_profile(name, base, args.threads, args.requests, args.places)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""Compare the in-memory NumPy index with the SQL path for k-nearest queries.
+
+For each size, random places are written to a file SQLite database, then
+the same "k nearest places under a price" queries are answered by the
+PlaceIndex (app/services/place_index.py) and by the geohash searches of
+growing radius used when NumPy is not available. Both must return the same
+places; the report gives the build time of the index and the latency of
+each path.
+
+Usage (from part4/hbnb, after ``pip install -r requirements.txt``):
+    python -m benchmarks.bench_nearest [--sizes 10000,100000,1000000] [--queries 200]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from sqlalchemy import insert
+from app import create_app, db
+from app.config import DevelopmentConfig
+from app.models.geo import encode
+from app.models.place import Place
+from app.services.facade import hbnb_facade as facade
+from app.services.place_index import PlaceIndex, numpy_available
+
+
+def make_app(db_path):
+    class BenchConfig(DevelopmentConfig):
+        DEBUG = False
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + db_path
+    return create_app(BenchConfig)
+
+
+def seed(app, places, rng, batch_size=10000):
+    with app.app_context():
+        owner = facade.create_user(email='bench@example.com', first_name='Bench',
+                                   last_name='Owner', password='hashed')
+        for start in range(0, places, batch_size):
+            rows = []
+            for _ in range(min(batch_size, places - start)):
+                lat, lon = rng.uniform(-60, 70), rng.uniform(-180, 180)
+                rows.append({'title': 'Place', 'description': 'Bench', 'price': rng.uniform(20, 400),
+                             'latitude': lat, 'longitude': lon, 'geohash': encode(lat, lon),
+                             'owner_id': owner.id})
+            # INSERT en masse, sans construire d'objets Place
+            db.session.execute(insert(Place), rows)
+            db.session.commit()
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def timed(function, queries):
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(function(*query))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, latencies
+
+
+def run_size(places, queries, k, rng):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app = make_app(os.path.join(tmpdir, 'bench.db'))
+        seed(app, places, rng)
+        points = [(rng.uniform(-60, 70), rng.uniform(-180, 180), k, None, 100.0)
+                  for _ in range(queries)]
+        with app.app_context():
+            service = facade.place_index_service
+            start = time.perf_counter()
+            index = PlaceIndex.from_rows(service.place_repository.iter_coordinates())
+            build = time.perf_counter() - start
+            in_memory, memory_latencies = timed(index.nearest, points)
+            from_sql, sql_latencies = timed(service._nearest_from_database, points)
+            db.session.remove()
+        mismatches = sum(1 for a, b in zip(in_memory, from_sql)
+                         if [place_id for place_id, _ in a] != [place_id for place_id, _ in b])
+    print(f"{places:>9} places  index build {build:6.2f}s  mismatches {mismatches}")
+    for name, latencies in (('numpy', memory_latencies), ('sql', sql_latencies)):
+        print(f"    {name:<6} mean {statistics.mean(latencies):8.2f} ms  "
+              f"p50 {percentile(latencies, 0.5):8.2f} ms  p95 {percentile(latencies, 0.95):8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000',
+                        help='Comma-separated numbers of places')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    if not numpy_available():
+        parser.error('NumPy is required: pip install numpy')
+    rng = random.Random(args.seed)
+    for size in (int(size) for size in args.sizes.split(',')):
+        run_size(size, args.queries, args.k, rng)
+
+
+if __name__ == '__main__':
+    main()
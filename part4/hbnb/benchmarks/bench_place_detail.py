@@ -0,0 +1,86 @@
+"""Measure GET /places/<id> with and without the encoded document cache.
+
+Places owning a few amenities each are written to a file SQLite database,
+then the same random sequence of detail reads is sent through the Flask test
+client with ``PLACE_DOCUMENT_CACHE_BYTES`` at 0 and at its default. The
+report gives the throughput and the share of the time spent formatting,
+marshalling and encoding documents (from cProfile).
+
+Usage (from part4/hbnb):
+    python -m benchmarks.bench_place_detail [--places 500] [--amenities 8] [--requests 5000]
+"""
+
+import argparse
+import cProfile
+import os
+import pstats
+import random
+import tempfile
+import time
+from app import create_app, db
+from app.config import Config, DevelopmentConfig
+from app.services.facade import hbnb_facade as facade
+
+# Fonctions de sérialisation dont on mesure la part du temps
+SERIALIZATION = ('format_place_response', 'marshal', 'output_json')
+
+
+def make_app(db_path, budget):
+    class BenchConfig(DevelopmentConfig):
+        DEBUG = False
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + db_path
+        PLACE_DOCUMENT_CACHE_BYTES = budget
+    return create_app(BenchConfig)
+
+
+def seed(app, places, amenities, rng):
+    with app.app_context():
+        owner = facade.create_user(email='bench@example.com', first_name='Bench',
+                                   last_name='Owner', password='hashed')
+        created, _ = facade.amenity_service.create_amenities([f'Amenity {i}' for i in range(30)])
+        amenity_ids = [amenity.id for amenity in created]
+        place_ids = []
+        for _ in range(places):
+            place = facade.create_place(title='Place', description='Bench', price=rng.uniform(20, 400),
+                                        latitude=rng.uniform(-60, 70), longitude=rng.uniform(-180, 180),
+                                        owner_id=owner.id, amenities=rng.sample(amenity_ids, amenities))
+            place_ids.append(place.id)
+        return place_ids
+
+
+def serialization_share(profile):
+    stats = pstats.Stats(profile)
+    total = stats.total_tt
+    spent = sum(row[3] for (_, _, name), row in stats.stats.items() if name in SERIALIZATION)
+    return spent / total if total else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=500)
+    parser.add_argument('--amenities', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    for budget in (0, Config.PLACE_DOCUMENT_CACHE_BYTES):
+        rng = random.Random(args.seed)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            app = make_app(os.path.join(tmpdir, 'bench.db'), budget)
+            place_ids = seed(app, args.places, args.amenities, rng)
+            urls = [f'/api/v1/places/{rng.choice(place_ids)}' for _ in range(args.requests)]
+            client = app.test_client()
+            profile = cProfile.Profile()
+            start = time.perf_counter()
+            profile.enable()
+            for url in urls:
+                client.get(url)
+            profile.disable()
+            elapsed = time.perf_counter() - start
+            with app.app_context():
+                db.session.remove()
+        print(f"document cache {'on ' if budget else 'off'}  {args.requests / elapsed:8.0f} req/s  "
+              f"serialization {serialization_share(profile):6.1%} of the time")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Measure the throughput of the list endpoints with and without the response cache.
+
+A file SQLite database is seeded with places, amenities and reviews, then the
+same mix of list and search requests is sent through the Flask test client
+with ``RESPONSE_CACHE_ENABLED`` off and on. A share of the rounds writes a
+review first, which moves the 'reviews' and 'places' generations and makes
+the next requests miss, as in a real read-mostly traffic.
+
+Usage (from part4/hbnb):
+    python -m benchmarks.bench_response_cache [--places 2000] [--requests 2000] [--write-every 50]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from sqlalchemy import insert
+from app import create_app, db
+from app.config import DevelopmentConfig
+from app.models.geo import encode
+from app.models.place import Place
+from app.services.facade import hbnb_facade as facade
+
+
+def make_app(db_path, enabled):
+    class BenchConfig(DevelopmentConfig):
+        DEBUG = False
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + db_path
+        RESPONSE_CACHE_ENABLED = enabled
+    return create_app(BenchConfig)
+
+
+def seed(app, places, rng):
+    with app.app_context():
+        owner = facade.create_user(email='bench@example.com', first_name='Bench',
+                                   last_name='Owner', password='hashed')
+        guest = facade.create_user(email='guest@example.com', first_name='Bench',
+                                   last_name='Guest', password='hashed')
+        facade.amenity_service.create_amenities([f'Amenity {i}' for i in range(50)])
+        rows = []
+        for _ in range(places):
+            lat, lon = rng.uniform(-60, 70), rng.uniform(-180, 180)
+            rows.append({'title': 'Place', 'description': 'Bench', 'price': rng.uniform(20, 400),
+                         'latitude': lat, 'longitude': lon, 'geohash': encode(lat, lon),
+                         'owner_id': owner.id})
+        db.session.execute(insert(Place), rows)
+        db.session.commit()
+        place_ids = [place.id for place in facade.place_service.get_all_places()]
+        return guest.id, place_ids
+
+
+def run(app, guest_id, place_ids, urls, requests, write_every, rng):
+    client = app.test_client()
+    reviewed = iter(place_ids)
+    start = time.perf_counter()
+    for count in range(requests):
+        if write_every and count % write_every == write_every - 1:
+            with app.app_context():
+                facade.create_review(text='Bench', rating=rng.randint(1, 5),
+                                     place_id=next(reviewed), user_id=guest_id)
+        client.get(rng.choice(urls))
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--write-every', type=int, default=50,
+                        help='Write a review every N requests (0: read only)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    for enabled in (False, True):
+        rng = random.Random(args.seed)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            app = make_app(os.path.join(tmpdir, 'bench.db'), enabled)
+            guest_id, place_ids = seed(app, args.places, rng)
+            urls = ['/api/v1/places/?limit=20', '/api/v1/places/?limit=50&min_price=100',
+                    '/api/v1/places/?limit=20&max_price=150&min_price=50', '/api/v1/amenities/',
+                    '/api/v1/reviews/?limit=20']
+            urls += [f'/api/v1/reviews/places/{place_id}/reviews' for place_id in place_ids[:20]]
+            throughput = run(app, guest_id, place_ids, urls, args.requests, args.write_every, rng)
+            with app.app_context():
+                db.session.remove()
+        print(f"response cache {'on ' if enabled else 'off'}  {throughput:8.0f} req/s")
+
+
+if __name__ == '__main__':
+    main()
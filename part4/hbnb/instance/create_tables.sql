@@ -18,7 +18,16 @@ CREATE TABLE IF NOT EXISTS places (
     price DECIMAL(10,2) NOT NULL,
     latitude FLOAT NOT NULL,
     longitude FLOAT NOT NULL,
+    geohash VARCHAR(12),
     owner_id CHAR(36) NOT NULL,
+    -- Review aggregates (recompute with: flask --app run repair-review-aggregates)
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    rating_count_1 INTEGER NOT NULL DEFAULT 0,
+    rating_count_2 INTEGER NOT NULL DEFAULT 0,
+    rating_count_3 INTEGER NOT NULL DEFAULT 0,
+    rating_count_4 INTEGER NOT NULL DEFAULT 0,
+    rating_count_5 INTEGER NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (owner_id) REFERENCES users(id)
@@ -55,4 +64,17 @@ CREATE TABLE IF NOT EXISTS place_amenity (
     PRIMARY KEY (place_id, amenity_id),
     FOREIGN KEY (place_id) REFERENCES places(id),
     FOREIGN KEY (amenity_id) REFERENCES amenities(id)
-);
\ No newline at end of file
+);
+
+-- INDEXES (keep in sync with the SQLAlchemy models)
+CREATE INDEX IF NOT EXISTS ix_users_created_at_id ON users (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_places_created_at_id ON places (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_places_owner_id ON places (owner_id);
+CREATE INDEX IF NOT EXISTS ix_places_price ON places (price);
+CREATE INDEX IF NOT EXISTS ix_places_geohash ON places (geohash);
+CREATE INDEX IF NOT EXISTS ix_places_latitude_longitude ON places (latitude, longitude);
+CREATE INDEX IF NOT EXISTS ix_place_amenity_amenity_id ON place_amenity (amenity_id);
+CREATE INDEX IF NOT EXISTS ix_reviews_created_at_id ON reviews (created_at, id);
+CREATE INDEX IF NOT EXISTS ix_reviews_place_id_created_at_id ON reviews (place_id, created_at, id);
+CREATE INDEX IF NOT EXISTS ix_reviews_user_id ON reviews (user_id);
+CREATE INDEX IF NOT EXISTS ix_amenities_created_at_id ON amenities (created_at, id);
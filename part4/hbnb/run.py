@@ -2,16 +2,18 @@
 Main application entry point for the HBnB API server.
 """
 
+import os
 from app import create_app
-from app.config import DevelopmentConfig
+from app.config import config
 
-app = create_app(DevelopmentConfig)
+# HBNB_CONFIG=production pour le profil de production (DATABASE_URL, pool...)
+app = create_app(config[os.getenv('HBNB_CONFIG', 'default')])
 
 if __name__ == '__main__':
     # Server configuration
     host = '0.0.0.0'  # Listen on all interfaces
     port = 5000
-    debug = True
+    debug = app.debug
     
     print("\n" + "="*50)
     print("🚀 HBnB API Server")
@@ -27,6 +29,7 @@ if __name__ == '__main__':
     display_url = f"http://127.0.0.1:{port}"
     print("\n🌐 Important URLs (clickable in terminal):")
     print(f"  📱 Swagger UI:    {display_url}/")
+    print(f"  🖥️  Frontend:      {display_url}/app/")
     print(f"  👤 Users API:     {display_url}/api/v1/users")
     print(f"  🏠 Amenities API: {display_url}/api/v1/amenities")
     print(f"  📍 Places API:    {display_url}/api/v1/places")
@@ -36,6 +39,8 @@ if __name__ == '__main__':
     print(f"  • Debug mode: {'✅ ON' if debug else '❌ OFF'}")
     print(f"  • Host: 0.0.0.0 (accessible from network)")
     print(f"  • Port: {port}")
+    for name, value in app.extensions.get('sqlite_pragmas', {}).items():
+        print(f"  • SQLite {name}: {value}")
     
     print("\n" + "="*50)
     print("Starting server... (Press Ctrl+C to stop)")
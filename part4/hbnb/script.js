@@ -1,3 +1,6 @@
+// Servi par l'application (/app/) : même origine que l'API ; ouvert depuis le disque : serveur local
+const API_BASE = window.location.protocol === 'file:' ? 'http://localhost:5000' : '';
+
 document.addEventListener('DOMContentLoaded', () => {
     const loginForm = document.getElementById('login-form');
   
@@ -11,7 +14,7 @@ document.addEventListener('DOMContentLoaded', () => {
             loginUser(email, password);
             
             async function loginUser(email, password) {
-            const response = await fetch('http://localhost:5000/api/v1/auth/login', {
+            const response = await fetch(`${API_BASE}/api/v1/auth/login`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',
@@ -48,19 +51,29 @@ document.addEventListener('DOMContentLoaded', () => {
       const parts = value.split(`; ${name}=`);
       if (parts.length === 2) return parts.pop().split(';').shift();
   }
-  async function fetchPlaces(token) {
-      const response = await fetch('http://localhost:5000/api/v1/places', {
-          headers: {
-              'Authorization': `Bearer ${token}`,
-          },
-      });
-      
-      if (response.ok) {
-          const data = await response.json();
-          displayPlaces(data);
-      } else {
-          console.error('Failed to fetch places:', response.statusText);
-      }
+  async function fetchPlaces(token, maxPrice) {
+      // Le filtre de prix est appliqué par l'API (GET /places/?max_price=...).
+      // La liste est paginée : on suit X-Next-Cursor jusqu'à la dernière page
+      const places = [];
+      let cursor = null;
+      do {
+          const params = new URLSearchParams({ limit: '200' });
+          if (maxPrice) params.set('max_price', maxPrice);
+          if (cursor) params.set('cursor', cursor);
+          const response = await fetch(`${API_BASE}/api/v1/places/?${params}`, {
+              headers: {
+                  'Authorization': `Bearer ${token}`,
+              },
+          });
+
+          if (!response.ok) {
+              console.error('Failed to fetch places:', response.statusText);
+              return;
+          }
+          places.push(...await response.json());
+          cursor = response.headers.get('X-Next-Cursor');
+      } while (cursor);
+      displayPlaces(places);
   }
   
   function displayPlaces(places) {
@@ -77,10 +90,10 @@ document.addEventListener('DOMContentLoaded', () => {
           card.className = 'card';
           
           const title = document.createElement('h3');
-          title.textContent = place.name;
+          title.textContent = place.title;
           
           const price = document.createElement('p');
-          price.textContent = `Price per night: $${place.price_by_night}`;
+          price.textContent = `Price per night: $${place.price}`;
           
           const button = document.createElement('button');
           button.textContent = 'View Details';
@@ -106,28 +119,12 @@ document.addEventListener('DOMContentLoaded', () => {
           priceFilter.appendChild(option);
       });
   
-      // Gérer le changement de sélection
+      // Gérer le changement de sélection : recharger les places filtrées par l'API
       priceFilter.addEventListener('change', (event) => {
           const selectedValue = event.target.value;
-          const cards = document.querySelectorAll('.card');
-          
-          cards.forEach(card => {
-              if (selectedValue === 'all') {
-                  card.style.display = 'block';
-                  return;
-              }
-  
-              const priceText = card.querySelector('p').textContent;
-              // Extraire uniquement les chiffres du prix
-              const priceValue = parseInt(priceText.replace(/\D/g, ''));
-              const maxPrice = parseInt(selectedValue);
-              
-              if (priceValue <= maxPrice) {
-                  card.style.display = 'block';
-              } else {
-                  card.style.display = 'none';
-              }
-          });
+          const token = getCookie('token');
+          if (!token) return;
+          fetchPlaces(token, selectedValue === 'all' ? null : selectedValue);
       });
   }
   
@@ -152,7 +149,7 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     // Fetch Place Details
-    fetch(`http://localhost:5000/api/v1/places/${placeId}`)
+    fetch(`${API_BASE}/api/v1/places/${placeId}`)
         .then(response => {
             if (!response.ok) throw new Error('Failed to fetch place details.');
             return response.json();
@@ -174,7 +171,7 @@ document.addEventListener('DOMContentLoaded', () => {
         });
 
     // Fetch Reviews
-    fetch(`http://localhost:5000/api/v1/places/${placeId}/reviews`)
+    fetch(`${API_BASE}/api/v1/places/${placeId}/reviews`)
         .then(response => {
             if (response.status === 404) return []; // No reviews is not an error
             if (!response.ok) throw new Error('Failed to fetch reviews.');
@@ -231,7 +228,7 @@ function initAddReviewPage() {
         const rating = document.getElementById('rating').value;
 
         try {
-            const response = await fetch('http://localhost:5000/api/v1/reviews/', {
+            const response = await fetch(`${API_BASE}/api/v1/reviews/`, {
                 method: 'POST',
                 headers: {
                     'Content-Type': 'application/json',